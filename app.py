@@ -2,72 +2,195 @@ import os
 import json
 import uuid
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file, stream_with_context
 from dotenv import load_dotenv
 from services.app_analyzer import AppAnalyzer
 from services.test_generator import TestGenerator
 from services.test_executor import TestExecutor
-from services.excel_exporter import ExcelExporter
+from services.export_cache import ExportCache
+from services.job_queue import JobQueue
+from services.distributed_executor import ShardCoordinator
+from services.test_selector import TestSelector
+from services.results_store import ResultsStore, history_source
+from services.test_dedupe import SemanticDeduplicator
+from services.map_reduce import GENERATION_MODES
 
 load_dotenv()
 
 app = Flask(__name__)
 app.secret_key = os.getenv('SECRET_KEY', 'dev-key-change-in-production')
 
+results_store = ResultsStore()
+export_cache = ExportCache()
+deduplicator = SemanticDeduplicator()
+
 @app.route('/')
 def index():
     return render_template('index.html')
 
+def run_analysis(data, job=None):
+    """Analyze an app; shared by /analyze and the 'analyze' background job"""
+    if job:
+        job.report(0.1, 'Analyzing application')
+    
+    analyzer = AppAnalyzer()
+    context = analyzer.analyze_app(
+        data['url'],
+        crawl=bool(data.get('crawl', False)),  # Optional multi-page crawl
+        max_depth=data.get('max_depth'),
+        max_pages=data.get('max_pages'),
+        use_cache=not data.get('bypass_cache', False)
+    )
+    
+    session_id = str(uuid.uuid4())
+    if analyzer.context_info:
+        save_analysis(session_id, analyzer.context_info)
+    
+    return {
+        'success': True,
+        'context': context,
+        'session_id': session_id,
+        'cache': analyzer.cache_status  # 'hit', 'miss' or 'bypass'
+    }
+
+def run_test_generation(data, job=None):
+    """Generate test cases; shared by /generate-tests and the 'generate-tests' background job"""
+    session_id = data['session_id']
+    provider = data.get('provider', None)  # Optional AI provider selection
+    
+    if job:
+        job.report(0.1, 'Generating test cases')
+    
+    generator = TestGenerator()
+    test_cases = generator.generate_test_cases(
+        data['context'],
+        provider=provider,
+        use_cache=not data.get('bypass_cache', False),
+        mode=data.get('generation_mode'),  # Optional 'single', 'map-reduce' or 'auto'
+        context_info=load_analysis(session_id)
+    )
+    
+    test_cases, dedupe = save_test_cases(session_id, test_cases)
+    
+    return {
+        'success': True,
+        'test_cases': test_cases,
+        'download_url': f'/download-tests/{session_id}',
+        'provider_used': generator.last_provider_used or provider or 'default',
+        'cache': generator.last_cache_status,
+        'dedupe': dedupe
+    }
+
+def save_analysis(session_id, context_info):
+    """Keep the full analyzer report, so map-reduce generation can split it before compaction"""
+    session_dir = f'downloads/{session_id}'
+    os.makedirs(session_dir, exist_ok=True)
+    
+    with open(f'{session_dir}/analysis.json', 'w') as f:
+        json.dump(context_info, f)
+
+def load_analysis(session_id):
+    """The session's analyzer report, or None for sessions analyzed before it was saved"""
+    try:
+        with open(f'downloads/{session_id}/analysis.json') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_test_cases(session_id, test_cases):
+    """Collapse near-duplicates, index the session for cross-session matches and save test_cases.json"""
+    test_cases, clusters = deduplicator.deduplicate(test_cases)
+    repeated = deduplicator.index_session(session_id, test_cases)
+    
+    session_dir = f'downloads/{session_id}'
+    os.makedirs(session_dir, exist_ok=True)
+    
+    with open(f'{session_dir}/test_cases.json', 'w') as f:
+        json.dump(test_cases, f, indent=2)
+    
+    return test_cases, {
+        'removed': sum(len(cluster['duplicates']) for cluster in clusters),
+        'removed_ids': [duplicate['id'] for cluster in clusters for duplicate in cluster['duplicates']],
+        'clusters': clusters,
+        'seen_in_other_sessions': repeated
+    }
+
 @app.route('/analyze', methods=['POST'])
 def analyze_app():
     data = request.get_json()
-    url = data.get('url')
     
-    if not url:
-        return jsonify({'error': 'URL is required'}), 400
+    error = validate_job_payload('analyze', data)
+    if error:
+        return jsonify({'error': error}), 400
     
     try:
-        analyzer = AppAnalyzer()
-        context = analyzer.analyze_app(url)
-        
-        session_id = str(uuid.uuid4())
-        
-        return jsonify({
-            'success': True,
-            'context': context,
-            'session_id': session_id
-        })
+        return jsonify(run_analysis(data))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/generate-tests', methods=['POST'])
 def generate_tests():
     data = request.get_json()
+    
+    error = validate_job_payload('generate-tests', data)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    try:
+        return jsonify(run_test_generation(data))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/generate-tests/stream', methods=['POST'])
+def generate_tests_stream():
+    """Stream generated test cases to the browser as Server-Sent Events"""
+    data = request.get_json()
     context = data.get('context')
     session_id = data.get('session_id')
-    provider = data.get('provider', None)  # Optional AI provider selection
+    provider = data.get('provider', None)
+    use_cache = not data.get('bypass_cache', False)
+    mode = data.get('generation_mode')
     
     if not context or not session_id:
         return jsonify({'error': 'Context and session ID are required'}), 400
+    if mode and mode not in GENERATION_MODES:
+        return jsonify({'error': f"generation_mode must be one of: {', '.join(GENERATION_MODES)}"}), 400
     
-    try:
-        generator = TestGenerator()
-        test_cases = generator.generate_test_cases(context, provider=provider)
-        
-        session_dir = f'downloads/{session_id}'
-        os.makedirs(session_dir, exist_ok=True)
-        
-        with open(f'{session_dir}/test_cases.json', 'w') as f:
-            json.dump(test_cases, f, indent=2)
-        
-        return jsonify({
-            'success': True,
-            'test_cases': test_cases,
-            'download_url': f'/download-tests/{session_id}',
-            'provider_used': provider or 'default'
-        })
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    generator = TestGenerator()
+    context_info = load_analysis(session_id)
+    
+    def events():
+        test_cases = []
+        try:
+            for test_case in generator.stream_test_cases(context, provider=provider, use_cache=use_cache, mode=mode,
+                                                         context_info=context_info):
+                test_cases.append(test_case)
+                yield _sse_event('test_case', test_case)
+            
+            # Duplicates were already streamed; the client replaces them with the saved list
+            test_cases, dedupe = save_test_cases(session_id, test_cases)
+            
+            yield _sse_event('done', {
+                'success': True,
+                'test_cases': test_cases,
+                'total': len(test_cases),
+                'dedupe': dedupe,
+                'download_url': f'/download-tests/{session_id}',
+                'provider_used': generator.last_provider_used or provider or 'default',
+                'cache': generator.last_cache_status
+            })
+        except Exception as e:
+            yield _sse_event('error', {'error': str(e)})
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def _sse_event(event, payload):
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
 
 @app.route('/providers', methods=['GET'])
 def get_providers():
@@ -83,32 +206,205 @@ def get_providers():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def run_test_execution(data, job=None):
+    """Execute test cases; shared by /execute-tests and the 'execute-tests' background job"""
+    session_id = data['session_id']
+    workers = data.get('workers')  # Optional number of parallel browser workers
+    
+    progress_callback = None
+    if job:
+        job.report(0.0, 'Starting test execution')
+        
+        def progress_callback(completed, total, result):
+            job.report(completed / total, f"Completed {completed}/{total}: {result['test_name']}")
+    
+    # Spend execution time only on distinct tests
+    test_cases, clusters = deduplicator.deduplicate(data['test_cases'])
+    
+    # Pick tests by priority, or by value per second when a time/cost budget is given
+    results_store.ensure_imported()
+    selector = TestSelector(store=results_store)
+    tests_to_execute, selection = selector.select(
+        test_cases,
+        time_budget=data.get('time_budget'),
+        cost_budget=data.get('cost_budget'),
+        limit=data.get('limit'),
+        workers=workers or 1
+    )
+    
+    if data.get('mode') == 'distributed':
+        # Shard the run across local processes and any configured remote workers
+        coordinator = ShardCoordinator(local_processes=data.get('shards'), workers_per_shard=workers)
+        execution_results = coordinator.execute_tests(
+            tests_to_execute,
+            data['url'],
+            progress_callback=progress_callback
+        )
+    else:
+        executor = TestExecutor()
+        execution_results = executor.execute_tests(
+            tests_to_execute,
+            data['url'],
+            workers=workers,
+            progress_callback=progress_callback
+        )
+    selection['duplicates_removed'] = sum(len(cluster['duplicates']) for cluster in clusters)
+    execution_results['selection'] = selection
+    
+    session_dir = f'downloads/{session_id}'
+    os.makedirs(session_dir, exist_ok=True)
+    history = json.dumps(execution_results, indent=2)
+    with open(f'{session_dir}/execution_history.json', 'w') as f:
+        f.write(history)
+    
+    # Keep every run queryable; the JSON file only holds the latest run of the session
+    results_store.record_run(
+        execution_results,
+        session_id=session_id,
+        url=data['url'],
+        mode=data.get('mode', 'local'),
+        source=history_source(history)
+    )
+    
+    return {
+        'success': True,
+        'execution_results': execution_results,
+        'download_url': f'/download-execution/{session_id}'
+    }
+
 @app.route('/execute-tests', methods=['POST'])
 def execute_tests():
     data = request.get_json()
-    test_cases = data.get('test_cases')
-    url = data.get('url')
-    session_id = data.get('session_id')
     
-    if not test_cases or not url or not session_id:
-        return jsonify({'error': 'Test cases, URL, and session ID are required'}), 400
+    error = validate_job_payload('execute-tests', data)
+    if error:
+        return jsonify({'error': error}), 400
     
     try:
-        executor = TestExecutor()
-        execution_results = executor.execute_top_tests(test_cases, url, limit=10)
-        
-        session_dir = f'downloads/{session_id}'
-        with open(f'{session_dir}/execution_history.json', 'w') as f:
-            json.dump(execution_results, f, indent=2)
-        
-        return jsonify({
-            'success': True,
-            'execution_results': execution_results,
-            'download_url': f'/download-execution/{session_id}'
-        })
+        return jsonify(run_test_execution(data))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Background jobs: same payloads as the synchronous endpoints, answered immediately with a job ID
+JOB_HANDLERS = {
+    'analyze': (('url',), 'URL is required', run_analysis),
+    'generate-tests': (('context', 'session_id'), 'Context and session ID are required', run_test_generation),
+    'execute-tests': (('test_cases', 'url', 'session_id'), 'Test cases, URL, and session ID are required', run_test_execution)
+}
+
+job_queue = JobQueue()
+for job_type, (_, _, handler) in JOB_HANDLERS.items():
+    job_queue.register(job_type, handler)
+
+def validate_job_payload(job_type, data):
+    """Return an error message if required fields are missing, otherwise None"""
+    required_fields, message, _ = JOB_HANDLERS[job_type]
+    if not data or any(not data.get(field) for field in required_fields):
+        return message
+    if job_type == 'generate-tests' and data.get('generation_mode') and data['generation_mode'] not in GENERATION_MODES:
+        return f"generation_mode must be one of: {', '.join(GENERATION_MODES)}"
+    if job_type == 'execute-tests':
+        for field, convert in (('limit', int), ('time_budget', float), ('cost_budget', float)):
+            if data.get(field) is not None:
+                try:
+                    convert(data[field])
+                except (TypeError, ValueError):
+                    return f"{field} must be a number"
+    return None
+
+@app.route('/jobs/<job_type>', methods=['POST'])
+def submit_job(job_type):
+    """Queue analyze/generate-tests/execute-tests work and return its job ID"""
+    job_queue.start()
+    if job_type not in JOB_HANDLERS:
+        return jsonify({'error': f'Unknown job type: {job_type}'}), 404
+    
+    data = request.get_json()
+    error = validate_job_payload(job_type, data)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    job_id = job_queue.submit(job_type, data)
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status_url': f'/jobs/{job_id}',
+        'progress_url': f'/jobs/{job_id}/progress'
+    }), 202
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get job status, including the result once it has finished"""
+    job_queue.start()
+    job = job_queue.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': job})
+
+@app.route('/jobs/<job_id>/progress', methods=['GET'])
+def get_job_progress(job_id):
+    """Lightweight progress polling without the job result"""
+    job_queue.start()
+    job = job_queue.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status': job['status'],
+        'progress': job['progress'],
+        'message': job['message']
+    })
+
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    job_queue.start()
+    job = job_queue.cancel(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify({'success': True, 'job_id': job_id, 'status': job['status']})
+
+@app.route('/history/runs')
+def history_runs():
+    """Most recent runs, optionally for one application URL"""
+    results_store.ensure_imported()
+    runs = results_store.list_runs(url=request.args.get('url'), limit=request.args.get('limit', 50, type=int))
+    return jsonify({'success': True, 'runs': runs})
+
+@app.route('/history/trend')
+def history_trend():
+    """Daily pass rate across runs"""
+    results_store.ensure_imported()
+    trend = results_store.pass_rate_trend(
+        url=request.args.get('url'),
+        test_name=request.args.get('test_name'),
+        days=request.args.get('days', type=float)
+    )
+    return jsonify({'success': True, 'trend': trend})
+
+@app.route('/history/flaky')
+def history_flaky():
+    """Tests that alternate between passing and failing"""
+    results_store.ensure_imported()
+    flaky = results_store.flaky_tests(
+        url=request.args.get('url'),
+        window=request.args.get('window', type=int),
+        min_runs=request.args.get('min_runs', type=int)
+    )
+    return jsonify({'success': True, 'flaky_tests': flaky})
+
+@app.route('/history/durations')
+def history_durations():
+    """Duration percentiles per test"""
+    results_store.ensure_imported()
+    durations = results_store.duration_percentiles(
+        url=request.args.get('url'),
+        test_name=request.args.get('test_name'),
+        category=request.args.get('category'),
+        days=request.args.get('days', type=float)
+    )
+    return jsonify({'success': True, 'durations': durations})
+
 @app.route('/download-tests/<session_id>')
 def download_tests(session_id):
     try:
@@ -127,15 +423,13 @@ def download_execution(session_id):
 def download_tests_excel(session_id):
     """Download test cases in Excel format"""
     try:
-        # Load test cases from JSON file
-        with open(f'downloads/{session_id}/test_cases.json', 'r') as f:
-            test_cases = json.load(f)
-        
-        # Create Excel file
-        exporter = ExcelExporter()
-        excel_path = exporter.export_test_cases(test_cases, session_id)
+        # Reuse the workbook built from the current test_cases.json; rebuilt only when it changes
+        excel_path, etag = export_cache.get(session_id, 'tests')
         
-        return send_file(excel_path, as_attachment=True, download_name=f'test_cases_{session_id}.xlsx')
+        # Conditional send_file answers a matching If-None-Match with 304 Not Modified
+        return send_file(excel_path, as_attachment=True, download_name=f'test_cases_{session_id}.xlsx', etag=etag)
+    except FileNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -143,15 +437,13 @@ def download_tests_excel(session_id):
 def download_execution_excel(session_id):
     """Download execution results in Excel format"""
     try:
-        # Load execution history from JSON file
-        with open(f'downloads/{session_id}/execution_history.json', 'r') as f:
-            execution_data = json.load(f)
+        # Reuse the workbook built from the current execution_history.json; rebuilt only when it changes
+        excel_path, etag = export_cache.get(session_id, 'execution')
         
-        # Create Excel file
-        exporter = ExcelExporter()
-        excel_path = exporter.export_execution_results(execution_data, session_id)
-        
-        return send_file(excel_path, as_attachment=True, download_name=f'execution_results_{session_id}.xlsx')
+        # Conditional send_file answers a matching If-None-Match with 304 Not Modified
+        return send_file(excel_path, as_attachment=True, download_name=f'execution_results_{session_id}.xlsx', etag=etag)
+    except FileNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -0,0 +1,100 @@
+"""
+Benchmark: markup fingerprint scan cost as the signature count grows
+
+Builds a synthetic page of at least 1MB using the bundled framework markers,
+pads config/fingerprints.json with synthetic signatures that never occur on
+the page, then times the markup scan against a plain search per signature and
+checks that both detect the same technologies. The scan should stay roughly
+flat as signatures are added.
+
+Usage:
+    python benchmarks/bench_fingerprints.py [--size-mb 1.3] [--repeat 3] [--counts 0,100,400]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.fingerprints import FingerprintEngine, _Automaton  # noqa: E402
+
+
+def build_page(size_mb):
+    """Generate an HTML page of roughly size_mb megabytes with a few framework markers"""
+    head = (
+        '<html><head><title>Benchmark App</title>'
+        '<link rel="stylesheet" href="/css/bootstrap.min.css">'
+        '<script src="/static/js/jquery-3.7.1.min.js"></script></head><body>'
+        '<div id="__next" data-reactroot="">'
+    )
+    block = (
+        '<section class="card"><h2>Item {i}</h2><p>Lorem ipsum dolor sit amet, consectetur '
+        'adipiscing elit, sed do eiusmod tempor incididunt ut labore.</p>'
+        '<form action="/items/{i}" method="post"><input type="text" name="title{i}" placeholder="Title">'
+        '<input type="submit" value="Save {i}" class="btn btn-primary"></form>'
+        '<a href="/items/{i}" class="link">View <b>{i}</b></a></section>'
+    )
+    tail = '</div></body></html>'
+
+    target = int(size_mb * 1024 * 1024)
+    parts = [head]
+    length = len(head) + len(tail)
+    i = 0
+    while length < target:
+        chunk = block.format(i=i)
+        parts.append(chunk)
+        length += len(chunk)
+        i += 1
+    parts.append(tail)
+    return ''.join(parts).encode('utf-8')
+
+
+def padded_signatures(count):
+    """Bundled markup signatures plus count synthetic ones shaped like the real entries"""
+    signatures = list(FingerprintEngine().markup_signatures)
+    for i in range(count):
+        signatures.append((f"Synthetic {i}", rf'\bdata-synthetic-{i}-[a-z0-9]+\b'))
+    return signatures
+
+
+def scan_each(compiled, data):
+    """Baseline: one search per signature over the whole page"""
+    return {technology for technology, pattern in compiled if technology and pattern.search(data)}
+
+
+def time_call(function, repeat):
+    """Return (best seconds, last result) over repeat runs"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--size-mb', type=float, default=1.3)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--counts', default='0,100,400')
+    args = parser.parse_args()
+
+    data = build_page(args.size_mb)
+    print(f"Page size: {len(data) / (1024 * 1024):.2f} MB, best of {args.repeat} runs\n")
+
+    print(f"{'signatures':<12}{'scan s':>10}{'per-sig s':>12}{'speedup':>10}  result")
+    for extra in (int(count) for count in args.counts.split(',')):
+        automaton = _Automaton(padded_signatures(extra), as_bytes=True)
+        scan_seconds, scanned = time_call(lambda: automaton.scan(memoryview(data)), args.repeat)
+        each_seconds, expected = time_call(lambda: scan_each(automaton.signatures, data), args.repeat)
+        status = 'matches' if scanned == expected else f"differs: {sorted(scanned ^ expected)}"
+        print(f"{len(automaton.signatures):<12}{scan_seconds:>10.3f}{each_seconds:>12.3f}"
+              f"{each_seconds / scan_seconds:>9.1f}x  {status}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark: single-pass HTML extraction vs the BeautifulSoup find_all path
+
+Builds a synthetic page of at least 1MB (forms, buttons, links, landmarks and
+inline scripts), then times the previous AppAnalyzer parsing path against every
+available html_extractor backend and checks that they extract the same data.
+
+Usage:
+    python benchmarks/bench_html_extraction.py [--size-mb 2] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.html_extractor import extract_page, available_backends  # noqa: E402
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+
+def build_page(size_mb):
+    """Generate an HTML page of roughly size_mb megabytes"""
+    head = (
+        '<html><head><title>Benchmark App</title>'
+        '<meta name="description" content="Synthetic benchmark page">'
+        '<script src="/static/js/vendor.js"></script></head><body>'
+        '<header><nav><a href="/">Home</a></nav></header><div class="main-content">'
+    )
+    block = (
+        '<section class="card"><h2>Item {i}</h2><p>Lorem ipsum dolor sit amet, consectetur '
+        'adipiscing elit, sed do eiusmod tempor incididunt ut labore.</p>'
+        '<form action="/items/{i}" method="post"><input type="text" name="title{i}" placeholder="Title" required>'
+        '<textarea name="notes{i}"></textarea><select name="kind{i}"><option>a</option><option>b</option></select>'
+        '<input type="submit" value="Save {i}" class="btn btn-primary"></form>'
+        '<button id="edit-{i}" class="btn"> Edit <span>item {i}</span></button>'
+        '<a href="/items/{i}" class="link">View <b>{i}</b></a> <a href="https://example.com/{i}">External</a>'
+        '<script>window.items = window.items || []; window.items.push({i});</script></section>'
+    )
+    tail = '</div><aside class="sidebar"></aside><footer>Footer</footer></body></html>'
+
+    target = int(size_mb * 1024 * 1024)
+    parts = [head]
+    length = len(head) + len(tail)
+    i = 0
+    while length < target:
+        chunk = block.format(i=i)
+        parts.append(chunk)
+        length += len(chunk)
+        i += 1
+    parts.append(tail)
+    return ''.join(parts).encode('utf-8')
+
+
+def extract_with_soup(data):
+    """The previous AppAnalyzer path: one parse plus repeated find_all scans"""
+    soup = BeautifulSoup(data, 'html.parser', from_encoding='utf-8')
+    result = {'forms': [], 'buttons': [], 'links': [], 'landmarks': []}
+
+    for form in soup.find_all('form'):
+        form_info = {'action': form.get('action', ''), 'method': form.get('method', 'GET'), 'inputs': []}
+        for inp in form.find_all(['input', 'textarea', 'select']):
+            form_info['inputs'].append({
+                'type': inp.get('type', inp.name),
+                'name': inp.get('name', ''),
+                'placeholder': inp.get('placeholder', ''),
+                'required': 'required' in inp.attrs
+            })
+        result['forms'].append(form_info)
+
+    for btn in soup.find_all(['button', 'input']):
+        if btn.name == 'input' and btn.get('type') in ['submit', 'button']:
+            result['buttons'].append({'text': btn.get('value', ''), 'type': btn.get('type', ''),
+                                      'id': btn.get('id', ''), 'class': btn.get('class', [])})
+        elif btn.name == 'button':
+            result['buttons'].append({'text': btn.get_text(strip=True), 'type': btn.get('type', 'button'),
+                                      'id': btn.get('id', ''), 'class': btn.get('class', [])})
+
+    for link in soup.find_all('a', href=True):
+        result['links'].append({'text': link.get_text(strip=True), 'href': link.get('href', ''),
+                                'id': link.get('id', ''), 'class': link.get('class', [])})
+
+    if soup.find('header') or soup.find('nav'):
+        result['landmarks'].append('header')
+    if soup.find('main') or soup.find('div', class_=lambda x: x and 'main' in str(x).lower()):
+        result['landmarks'].append('main')
+    if soup.find('aside') or soup.find('div', class_=lambda x: x and 'sidebar' in str(x).lower()):
+        result['landmarks'].append('sidebar')
+    if soup.find('footer'):
+        result['landmarks'].append('footer')
+    return result
+
+
+def time_call(function, repeat):
+    """Return (best seconds, last result) over repeat runs"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--size-mb', type=float, default=2.0)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    data = build_page(args.size_mb)
+    print(f"Page size: {len(data) / (1024 * 1024):.2f} MB, best of {args.repeat} runs\n")
+
+    timings = {}
+    results = {}
+    if BeautifulSoup is not None:
+        timings['beautifulsoup'], results['beautifulsoup'] = time_call(lambda: extract_with_soup(data), args.repeat)
+    else:
+        print("beautifulsoup4 not installed; skipping the baseline")
+
+    for backend in available_backends():
+        timings[backend], results[backend] = time_call(lambda: extract_page(data, backend), args.repeat)
+
+    baseline = timings.get('beautifulsoup')
+    print(f"{'backend':<15}{'seconds':>10}{'MB/s':>10}{'speedup':>10}")
+    for name, seconds in timings.items():
+        speedup = f"{baseline / seconds:.1f}x" if baseline else '-'
+        print(f"{name:<15}{seconds:>10.3f}{len(data) / (1024 * 1024) / seconds:>10.1f}{speedup:>10}")
+
+    if 'beautifulsoup' in results:
+        expected = results['beautifulsoup']
+        for backend in available_backends():
+            actual = results[backend]
+            mismatched = [key for key in ('forms', 'buttons', 'links') if actual[key] != expected[key]]
+            print(f"\n{backend}: {'matches' if not mismatched else 'differs in ' + ', '.join(mismatched)} the baseline output")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: AI provider startup and per-request setup cost
+
+Measures, each in a fresh interpreter, how long importing the provider layer
+takes and whether it pulls in the AI SDKs, next to what importing the SDKs
+eagerly would cost. Then times building a TestGenerator and listing providers
+the way /providers and /generate-tests do on every request, cold and warm.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat 5] [--requests 200]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SDK_MODULES = ('anthropic', 'google.generativeai')
+
+IMPORT_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+print(json.dumps({{'seconds': elapsed, 'sdks_loaded': [name for name in {sdks!r} if name in sys.modules]}}))
+"""
+
+
+def time_import(statement, repeat):
+    """Best-of-repeat time for a statement run in a fresh interpreter; None if it fails"""
+    best = None
+    sdks_loaded = []
+    for _ in range(repeat):
+        script = IMPORT_SCRIPT.format(statement=statement, sdks=SDK_MODULES)
+        completed = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True)
+        if completed.returncode != 0:
+            return None, []
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        best = result['seconds'] if best is None else min(best, result['seconds'])
+        sdks_loaded = result['sdks_loaded']
+    return best, sdks_loaded
+
+
+def time_requests(count):
+    """Seconds for the first request's provider setup, and the mean of the following ones"""
+    from services.test_generator import TestGenerator
+
+    started = time.perf_counter()
+    TestGenerator().get_available_providers()
+    cold = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(count):
+        TestGenerator().get_available_providers()
+    warm = (time.perf_counter() - started) / count
+    return cold, warm
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"Fresh-interpreter imports, best of {args.repeat} runs\n")
+    print(f"{'import':<40}{'ms':>10}  SDKs loaded")
+    for label, statement in (
+        ('services.ai_providers', 'import services.ai_providers'),
+        ('services.test_generator', 'import services.test_generator'),
+        ('anthropic (eager, for reference)', 'import anthropic'),
+        ('google.generativeai (eager, for reference)', 'import google.generativeai')
+    ):
+        seconds, sdks_loaded = time_import(statement, args.repeat)
+        if seconds is None:
+            print(f"{label:<40}{'-':>10}  not installed or failed to import")
+        else:
+            print(f"{label:<40}{seconds * 1000:>10.1f}  {', '.join(sdks_loaded) or 'none'}")
+
+    cold, warm = time_requests(args.requests)
+    print(f"\nTestGenerator + get_available_providers over {args.requests} requests")
+    print(f"{'first request':<40}{cold * 1000:>10.3f} ms")
+    print(f"{'later requests (mean)':<40}{warm * 1000:>10.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Check: which Performance tests are driven as load tests
+
+Runs the auto-mode name check over hand-picked names and over every saved
+downloads/*/test_cases.json, so single-page timing tests such as
+"Page Load Time" stay on the single-request path. Exits non-zero on a mismatch.
+
+Usage:
+    python benchmarks/check_load_test_selection.py
+"""
+
+import glob
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config.execution import LOAD_TEST_CONFIG  # noqa: E402
+from services.load_generator import is_load_test  # noqa: E402
+
+EXPECTED = {
+    'Page Load Time': False,
+    'Performance: Page Load Time': False,
+    'Performance Testing: Page Load Time': False,
+    'Page Load Validation': False,
+    'Calculation Response Time': False,
+    'Download Speed': False,
+    'Load Test: Home Page': True,
+    'Homepage Under Load': True,
+    'Stress Test Checkout': True,
+    'Concurrent Users on Login': True,
+    'API Throughput': True,
+    'Scalability of Search': True,
+}
+
+
+def saved_cases():
+    """Every test case saved under downloads/, with the file it came from"""
+    for path in sorted(glob.glob(os.path.join(ROOT, 'downloads', '*', 'test_cases.json'))):
+        with open(path, encoding='utf-8') as handle:
+            data = json.load(handle)
+        for case in data if isinstance(data, list) else data.get('test_cases', []):
+            yield os.path.relpath(path, ROOT), case
+
+
+def main():
+    LOAD_TEST_CONFIG['mode'] = 'auto'
+    failures = []
+
+    for name, expected in EXPECTED.items():
+        if is_load_test({'name': name}) != expected:
+            failures.append(f"{name!r}: expected {'load test' if expected else 'single request'}")
+
+    checked = 0
+    for path, case in saved_cases():
+        if case.get('category', '').lower().startswith('performance'):
+            checked += 1
+            routed = 'load test' if is_load_test(case) else 'single request'
+            print(f"{path}: {case.get('name')!r} -> {routed}")
+            if 'page load' in case.get('name', '').lower() and routed == 'load test':
+                failures.append(f"{path}: {case.get('name')!r} would be load tested")
+
+    if is_load_test({'name': 'Page Load Time', 'test_data': {'load_test': True}}) is not True:
+        failures.append("test_data['load_test'] does not override the name check")
+
+    print(f"\n{len(EXPECTED)} names and {checked} saved Performance tests checked")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -62,9 +62,9 @@ class LocalAppHandler(AppHandler):
     
     def is_accessible(self, url):
         """Check if local app is running and accessible"""
-        import requests
+        from services.http_client import get_http_client
         try:
-            response = requests.get(url, timeout=5)
+            response = get_http_client('local').session.get(url, timeout=5)
             return response.status_code == 200
         except:
             return False
@@ -153,7 +153,14 @@ APP_TYPE_CONFIG = {
         "security_checks": ["basic"],
         "performance_thresholds": {
             "page_load": 10.0,  # seconds
-            "response_time": 5.0  # seconds
+            "response_time": 5.0,  # seconds
+            "error_rate": 0.01  # fraction of failed requests under load
+        },
+        "crawl": {
+            "max_depth": 2,
+            "max_pages": 20,
+            "concurrency": 4,  # concurrent page fetches
+            "browser_workers": 2  # browsers for JS-rendered pages
         }
     },
     "internet": {  # Future configuration
@@ -163,12 +170,19 @@ APP_TYPE_CONFIG = {
         "security_checks": ["basic", "headers"],
         "performance_thresholds": {
             "page_load": 30.0,  # seconds
-            "response_time": 15.0  # seconds
+            "response_time": 15.0,  # seconds
+            "error_rate": 0.05  # fraction of failed requests under load
         },
         "rate_limit": {
             "requests_per_minute": 30,
             "concurrent_requests": 3
         },
+        "crawl": {
+            "max_depth": 1,
+            "max_pages": 10,
+            "concurrency": 3,  # matches concurrent_requests
+            "browser_workers": 1
+        },
         "compliance": {
             "check_robots_txt": True,
             "respect_crawl_delay": True,
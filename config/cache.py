@@ -0,0 +1,29 @@
+"""
+Configuration for on-disk caches
+This module defines where cached results are stored and how long they are kept
+"""
+
+import os
+
+CACHE_ROOT = os.getenv('CACHE_DIR', 'data/cache')
+
+# Cached AppAnalyzer contexts keyed by URL and a hash of the fetched page
+ANALYSIS_CACHE_CONFIG = {
+    "enabled": os.getenv('ANALYSIS_CACHE_ENABLED', 'true').lower() == 'true',
+    "directory": os.path.join(CACHE_ROOT, 'analysis'),
+    "ttl": 3600,  # seconds
+    "max_entries": 200  # least recently used entries are evicted beyond this
+}
+
+# Cached LLM test generation results keyed by prompt hash and model
+LLM_CACHE_CONFIG = {
+    "enabled": os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true',
+    "directory": os.path.join(CACHE_ROOT, 'llm'),
+    "ttl": None,  # prompts fully determine the entry, so entries never expire
+    "max_bytes": 50 * 1024 * 1024  # least recently used entries are evicted beyond this
+}
+
+# Excel exports kept next to the session JSON they were built from
+EXPORT_CACHE_CONFIG = {
+    "enabled": os.getenv('EXPORT_CACHE_ENABLED', 'true').lower() == 'true'  # false rebuilds on every download
+}
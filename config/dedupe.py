@@ -0,0 +1,20 @@
+"""
+Configuration for semantic test case deduplication
+This module defines the similarity threshold, vector size and the cross-session index location
+"""
+
+import os
+
+DEDUPE_CONFIG = {
+    "enabled": os.getenv('DEDUPE_ENABLED', 'true').lower() == 'true',
+    "threshold": float(os.getenv('DEDUPE_THRESHOLD', '0.85')),  # Cosine similarity at which tests are duplicates
+    "n_features": 2 ** 12,          # Hashed TF-IDF vector size
+    "field_weights": {              # How much each field's terms count towards a test's signature
+        "name": 2.0,
+        "steps": 1.0,
+        "expected_result": 1.0
+    },
+    "index_path": os.getenv('DEDUPE_INDEX_PATH', 'data/dedupe_index.npz'),  # Signatures of earlier sessions
+    "max_index_entries": 5000,      # Oldest sessions are dropped beyond this
+    "block_size": 1024              # Index rows compared at once
+}
@@ -0,0 +1,89 @@
+"""
+Configuration for test execution
+This module defines browser pool and execution settings used by the test executor
+"""
+
+import os
+
+# Parallel execution settings
+EXECUTION_CONFIG = {
+    "workers": int(os.getenv('EXECUTION_WORKERS', '1')),            # Browser workers; 1 runs tests sequentially
+    "http_workers": int(os.getenv('EXECUTION_HTTP_WORKERS', '4'))   # Workers for HTTP-only test categories
+}
+
+# Sharded execution across local processes and remote worker hosts
+DISTRIBUTED_CONFIG = {
+    "worker_urls": [url.strip() for url in os.getenv('SHARD_WORKER_URLS', '').split(',') if url.strip()],
+    "local_processes": int(os.getenv('SHARD_LOCAL_PROCESSES', str(max(1, (os.cpu_count() or 2) // 2)))),
+    "workers_per_shard": int(os.getenv('SHARD_WORKERS_PER_PROCESS', '2')),  # browsers per shard process
+    "worker_token": os.getenv('SHARD_WORKER_TOKEN', ''),  # shared secret sent to remote workers
+    "request_timeout": 30,  # seconds to wait for a remote worker to send the next line
+    "heartbeat_interval": 10  # seconds between heartbeat lines while a worker test is still running
+}
+
+# Budgeted test selection
+SELECTION_CONFIG = {
+    "default_limit": 10,            # Tests run when neither a limit nor a budget is given
+    "history_dir": "downloads",     # Where past execution_history.json files are read from
+    "default_duration": 3.0,        # Seconds assumed for tests with no history
+    "category_decay": 0.5,          # Value multiplier for each further test in an already covered category
+    "cost_per_second": {            # Relative cost of one second of execution per lane
+        "browser": 1.0,
+        "http": 0.25
+    }
+}
+
+# Test categories that only need HTTP requests and never wait for a browser
+HTTP_ONLY_CATEGORIES = ('performance', 'security')
+
+# WebDriver pool settings
+DRIVER_POOL_CONFIG = {
+    "size": 2,                  # Maximum number of concurrent browser sessions
+    "warm_up": 1,               # Browsers started eagerly when the pool is created
+    "lease_timeout": 60,        # Seconds to wait for a free browser
+    "page_load_timeout": 30,    # Seconds before driver.get gives up
+    "script_timeout": 30,       # Seconds for async scripts; restored on every release
+    "max_uses": 50,             # Leases before a browser is recycled
+    "max_lifetime": 600,        # Seconds before a browser is recycled
+    "window_size": (1920, 1080)
+}
+
+# Page readiness waits (replace fixed sleeps after navigation)
+READINESS_CONFIG = {
+    "document_ready_timeout": 15,   # Seconds to wait for document.readyState == 'complete'
+    "network_idle_timeout": 10,     # Seconds to wait for fetch/XHR traffic to stop
+    "network_idle_ms": 500,         # Milliseconds without network activity that count as idle
+    "dom_quiet_timeout": 5,         # Seconds to wait for DOM mutations to stop
+    "dom_quiet_ms": 300,            # Milliseconds without DOM mutations that count as quiet
+    "poll_interval": 0.05           # Seconds between readiness checks
+}
+
+# Shared HTTP client (retry attempts come from APP_TYPE_CONFIG[app_type]['retry_attempts'])
+HTTP_CLIENT_CONFIG = {
+    "pool_connections": 10,         # Hosts kept in the connection pool cache
+    "pool_maxsize": 10,             # Keep-alive connections per host
+    "pool_block": True,             # Wait for a free connection instead of exceeding pool_maxsize
+    "backoff_factor": 0.3,          # Retry sleeps: 0.3s, 0.6s, 1.2s, ...
+    "retry_statuses": (502, 503, 504),
+    "http2": os.getenv('HTTP_CLIENT_HTTP2', 'false').lower() == 'true'  # Timed requests over HTTP/2 (needs httpx[http2])
+}
+
+# Load-testing mode for Performance tests
+LOAD_TEST_CONFIG = {
+    "mode": os.getenv('LOAD_TEST_MODE', 'auto'),  # 'auto' (load/stress/concurrency tests), 'always' or 'off'
+    "concurrency": int(os.getenv('LOAD_TEST_CONCURRENCY', '10')),  # Virtual users
+    "duration": float(os.getenv('LOAD_TEST_DURATION', '10')),      # Seconds of load after ramp-up starts
+    "ramp_up": 2.0,                 # Seconds over which virtual users are started
+    "think_time": 0.0,              # Seconds each user waits between requests
+    "request_timeout": 10.0,        # Seconds before a request counts as an error
+    "max_paths": 20,                # Distinct URLs taken from the entry page
+    "submit_post_forms": False,     # POST forms change app state, so they are left out by default
+    "verify_tls": True
+}
+
+# Browser-side performance metrics collected after each page load
+BROWSER_METRICS_CONFIG = {
+    "enabled": os.getenv('BROWSER_METRICS', 'true').lower() == 'true',
+    "max_resources": 50,        # Slowest resource timing entries kept for the waterfall
+    "script_timeout": 5         # Seconds allowed for the collection script
+}
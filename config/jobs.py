@@ -0,0 +1,17 @@
+"""
+Configuration for background jobs
+This module defines where jobs are stored and how many of each type may run at once
+"""
+
+import os
+
+JOB_QUEUE_CONFIG = {
+    "database": os.getenv('JOB_DB_PATH', 'data/jobs.db'),
+    "concurrency": {  # workers per job type
+        "analyze": 2,
+        "generate-tests": 2,
+        "execute-tests": 1
+    },
+    "default_concurrency": 1,
+    "retention": 7 * 24 * 3600  # seconds to keep finished jobs
+}
@@ -3,13 +3,37 @@ Prompt templates for AI providers
 This module contains all prompt templates used for test case generation
 """
 
+import os
 import json
 
+# Token budget for the application context pasted into generation prompts
+CONTEXT_BUDGET_CONFIG = {
+    "max_tokens": int(os.getenv('CONTEXT_TOKEN_BUDGET', '3000')),  # estimated with a local tokenizer heuristic
+    "section_weights": {            # Share of the budget each section may use, highest filled first
+        "forms": 4,
+        "buttons": 2,
+        "pages": 2,
+        "links": 1
+    },
+    "max_field_names": 8,           # Field names listed per input type before the rest are counted
+    "max_overview_field_tokens": 120  # URL, title, description, structure and technologies are each cut to this
+}
+
+# Map-reduce generation: one provider call per part of the app, merged afterwards
+MAP_REDUCE_CONFIG = {
+    "mode": os.getenv('GENERATION_MODE', 'auto'),  # 'single', 'map-reduce', or 'auto' (map-reduce for larger apps)
+    "min_chunks": 4,                # Chunks a context must split into before auto mode fans out
+    "max_chunks": 8,                # Upper bound on provider calls per generation
+    "tests_per_chunk": "5-8",       # Requested test count for each chunk
+    "concurrency": 4,               # Provider calls in flight at once
+    "requests_per_minute": 50       # Provider call rate across all chunks
+}
+
 class PromptTemplates:
     """Container for all AI prompt templates"""
     
     @staticmethod
-    def get_claude_test_generation_prompt(context, template=None):
+    def get_claude_test_generation_prompt(context, template=None, test_count="15-20"):
         """Get Claude-specific prompt for test case generation"""
         
         base_prompt = f"""
@@ -59,7 +83,7 @@ Example format:
   }}
 ]
 
-Generate at least 15-20 comprehensive test cases covering all aspects of the application.
+Generate at least {test_count} comprehensive test cases covering all aspects of the application.
 """
         
         if template:
@@ -68,7 +92,7 @@ Generate at least 15-20 comprehensive test cases covering all aspects of the app
         return base_prompt
     
     @staticmethod
-    def get_gemini_test_generation_prompt(context, template=None):
+    def get_gemini_test_generation_prompt(context, template=None, test_count="15-20"):
         """Get Gemini-specific prompt for test case generation"""
         
         base_prompt = f"""
@@ -114,7 +138,7 @@ Example structure:
   }}
 ]
 
-Generate 15-20 comprehensive test cases as a JSON array:
+Generate {test_count} comprehensive test cases as a JSON array:
 """
         
         if template:
@@ -202,7 +226,7 @@ class PromptManager:
     def __init__(self):
         self.templates = PromptTemplates()
     
-    def get_prompt(self, provider, test_type="web", context="", template=None):
+    def get_prompt(self, provider, test_type="web", context="", template=None, test_count=None):
         """
         Get appropriate prompt for given provider and test type
         
@@ -211,23 +235,26 @@ class PromptManager:
             test_type (str): Type of testing ('web', 'api', 'mobile')
             context (str): Application context
             template (dict, optional): Custom template requirements
+            test_count (str, optional): Number of web test cases to ask for, e.g. "5-8"
         
         Returns:
             str: Formatted prompt
         """
         
+        test_count = test_count or "15-20"
+        
         if test_type == "web":
             if provider.lower() == "claude":
-                return self.templates.get_claude_test_generation_prompt(context, template)
+                return self.templates.get_claude_test_generation_prompt(context, template, test_count)
             elif provider.lower() == "gemini":
-                return self.templates.get_gemini_test_generation_prompt(context, template)
+                return self.templates.get_gemini_test_generation_prompt(context, template, test_count)
         elif test_type == "api":
             return self.templates.get_api_test_generation_prompt(context, template)
         elif test_type == "mobile":
             return self.templates.get_mobile_test_generation_prompt(context, template)
         
         # Default to Claude web testing prompt
-        return self.templates.get_claude_test_generation_prompt(context, template)
+        return self.templates.get_claude_test_generation_prompt(context, template, test_count)
     
     def add_custom_prompt(self, provider, test_type, prompt_template):
         """Add custom prompt template (future feature)"""
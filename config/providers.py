@@ -0,0 +1,15 @@
+"""
+Configuration for AI providers
+This module defines which provider classes are registered and how long their availability is cached
+"""
+
+import os
+
+PROVIDER_CONFIG = {
+    "classes": {  # Provider key -> class path; imported on first use
+        "claude": "services.ai_providers.ClaudeProvider",
+        "gemini": "services.ai_providers.GeminiProvider"
+    },
+    "default": os.getenv('DEFAULT_AI_PROVIDER', 'claude'),
+    "availability_ttl": 300  # seconds /providers answers from the cached availability list
+}
@@ -0,0 +1,15 @@
+"""
+Configuration for the execution results store
+This module defines where run history is kept and the defaults for history queries
+"""
+
+import os
+
+RESULTS_STORE_CONFIG = {
+    "database": os.getenv('RESULTS_DB_PATH', 'data/results.db'),
+    "history_dir": "downloads",     # execution_history.json files imported on first use
+    "trend_days": 30,               # Default window for pass-rate trends
+    "flaky_window": 20,             # Most recent results per test considered for flakiness
+    "flaky_min_runs": 3,            # Results needed before a test can be called flaky
+    "percentiles": (50, 90, 95, 99)
+}
@@ -1,18 +1,42 @@
 import os
 import json
+import asyncio
+import threading
+import importlib.util
 from abc import ABC, abstractmethod
-from anthropic import Anthropic
-import google.generativeai as genai
+from functools import lru_cache
 from config.prompts import PromptManager
+from config.providers import PROVIDER_CONFIG
+from services.response_cache import ResponseCache
+from services.context_compactor import fit_to_budget
+from services.json_stream import IncrementalJSONArrayParser
+from services.map_reduce import MapReduceGenerator, TestCaseMerger
+from services.provider_registry import get_registry
+
+# SDKs (anthropic, google.generativeai) are imported on a provider's first call, not at startup
+
+
+@lru_cache(maxsize=None)
+def sdk_installed(module_name):
+    """Check whether an SDK can be imported without importing it"""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
 
 class AIProvider(ABC):
     """Abstract base class for AI providers"""
     
     @abstractmethod
-    def generate_test_cases(self, context, template=None):
+    def generate_test_cases(self, context, template=None, test_count=None):
         """Generate test cases based on application context"""
         pass
     
+    @abstractmethod
+    def build_prompt(self, context, template=None, test_count=None):
+        """Build the prompt sent to the model"""
+        pass
+    
     @abstractmethod
     def is_available(self):
         """Check if the provider is properly configured"""
@@ -22,40 +46,100 @@ class AIProvider(ABC):
     def get_provider_info(self):
         """Get provider information"""
         pass
+    
+    @abstractmethod
+    def _stream_response_text(self, prompt):
+        """Yield the model response as text chunks using the streaming API"""
+        pass
+    
+    async def generate_test_cases_async(self, context, template=None, test_count=None):
+        """Generate test cases without blocking the event loop; providers with an async SDK override this"""
+        return await asyncio.to_thread(self.generate_test_cases, context, template, test_count)
+    
+    def stream_test_cases(self, context, template=None):
+        """
+        Generate test cases, yielding each one as soon as its JSON object is complete
+        
+        Yields:
+            dict: Validated test case
+        """
+        if not self.is_available():
+            raise ValueError(f"{self.get_provider_info()['name']} API key not configured")
+        
+        parser = IncrementalJSONArrayParser()
+        count = 0
+        for chunk in self._stream_response_text(self.build_prompt(context, template)):
+            for test_case in parser.feed(chunk):
+                count += 1
+                validated_case = self._validate_test_cases([test_case])[0]
+                validated_case['id'] = count
+                validated_case['name'] = test_case.get('name', f'Test Case {count}')
+                yield validated_case
+            if parser.finished:
+                break
+        
+        if count == 0:
+            for test_case in self._create_fallback_test_cases():
+                yield test_case
 
 class ClaudeProvider(AIProvider):
     """Claude AI provider using Anthropic API"""
     
+    model_name = "claude-3-sonnet-20240229"
+    
     def __init__(self):
         self.api_key = os.getenv('ANTHROPIC_API_KEY')
-        self.client = None
         self.prompt_manager = PromptManager()
-        if self.api_key:
+        self._client = None
+        self._async_client = None
+        self._init_error = None
+        self._lock = threading.Lock()
+    
+    @property
+    def client(self):
+        self._connect()
+        return self._client
+    
+    @property
+    def async_client(self):
+        self._connect()
+        return self._async_client
+    
+    def _connect(self):
+        """Import the SDK and create the pooled sync and async clients on first use"""
+        if self._client is not None or self._init_error is not None:
+            return
+        with self._lock:
+            if self._client is not None or self._init_error is not None:
+                return
             try:
-                self.client = Anthropic(api_key=self.api_key)
+                from anthropic import Anthropic, AsyncAnthropic
+                self._async_client = AsyncAnthropic(api_key=self.api_key)
+                self._client = Anthropic(api_key=self.api_key)
             except Exception as e:
+                self._init_error = e
                 print(f"Failed to initialize Claude client: {e}")
     
     def is_available(self):
-        return bool(self.api_key and self.client)
+        return bool(self.api_key) and self._init_error is None and sdk_installed('anthropic')
     
     def get_provider_info(self):
         return {
             "name": "Claude",
             "provider": "Anthropic",
-            "model": "claude-3-sonnet-20240229",
+            "model": self.model_name,
             "description": "Advanced reasoning and analysis capabilities"
         }
     
-    def generate_test_cases(self, context, template=None):
+    def generate_test_cases(self, context, template=None, test_count=None):
         if not self.is_available():
             raise ValueError("Claude API key not configured")
         
-        prompt = self.prompt_manager.get_prompt("claude", "web", context, template)
+        prompt = self.build_prompt(context, template, test_count)
         
         try:
             response = self.client.messages.create(
-                model="claude-3-sonnet-20240229",
+                model=self.model_name,
                 max_tokens=4000,
                 messages=[
                     {
@@ -71,6 +155,53 @@ class ClaudeProvider(AIProvider):
         except Exception as e:
             raise Exception(f"Failed to generate test cases using Claude API: {str(e)}")
     
+    async def generate_test_cases_async(self, context, template=None, test_count=None):
+        if not self.is_available():
+            raise ValueError("Claude API key not configured")
+        
+        prompt = self.build_prompt(context, template, test_count)
+        
+        try:
+            response = await self.async_client.messages.create(
+                model=self.model_name,
+                max_tokens=4000,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ]
+            )
+            
+            return self._parse_test_cases(response.content[0].text)
+            
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to generate test cases using Claude API: {str(e)}")
+    
+    def build_prompt(self, context, template=None, test_count=None):
+        """Build the exact prompt sent to Claude"""
+        # Contexts normally arrive compacted; this bounds edited or legacy ones as well
+        return self.prompt_manager.get_prompt("claude", "web", fit_to_budget(context), template, test_count)
+    
+    def _stream_response_text(self, prompt):
+        try:
+            with self.client.messages.stream(
+                model=self.model_name,
+                max_tokens=4000,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ]
+            ) as stream:
+                for text in stream.text_stream:
+                    yield text
+        except Exception as e:
+            raise Exception(f"Failed to stream test cases using Claude API: {str(e)}")
+    
     
     def _parse_test_cases(self, response_text):
         """Parse Claude's response to extract test cases"""
@@ -145,35 +276,51 @@ class ClaudeProvider(AIProvider):
 class GeminiProvider(AIProvider):
     """Gemini AI provider using Google Generative AI"""
     
+    model_name = "gemini-1.5-flash"
+    
     def __init__(self):
         self.api_key = os.getenv('GEMINI_API_KEY')
         self.prompt_manager = PromptManager()
-        if self.api_key:
+        self._model = None
+        self._init_error = None
+        self._lock = threading.Lock()
+    
+    @property
+    def model(self):
+        self._connect()
+        return self._model
+    
+    def _connect(self):
+        """Import the SDK, configure it and create the model on first use"""
+        if self._model is not None or self._init_error is not None:
+            return
+        with self._lock:
+            if self._model is not None or self._init_error is not None:
+                return
             try:
+                import google.generativeai as genai
                 genai.configure(api_key=self.api_key)
-                self.model = genai.GenerativeModel('gemini-1.5-flash')
+                self._model = genai.GenerativeModel(self.model_name)
             except Exception as e:
+                self._init_error = e
                 print(f"Failed to initialize Gemini client: {e}")
-                self.model = None
-        else:
-            self.model = None
     
     def is_available(self):
-        return bool(self.api_key and self.model)
+        return bool(self.api_key) and self._init_error is None and sdk_installed('google.generativeai')
     
     def get_provider_info(self):
         return {
             "name": "Gemini",
             "provider": "Google",
-            "model": "gemini-1.5-flash",
+            "model": self.model_name,
             "description": "Fast and efficient AI model with strong reasoning"
         }
     
-    def generate_test_cases(self, context, template=None):
+    def generate_test_cases(self, context, template=None, test_count=None):
         if not self.is_available():
             raise ValueError("Gemini API key not configured")
         
-        prompt = self.prompt_manager.get_prompt("gemini", "web", context, template)
+        prompt = self.build_prompt(context, template, test_count)
         
         try:
             response = self.model.generate_content(prompt)
@@ -186,6 +333,38 @@ class GeminiProvider(AIProvider):
         except Exception as e:
             raise Exception(f"Failed to generate test cases using Gemini API: {str(e)}")
     
+    async def generate_test_cases_async(self, context, template=None, test_count=None):
+        if not self.is_available():
+            raise ValueError("Gemini API key not configured")
+        
+        prompt = self.build_prompt(context, template, test_count)
+        
+        try:
+            response = await self.model.generate_content_async(prompt)
+            
+            if not response.text:
+                raise Exception("Empty response from Gemini API")
+            
+            return self._parse_test_cases(response.text)
+            
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to generate test cases using Gemini API: {str(e)}")
+    
+    def build_prompt(self, context, template=None, test_count=None):
+        """Build the exact prompt sent to Gemini"""
+        # Contexts normally arrive compacted; this bounds edited or legacy ones as well
+        return self.prompt_manager.get_prompt("gemini", "web", fit_to_budget(context), template, test_count)
+    
+    def _stream_response_text(self, prompt):
+        try:
+            for chunk in self.model.generate_content(prompt, stream=True):
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            raise Exception(f"Failed to stream test cases using Gemini API: {str(e)}")
+    
     
     def _parse_test_cases(self, response_text):
         """Parse Gemini's response to extract test cases"""
@@ -263,15 +442,48 @@ class GeminiProvider(AIProvider):
             }
         ]
 
+# Provider selections that query every available provider at once
+FAN_OUT_MODES = ('race', 'merge')
+
+
+class _EventLoopThread:
+    """Long-lived event loop in a daemon thread, so async SDK clients always run on the same loop"""
+    
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name='ai-provider-loop', daemon=True)
+        self._thread.start()
+    
+    def run(self, coroutine):
+        """Run a coroutine on the loop and block the calling thread until it finishes"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+
+_loop_thread = None
+_loop_lock = threading.Lock()
+
+
+def _provider_loop():
+    """Process-wide event loop for async provider calls"""
+    global _loop_thread
+    with _loop_lock:
+        if _loop_thread is None:
+            _loop_thread = _EventLoopThread()
+        return _loop_thread
+
+
 class AIProviderManager:
     """Manager class for handling multiple AI providers"""
     
     def __init__(self):
-        self.providers = {
-            'claude': ClaudeProvider(),
-            'gemini': GeminiProvider()
-        }
-        self.default_provider = os.getenv('DEFAULT_AI_PROVIDER', 'claude')
+        # Process-wide provider instances, so SDK clients and their connection pools are reused
+        self.registry = get_registry()
+        self.providers = self.registry.providers()
+        self.default_provider = PROVIDER_CONFIG['default']
+        self.response_cache = ResponseCache()
+        self.map_reduce = MapReduceGenerator()
+        self.last_cache_status = None
+        self.last_provider_used = None
     
     def get_provider(self, provider_name=None):
         """Get a specific AI provider or the default one"""
@@ -294,23 +506,234 @@ class AIProviderManager:
         return provider
     
     def get_available_providers(self):
-        """Get list of available providers"""
-        available = []
-        for name, provider in self.providers.items():
-            if provider.is_available():
-                info = provider.get_provider_info()
-                info['key'] = name
-                info['available'] = True
-                available.append(info)
-            else:
-                info = provider.get_provider_info()
-                info['key'] = name
-                info['available'] = False
-                available.append(info)
+        """Get list of available providers (cached by the registry)"""
+        return self.registry.provider_info()
+    
+    def generate_test_cases(self, context, provider_name=None, template=None, use_cache=True, mode=None,
+                            context_info=None):
+        """
+        Generate test cases using the specified or default provider
         
-        return available
+        Identical prompts for the same model are answered from the response
+        cache, skipping both the API call and response parsing. Larger apps are
+        split into chunks generated concurrently and merged (see MAP_REDUCE_CONFIG).
+        
+        Args:
+            provider_name (str, optional): Provider key, or 'race'/'merge' to query every available provider
+            mode (str, optional): 'single', 'map-reduce' or 'auto'; defaults to GENERATION_MODE (ignored by 'race'/'merge')
+            context_info (dict, optional): Analyzer report behind context; map-reduce chunks are split from it
+        """
+        if provider_name and provider_name.lower() in FAN_OUT_MODES:
+            return self.fan_out(context, provider_name.lower(), template, use_cache)
+        
+        provider = self.get_provider(provider_name)
+        self.last_provider_used = self._provider_key(provider)
+        
+        chunks = self.map_reduce.plan(context, mode, context_info)
+        if chunks:
+            merger = TestCaseMerger()
+            results = dict(self.map_reduce.run(self._chunk_generator(provider, template, use_cache), chunks))
+            # Merge in chunk order so the same answers always produce the same suite
+            for index in sorted(results):
+                merger.add(results[index][0])
+            self.last_cache_status = self._combined_status([status for _, status in results.values()])
+            return merger.test_cases or provider._create_fallback_test_cases()
+        
+        test_cases, self.last_cache_status = self._generate_cached(provider, context, template, use_cache)
+        return test_cases
     
-    def generate_test_cases(self, context, provider_name=None, template=None):
-        """Generate test cases using the specified or default provider"""
+    def stream_test_cases(self, context, provider_name=None, template=None, use_cache=True, mode=None,
+                          context_info=None):
+        """Stream test cases one by one, serving the whole list from cache on a hit"""
+        if provider_name and provider_name.lower() in FAN_OUT_MODES:
+            yield from self.fan_out(context, provider_name.lower(), template, use_cache)
+            return
+        
         provider = self.get_provider(provider_name)
-        return provider.generate_test_cases(context, template)
\ No newline at end of file
+        self.last_provider_used = self._provider_key(provider)
+        
+        chunks = self.map_reduce.plan(context, mode, context_info)
+        if chunks:
+            # Each chunk's new test cases are yielded as soon as that chunk finishes
+            merger = TestCaseMerger()
+            statuses = []
+            for _, (test_cases, status) in self.map_reduce.run(self._chunk_generator(provider, template, use_cache), chunks):
+                statuses.append(status)
+                yield from merger.add(test_cases)
+            self.last_cache_status = self._combined_status(statuses)
+            if not merger.test_cases:
+                yield from provider._create_fallback_test_cases()
+            return
+        
+        if not use_cache or not self.response_cache.enabled:
+            self.last_cache_status = 'bypass'
+            yield from provider.stream_test_cases(context, template)
+            return
+        
+        prompt = provider.build_prompt(context, template)
+        cache_key = self.response_cache.make_key(self._provider_key(provider), provider.model_name, prompt)
+        
+        cached_test_cases = self.response_cache.get(cache_key)
+        if cached_test_cases is not None:
+            self.last_cache_status = 'hit'
+            yield from cached_test_cases
+            return
+        
+        self.last_cache_status = 'miss'
+        test_cases = []
+        for test_case in provider.stream_test_cases(context, template):
+            test_cases.append(test_case)
+            yield test_case
+        
+        if test_cases != provider._create_fallback_test_cases():
+            self.response_cache.set(cache_key, test_cases)
+    
+    def _generate_cached(self, provider, context, template, use_cache, test_count=None, before_call=None):
+        """
+        Generate through the response cache; returns (test_cases, cache status)
+        
+        before_call, if given, runs right before the provider is actually called (e.g. a rate limiter)
+        """
+        cache_key, cached_test_cases = self._cache_lookup(provider, context, template, use_cache, test_count)
+        if cached_test_cases is not None:
+            return cached_test_cases, 'hit'
+        
+        if before_call:
+            before_call()
+        test_cases = provider.generate_test_cases(context, template, test_count)
+        return test_cases, self._cache_store(provider, cache_key, test_cases)
+    
+    async def _generate_cached_async(self, provider, context, template, use_cache):
+        """Async counterpart of _generate_cached; returns (test_cases, cache status)"""
+        # The response cache reads and writes files, so keep it off the shared provider loop
+        cache_key, cached_test_cases = await asyncio.to_thread(self._cache_lookup, provider, context, template, use_cache)
+        if cached_test_cases is not None:
+            return cached_test_cases, 'hit'
+        
+        test_cases = await provider.generate_test_cases_async(context, template)
+        return test_cases, await asyncio.to_thread(self._cache_store, provider, cache_key, test_cases)
+    
+    def _cache_lookup(self, provider, context, template, use_cache, test_count=None):
+        """Return (cache key, cached test cases or None); the key is None when the cache is bypassed"""
+        if not use_cache or not self.response_cache.enabled:
+            return None, None
+        prompt = provider.build_prompt(context, template, test_count)
+        cache_key = self.response_cache.make_key(self._provider_key(provider), provider.model_name, prompt)
+        return cache_key, self.response_cache.get(cache_key)
+    
+    def _cache_store(self, provider, cache_key, test_cases):
+        """Cache a fresh answer and return the cache status of the call"""
+        if cache_key is None:
+            return 'bypass'
+        # Never cache the placeholder returned when a response could not be parsed
+        if test_cases != provider._create_fallback_test_cases():
+            self.response_cache.set(cache_key, test_cases)
+        return 'miss'
+    
+    def fan_out(self, context, strategy='race', template=None, use_cache=True):
+        """
+        Query every available provider concurrently
+        
+        Each provider gets one call with the whole context; generation_mode does
+        not apply, so map-reduce chunking is never combined with fan-out.
+        
+        Args:
+            context (str): The application context analysis
+            strategy (str): 'race' returns the first provider answer that parses;
+                'merge' waits for all providers and combines their test cases without duplicates
+            template (dict, optional): Custom test case template
+            use_cache (bool): Reuse cached test cases for an identical prompt and model
+        
+        Returns:
+            list: List of test case dictionaries
+        """
+        providers = [(name, provider) for name, provider in self.providers.items() if provider.is_available()]
+        if not providers:
+            raise ValueError("No AI provider is available")
+        
+        if strategy == 'race':
+            coroutine = self._race(providers, context, template, use_cache)
+        else:
+            coroutine = self._merge(providers, context, template, use_cache)
+        return _provider_loop().run(coroutine)
+    
+    async def _race(self, providers, context, template, use_cache):
+        tasks = {
+            asyncio.ensure_future(self._generate_cached_async(provider, context, template, use_cache)): (name, provider)
+            for name, provider in providers
+        }
+        pending = set(tasks)
+        errors = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception():
+                        errors.append(task.exception())
+                        continue
+                    name, provider = tasks[task]
+                    test_cases, status = task.result()
+                    if test_cases != provider._create_fallback_test_cases():
+                        self.last_provider_used = name
+                        self.last_cache_status = status
+                        return test_cases
+        finally:
+            # The slower providers' requests are no longer needed
+            for task in pending:
+                task.cancel()
+        
+        if len(errors) == len(tasks):
+            raise errors[0]
+        self.last_provider_used = providers[0][0]
+        self.last_cache_status = 'miss'
+        return providers[0][1]._create_fallback_test_cases()
+    
+    async def _merge(self, providers, context, template, use_cache):
+        results = await asyncio.gather(
+            *(self._generate_cached_async(provider, context, template, use_cache) for _, provider in providers),
+            return_exceptions=True
+        )
+        
+        merger = TestCaseMerger()
+        used = []
+        statuses = []
+        errors = []
+        for (name, provider), result in zip(providers, results):
+            if isinstance(result, Exception):
+                errors.append(result)
+                continue
+            test_cases, status = result
+            statuses.append(status)
+            if test_cases != provider._create_fallback_test_cases():
+                merger.add(test_cases)
+                used.append(name)
+        
+        if len(errors) == len(providers):
+            raise errors[0]
+        self.last_provider_used = '+'.join(used) or providers[0][0]
+        self.last_cache_status = self._combined_status(statuses)
+        return merger.test_cases or providers[0][1]._create_fallback_test_cases()
+    
+    def _chunk_generator(self, provider, template, use_cache):
+        """Per-chunk call for map-reduce; cache hits skip the rate limiter and unparseable chunks add nothing"""
+        fallback = provider._create_fallback_test_cases()
+        
+        def generate_chunk(chunk_context, test_count):
+            test_cases, status = self._generate_cached(provider, chunk_context, template, use_cache, test_count,
+                                                       before_call=self.map_reduce.rate_limiter.acquire)
+            return ([] if test_cases == fallback else test_cases), status
+        
+        return generate_chunk
+    
+    @staticmethod
+    def _combined_status(statuses):
+        """'hit' only if every chunk was cached, 'bypass' if the cache was skipped"""
+        if 'bypass' in statuses:
+            return 'bypass'
+        return 'hit' if statuses and all(status == 'hit' for status in statuses) else 'miss'
+    
+    def _provider_key(self, provider):
+        for name, candidate in self.providers.items():
+            if candidate is provider:
+                return name
+        return provider.__class__.__name__
\ No newline at end of file
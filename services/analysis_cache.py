@@ -0,0 +1,81 @@
+"""
+Content-addressed cache for AppAnalyzer contexts
+Entries are keyed by the URL, a hash of the fetched HTML and the response
+validators (ETag/Last-Modified), so a changed app always misses the cache.
+Crawled contexts also record the version of every crawled subpage, which is
+checked again before the entry is served.
+"""
+
+import hashlib
+import json
+from services.disk_cache import DiskCache
+from config.cache import ANALYSIS_CACHE_CONFIG
+
+# Response headers that identify a version of the page
+VALIDATOR_HEADERS = ('ETag', 'Last-Modified')
+
+
+class AnalysisCache:
+    """On-disk cache of formatted analysis contexts and the reports they were built from"""
+
+    def __init__(self, config=None):
+        self.config = dict(ANALYSIS_CACHE_CONFIG)
+        if config:
+            self.config.update(config)
+        self.enabled = self.config['enabled']
+        self._store = DiskCache(
+            self.config['directory'],
+            ttl=self.config['ttl'],
+            max_entries=self.config['max_entries']
+        )
+
+    def make_key(self, url, content, headers, options=None):
+        """
+        Build a cache key for one version of a page
+
+        Args:
+            url (str): Analyzed URL
+            content (bytes): Fetched HTML
+            headers (Mapping): Response headers
+            options (dict, optional): Analysis options that change the output (e.g. crawl settings)
+
+        Returns:
+            str: Hex digest identifying this page version and analysis mode
+        """
+        digest = hashlib.sha256()
+        digest.update(url.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(hashlib.sha256(content or b'').digest())
+        for header in VALIDATOR_HEADERS:
+            digest.update(b'\0')
+            digest.update((headers.get(header) or '').encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(json.dumps(options or {}, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()
+
+    @staticmethod
+    def page_version(headers, content):
+        """Identify one version of a page by its validators, or by a hash of its HTML when it has none"""
+        validators = [headers.get(header) or '' for header in VALIDATOR_HEADERS]
+        if any(validators):
+            return '\0'.join(validators)
+        return hashlib.sha256(content or b'').hexdigest()
+
+    def get(self, key):
+        """
+        Return (context, context_info, page_versions) for a cached analysis, or None
+
+        context_info may be None for older entries; page_versions maps each
+        crawled subpage URL to its page_version and is empty without a crawl.
+        """
+        if not self.enabled:
+            return None
+        entry = self._store.get(key)
+        if not entry:
+            return None
+        return entry['context'], entry.get('context_info'), entry.get('page_versions') or {}
+
+    def set(self, key, context, context_info=None, page_versions=None):
+        if self.enabled:
+            self._store.set(key, {'context': context, 'context_info': context_info,
+                                  'page_versions': page_versions or {}})
@@ -1,12 +1,16 @@
-import requests
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
-import time
+from services.readiness import PageReadiness
+from services.crawler import AppCrawler
+from services.analysis_cache import AnalysisCache, VALIDATOR_HEADERS
+from services.context_compactor import ContextCompactor
+from services.dom_extractor import DomPage
+from services.fingerprints import FingerprintEngine
+from services.http_client import get_http_client
 
 class AppAnalyzer:
     def __init__(self):
@@ -16,10 +20,25 @@ class AppAnalyzer:
         self.chrome_options.add_argument('--disable-dev-shm-usage')
         self.chrome_options.add_argument('--disable-gpu')
         self.chrome_options.add_argument('--window-size=1920,1080')
+        self.readiness = PageReadiness()
+        self.wait_times = {}
+        self.cache = AnalysisCache()
+        self.compactor = ContextCompactor()
+        self.cache_status = None
+        self.context_info = None  # report behind the last context, for map-reduce generation
+        self.fingerprints = FingerprintEngine.default()
+        self.http = get_http_client('local').session
     
-    def analyze_app(self, url):
+    def analyze_app(self, url, crawl=False, max_depth=None, max_pages=None, use_cache=True):
         """
         Analyze a web application by browsing it and extracting context information
+        
+        Args:
+            url (str): Entry URL of the application
+            crawl (bool): Also analyze same-origin pages linked from the entry page
+            max_depth (int, optional): Maximum link depth to follow when crawling
+            max_pages (int, optional): Maximum number of pages to analyze when crawling
+            use_cache (bool): Return a cached context when the page has not changed
         """
         context_info = {
             'url': url,
@@ -34,164 +53,146 @@ class AppAnalyzer:
         }
         
         try:
-            # First, try simple HTTP request to check if app is accessible
-            response = requests.get(url, timeout=10)
-            if response.status_code != 200:
-                raise Exception(f"App not accessible. Status code: {response.status_code}")
+            # Cheap accessibility check: HEAD over a pooled keep-alive connection
+            response = self._precheck(url)
+            
+            # Serve the cached context if this exact page version was analyzed before
+            cache_key = None
+            if use_cache and self.cache.enabled:
+                options = {'crawl': crawl, 'max_depth': max_depth, 'max_pages': max_pages,
+                           'context_budget': self.compactor.max_tokens}
+                content = b''
+                if not any(response.headers.get(header) for header in ('ETag', 'Last-Modified')):
+                    # Without validators the body itself has to identify the page version
+                    if response.request.method == 'GET':
+                        content = response.content
+                    else:
+                        content = self.http.get(url, timeout=10).content
+                cache_key = self.cache.make_key(url, content, response.headers, options)
+                cached = self.cache.get(cache_key)
+                # The key only covers the entry page; crawled subpages are checked one by one
+                if cached is not None and self._page_versions(cached[2]) == cached[2]:
+                    self.cache_status = 'hit'
+                    cached_context, self.context_info, _ = cached
+                    return cached_context
+                self.cache_status = 'miss'
+            else:
+                self.cache_status = 'bypass'
             
             # Use Selenium for dynamic content analysis
             driver = webdriver.Chrome(options=self.chrome_options)
+            self.readiness.prepare(driver)
             driver.get(url)
-            time.sleep(3)  # Wait for page to load
-            
-            # Extract basic page information
-            context_info['title'] = driver.title
-            
-            # Get page structure using BeautifulSoup
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            
-            # Extract meta description
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            if meta_desc:
-                context_info['description'] = meta_desc.get('content', '')
-            
-            # Find all forms
-            forms = soup.find_all('form')
-            for form in forms:
-                form_info = {
-                    'action': form.get('action', ''),
-                    'method': form.get('method', 'GET'),
-                    'inputs': []
-                }
-                
-                inputs = form.find_all(['input', 'textarea', 'select'])
-                for inp in inputs:
-                    form_info['inputs'].append({
-                        'type': inp.get('type', inp.name),
-                        'name': inp.get('name', ''),
-                        'placeholder': inp.get('placeholder', ''),
-                        'required': 'required' in inp.attrs
-                    })
-                
-                context_info['forms'].append(form_info)
-            
-            # Find all buttons
-            buttons = soup.find_all(['button', 'input'])
-            for btn in buttons:
-                if btn.name == 'input' and btn.get('type') in ['submit', 'button']:
-                    context_info['buttons'].append({
-                        'text': btn.get('value', ''),
-                        'type': btn.get('type', ''),
-                        'id': btn.get('id', ''),
-                        'class': btn.get('class', [])
-                    })
-                elif btn.name == 'button':
-                    context_info['buttons'].append({
-                        'text': btn.get_text(strip=True),
-                        'type': btn.get('type', 'button'),
-                        'id': btn.get('id', ''),
-                        'class': btn.get('class', [])
-                    })
-            
-            # Find all navigation links
-            links = soup.find_all('a', href=True)
-            for link in links:
-                href = link.get('href', '')
-                if href and not href.startswith(('http', 'mailto:', 'tel:')):
-                    context_info['links'].append({
-                        'text': link.get_text(strip=True),
-                        'href': href,
-                        'id': link.get('id', ''),
-                        'class': link.get('class', [])
-                    })
+            self.wait_times = self.readiness.wait_until_ready(driver)
             
-            # Detect technologies (basic detection)
-            page_source = driver.page_source.lower()
-            tech_indicators = {
-                'React': ['react', 'jsx', 'react-dom'],
-                'Angular': ['angular', 'ng-app', 'ng-controller'],
-                'Vue.js': ['vue', 'v-if', 'v-for'],
-                'Bootstrap': ['bootstrap', 'btn-primary', 'container-fluid'],
-                'jQuery': ['jquery', '$(', 'jquery.min.js'],
-                'Express.js': ['express'],
-                'Flask': ['flask'],
-                'Django': ['django', 'csrfmiddlewaretoken']
-            }
-            
-            for tech, indicators in tech_indicators.items():
-                if any(indicator in page_source for indicator in indicators):
-                    context_info['technologies'].append(tech)
-            
-            # Create a structural summary
-            context_info['structure'] = self._create_structure_summary(soup)
+            # Describe the live DOM in one script call instead of serializing and re-parsing it
+            page = DomPage.capture(driver, self.fingerprints)
+            page_context = self.extract_page_context(page, page.title, response.headers)
+            context_info.update(page_context)
             
             driver.quit()
             
+            if crawl:
+                crawler = AppCrawler(self, max_depth=max_depth, max_pages=max_pages)
+                seed_hrefs = [link['href'] for link in page.extracted['links']]
+                context_info['pages'] = crawler.crawl(url, page_context, seed_hrefs)
+                for crawled in context_info['pages'][1:]:
+                    for tech in crawled['technologies']:
+                        if tech not in context_info['technologies']:
+                            context_info['technologies'].append(tech)
+            
             # Convert to readable context string
-            return self._format_context(context_info)
+            context = self._format_context(context_info)
+            self.context_info = context_info
+            if cache_key:
+                page_versions = self._page_versions([page['url'] for page in context_info['pages'][1:]])
+                self.cache.set(cache_key, context, context_info, page_versions)
+            return context
             
         except Exception as e:
             if 'driver' in locals():
                 driver.quit()
             raise Exception(f"Failed to analyze app: {str(e)}")
     
-    def _create_structure_summary(self, soup):
-        """Create a summary of the page structure"""
+    def _page_versions(self, pages):
+        """Current page_version of every URL in pages (any iterable of URLs); None for pages that cannot be fetched"""
+        versions = {}
+        for page_url in pages:
+            try:
+                response = self._precheck(page_url)
+                content = b''
+                if not any(response.headers.get(header) for header in VALIDATOR_HEADERS):
+                    if response.request.method == 'GET':
+                        content = response.content
+                    else:
+                        content = self.http.get(page_url, timeout=10).content
+                versions[page_url] = self.cache.page_version(response.headers, content)
+            except Exception:
+                versions[page_url] = None
+        return versions
+    
+    def _precheck(self, url):
+        """Check the app is reachable, preferring HEAD and falling back to GET when HEAD is unsupported"""
+        response = self.http.head(url, timeout=10, allow_redirects=True)
+        if response.status_code in (405, 501):
+            response = self.http.get(url, timeout=10)
+        if response.status_code != 200:
+            raise Exception(f"App not accessible. Status code: {response.status_code}")
+        return response
+    
+    def extract_page_context(self, page, title, headers=None):
+        """
+        Extract forms, buttons, links, technologies and structure from one page
+        
+        Args:
+            page (PageSnapshot or DomPage): Captured page
+            title (str): Page title
+            headers (Mapping, optional): HTTP response headers of the page
+        
+        Returns:
+            dict: Per-page context in the same shape as the analysis report
+        """
+        extracted = page.extracted
+        page_context = {
+            'title': title or extracted['title'],
+            'description': extracted['description'],
+            'forms': extracted['forms'],
+            'buttons': extracted['buttons'],
+            'links': [],
+            'technologies': self.fingerprints.detect(page, headers),
+            'structure': self._create_structure_summary(extracted['landmarks'])
+        }
+        
+        # Keep in-app navigation links only
+        for link in extracted['links']:
+            href = link['href']
+            if href and not href.startswith(('http', 'mailto:', 'tel:')):
+                page_context['links'].append(link)
+        
+        return page_context
+    
+    def _create_structure_summary(self, landmarks):
+        """Create a summary of the page structure from the extracted landmarks"""
         structure = []
         
         # Header information
-        header = soup.find('header') or soup.find('nav')
-        if header:
+        if 'header' in landmarks or 'nav' in landmarks:
             structure.append("Header/Navigation section present")
         
         # Main content areas
-        main = soup.find('main') or soup.find('div', class_=lambda x: x and 'main' in str(x).lower())
-        if main:
+        if 'main' in landmarks or 'main-class' in landmarks:
             structure.append("Main content area identified")
         
         # Sidebar
-        sidebar = soup.find('aside') or soup.find('div', class_=lambda x: x and 'sidebar' in str(x).lower())
-        if sidebar:
+        if 'aside' in landmarks or 'sidebar-class' in landmarks:
             structure.append("Sidebar present")
         
         # Footer
-        footer = soup.find('footer')
-        if footer:
+        if 'footer' in landmarks:
             structure.append("Footer section present")
         
         return "; ".join(structure) if structure else "Basic HTML structure"
     
     def _format_context(self, context_info):
-        """Format the context information into a readable string"""
-        formatted = f"""
-Web Application Analysis Report:
-
-URL: {context_info['url']}
-Title: {context_info['title']}
-Description: {context_info['description']}
-
-Structure: {context_info['structure']}
-
-Technologies Detected: {', '.join(context_info['technologies']) if context_info['technologies'] else 'None detected'}
-
-Forms Found ({len(context_info['forms'])}):
-"""
-        
-        for i, form in enumerate(context_info['forms'], 1):
-            formatted += f"\n  Form {i}: {form['method']} to {form['action'] or 'same page'}"
-            for inp in form['inputs']:
-                required = " (required)" if inp['required'] else ""
-                formatted += f"\n    - {inp['type']} field: {inp['name']}{required}"
-        
-        formatted += f"\n\nButtons Found ({len(context_info['buttons'])}):"
-        for btn in context_info['buttons']:
-            formatted += f"\n  - {btn['text']} ({btn['type']})"
-        
-        formatted += f"\n\nNavigation Links ({len(context_info['links'])}):"
-        for link in context_info['links'][:10]:  # Limit to first 10 links
-            formatted += f"\n  - {link['text']} -> {link['href']}"
-        
-        if len(context_info['links']) > 10:
-            formatted += f"\n  ... and {len(context_info['links']) - 10} more links"
-        
-        return formatted.strip()
\ No newline at end of file
+        """Format the context information into a readable string that fits the prompt token budget"""
+        return self.compactor.compact(context_info)
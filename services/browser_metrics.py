@@ -0,0 +1,143 @@
+"""
+Browser-side performance metrics
+Collects navigation timing, paint timing, Web Vitals style metrics (LCP, CLS,
+total blocking time) and the resource waterfall in one script call per page
+load. Observers are registered before page scripts run when CDP is available;
+otherwise buffered PerformanceObservers pick up what the browser kept.
+"""
+
+import weakref
+from selenium.common.exceptions import WebDriverException
+from config.execution import BROWSER_METRICS_CONFIG
+
+# Accumulates LCP, CLS and long-task blocking time for the current document
+OBSERVER_JS = """
+(function () {
+    if (window.__browserMetrics || !window.PerformanceObserver) { return; }
+    var state = window.__browserMetrics = {lcp: 0, lcpElement: '', cls: 0, tbt: 0, longTasks: 0};
+    function observe(type, callback) {
+        try {
+            new PerformanceObserver(function (list) { list.getEntries().forEach(callback); })
+                .observe({type: type, buffered: true});
+        } catch (e) {}
+    }
+    observe('largest-contentful-paint', function (entry) {
+        state.lcp = entry.renderTime || entry.loadTime || entry.startTime;
+        state.lcpElement = entry.element ? entry.element.tagName.toLowerCase() : '';
+    });
+    observe('layout-shift', function (entry) {
+        if (!entry.hadRecentInput) { state.cls += entry.value; }
+    });
+    observe('longtask', function (entry) {
+        state.longTasks += 1;
+        state.tbt += Math.max(0, entry.duration - 50);
+    });
+})();
+"""
+
+# arguments[0]: maximum resource entries to return; last argument: async callback
+COLLECT_JS = OBSERVER_JS + """
+var maxResources = arguments[0];
+var done = arguments[arguments.length - 1];
+function ms(value) { return Math.round(value * 10) / 10; }
+
+// Give buffered observer callbacks a task to deliver their entries
+setTimeout(function () {
+    var state = window.__browserMetrics || {lcp: 0, lcpElement: '', cls: 0, tbt: 0, longTasks: 0};
+    var metrics = {navigation: {}, paint: {}, web_vitals: {}, resources: {}, entry_counts: {}};
+
+    performance.getEntries().forEach(function (entry) {
+        metrics.entry_counts[entry.entryType] = (metrics.entry_counts[entry.entryType] || 0) + 1;
+    });
+
+    var nav = performance.getEntriesByType('navigation')[0];
+    if (nav) {
+        metrics.navigation = {
+            dns: ms(nav.domainLookupEnd - nav.domainLookupStart),
+            connect: ms(nav.connectEnd - nav.connectStart),
+            tls: ms(nav.secureConnectionStart > 0 ? nav.connectEnd - nav.secureConnectionStart : 0),
+            ttfb: ms(nav.responseStart - nav.requestStart),
+            response: ms(nav.responseEnd - nav.responseStart),
+            dom_interactive: ms(nav.domInteractive),
+            dom_content_loaded: ms(nav.domContentLoadedEventEnd),
+            load: ms(nav.loadEventEnd),
+            transfer_size: nav.transferSize || 0,
+            decoded_body_size: nav.decodedBodySize || 0,
+            protocol: nav.nextHopProtocol || ''
+        };
+    }
+
+    performance.getEntriesByType('paint').forEach(function (entry) {
+        metrics.paint[entry.name === 'first-contentful-paint' ? 'fcp' : 'fp'] = ms(entry.startTime);
+    });
+
+    metrics.web_vitals = {
+        lcp: ms(state.lcp),
+        lcp_element: state.lcpElement,
+        cls: Math.round(state.cls * 1000) / 1000,
+        tbt: ms(state.tbt),
+        long_tasks: state.longTasks
+    };
+
+    var resources = performance.getEntriesByType('resource');
+    var byType = {};
+    var transferSize = 0;
+    resources.forEach(function (entry) {
+        byType[entry.initiatorType] = (byType[entry.initiatorType] || 0) + 1;
+        transferSize += entry.transferSize || 0;
+    });
+    var slowest = resources.slice().sort(function (a, b) { return b.duration - a.duration; }).slice(0, maxResources);
+    slowest.sort(function (a, b) { return a.startTime - b.startTime; });
+    metrics.resources = {
+        count: resources.length,
+        transfer_size: transferSize,
+        by_type: byType,
+        waterfall: slowest.map(function (entry) {
+            return {
+                name: entry.name, type: entry.initiatorType, start: ms(entry.startTime),
+                duration: ms(entry.duration), transfer_size: entry.transferSize || 0
+            };
+        })
+    };
+
+    done(metrics);
+}, 0);
+"""
+
+
+class BrowserMetrics:
+    """Collects front-end timing for the page currently loaded in a driver"""
+
+    def __init__(self, config=None):
+        self.config = dict(BROWSER_METRICS_CONFIG)
+        if config:
+            self.config.update(config)
+        self.enabled = self.config['enabled']
+        self._instrumented = weakref.WeakSet()
+
+    def prepare(self, driver):
+        """Register the observers for every future navigation so no early entries are missed"""
+        if not self.enabled or driver in self._instrumented:
+            return
+        try:
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': OBSERVER_JS})
+            self._instrumented.add(driver)
+        except Exception:
+            # Without CDP the buffered observers installed at collection time are used
+            pass
+
+    def collect(self, driver):
+        """
+        Collect metrics for the current page in one script call
+
+        Returns:
+            dict: navigation, paint, web_vitals, resources and entry_counts (times in ms),
+                or None when collection is disabled or fails
+        """
+        if not self.enabled:
+            return None
+        try:
+            driver.set_script_timeout(self.config['script_timeout'])
+            return driver.execute_async_script(COLLECT_JS, self.config['max_resources'])
+        except WebDriverException:
+            return None
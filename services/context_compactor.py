@@ -0,0 +1,316 @@
+"""
+Context compaction for AI prompts
+Formats an analysis report as prompt context that fits a token budget.
+Repeated buttons, links and forms are collapsed, form inputs are grouped by
+type, and sections are filled in order of importance, so the prompt stays the
+same size however large the analyzed app is.
+"""
+
+import math
+import re
+from config.prompts import CONTEXT_BUDGET_CONFIG
+
+# Letter runs, digit runs and single symbols, roughly how BPE tokenizers split text
+_PIECE_PATTERN = re.compile(r"[^\W\d_]+|\d+|[^\w\s]|_")
+
+# Section key -> heading, in the order sections appear in the context
+SECTIONS = (
+    ('forms', 'Forms Found'),
+    ('buttons', 'Buttons Found'),
+    ('links', 'Navigation Links'),
+    ('pages', 'Additional Pages Crawled')
+)
+
+
+def estimate_tokens(text):
+    """Estimate how many tokens a model tokenizer would produce for text"""
+    tokens = 0
+    for piece in _PIECE_PATTERN.findall(text):
+        if piece.isdigit():
+            tokens += math.ceil(len(piece) / 3)
+        elif piece.isalpha():
+            tokens += math.ceil(len(piece) / 4)
+        else:
+            tokens += 1
+    return tokens
+
+
+def fit_to_budget(text, max_tokens=None):
+    """
+    Cut a context string down to the token budget at line boundaries
+
+    Used for contexts that did not come from ContextCompactor (e.g. edited by
+    the user), so oversized input never reaches a provider unbounded.
+    """
+    max_tokens = max_tokens or CONTEXT_BUDGET_CONFIG['max_tokens']
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    lines = text.splitlines()
+    kept = []
+    used = estimate_tokens("... (999999 more lines omitted to fit the context budget)")
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            break
+        kept.append(line)
+        used += cost
+    kept.append(f"... ({len(lines) - len(kept)} more lines omitted to fit the context budget)")
+    return "\n".join(kept)
+
+
+def truncate_tokens(text, max_tokens):
+    """Cut text at a word boundary so its estimated size is at most max_tokens"""
+    text = ' '.join(str(text).split())
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    kept = []
+    used = estimate_tokens(" ...")
+    for word in text.split(' '):
+        cost = estimate_tokens(word)
+        if used + cost > max_tokens:
+            break
+        kept.append(word)
+        used += cost
+    return ' '.join(kept) + " ..."
+
+
+class ContextCompactor:
+    """Builds budgeted prompt context from an AppAnalyzer context_info dict"""
+
+    def __init__(self, config=None):
+        self.config = dict(CONTEXT_BUDGET_CONFIG)
+        if config:
+            self.config.update(config)
+        self.max_tokens = self.config['max_tokens']
+        self.weights = self.config['section_weights']
+
+    def compact(self, context_info):
+        """
+        Format the analysis report within the token budget
+
+        Args:
+            context_info (dict): Report built by AppAnalyzer.analyze_app
+
+        Returns:
+            str: Context text whose estimated size is at most max_tokens
+        """
+        return self.render(*self.collect(context_info))
+
+    def collect(self, context_info):
+        """
+        Overview and every section item of a report, before any budgeting
+
+        Returns:
+            tuple: (overview text, {section key: [item text, ...]})
+        """
+        return self._overview(context_info), {
+            'forms': self._form_items(context_info),
+            'buttons': self._button_items(context_info),
+            'links': self._link_items(context_info),
+            'pages': self._page_items(context_info)
+        }
+
+    def render(self, overview, items):
+        """Join an overview and section items, keeping as many items as the budget holds"""
+        items = {key: items.get(key, []) for key, _ in SECTIONS}
+        budget = max(0, self.max_tokens - estimate_tokens(overview))
+
+        # Fill sections by importance; whatever one section leaves unused passes to the next
+        ranked = sorted((key for key, _ in SECTIONS), key=lambda key: -self.weights.get(key, 1))
+        total_weight = sum(self.weights.get(key, 1) for key in ranked if items[key]) or 1
+        rendered = {}
+        carry = 0
+        for key in ranked:
+            allowance = budget * self.weights.get(key, 1) / total_weight + carry if items[key] else carry
+            rendered[key] = self._render(key, items[key], allowance)
+            carry = allowance - rendered[key][1]
+
+        # Spend what is left on sections that were cut, most important first
+        leftover = budget - sum(cost for _, cost, _ in rendered.values())
+        for key in ranked:
+            lines, cost, complete = rendered[key]
+            if not complete and leftover > 0:
+                rendered[key] = self._render(key, items[key], cost + leftover)
+                leftover -= rendered[key][1] - cost
+
+        parts = [overview]
+        for key, _ in SECTIONS:
+            if rendered[key][0]:
+                parts.append("\n".join(rendered[key][0]))
+        return "\n\n".join(parts)
+
+    def _render(self, key, items, allowance):
+        """Render a section with as many ranked items as the allowance holds"""
+        if not items:
+            return [], 0, True
+        title = dict(SECTIONS)[key]
+        lines = [f"{title} ({len(items)}):"]
+        cost = estimate_tokens(lines[0])
+        # Room for the "... and N more" line whenever items have to be dropped
+        reserve = estimate_tokens(f"  ... and {len(items)} more {key}")
+        shown = 0
+        for item in items:
+            item_cost = estimate_tokens(item) + 1
+            remaining = len(items) - shown - 1
+            if cost + item_cost + (reserve if remaining else 0) > allowance:
+                break
+            lines.append(item)
+            cost += item_cost
+            shown += 1
+
+        if shown == 0 and cost + reserve > allowance:
+            return [], 0, False
+        if shown < len(items):
+            lines.append(f"  ... and {len(items) - shown} more {key}")
+            cost += reserve
+        return lines, cost, shown == len(items)
+
+    def _overview(self, context_info):
+        """Report header; each page-supplied field is cut so the overview cannot crowd out the sections"""
+        technologies = ', '.join(context_info['technologies']) if context_info['technologies'] else 'None detected'
+        # Five fields, so even a small budget keeps room for the sections
+        limit = min(self.config['max_overview_field_tokens'], self.max_tokens // 8)
+        url, title, description, structure, technologies = (
+            truncate_tokens(value or '', limit) for value in (
+                context_info['url'], context_info['title'], context_info['description'],
+                context_info['structure'], technologies
+            )
+        )
+        return (
+            "Web Application Analysis Report:\n\n"
+            f"URL: {url}\n"
+            f"Title: {title}\n"
+            f"Description: {description}\n\n"
+            f"Structure: {structure}\n\n"
+            f"Technologies Detected: {technologies}"
+        )
+
+    @staticmethod
+    def _pages(context_info):
+        """Entry page followed by crawled pages, each as (url, page context)"""
+        pages = [(context_info['url'], context_info)]
+        pages.extend((page['url'], page) for page in context_info['pages'][1:])
+        return pages
+
+    def _form_items(self, context_info):
+        """Distinct forms across all pages, largest and most constrained first"""
+        forms = {}
+        for url, page in self._pages(context_info):
+            for form in page['forms']:
+                signature = (
+                    form['method'].upper(), form['action'],
+                    tuple((inp['type'], inp['name'], inp['required']) for inp in form['inputs'])
+                )
+                forms.setdefault(signature, {'form': form, 'pages': []})['pages'].append(url)
+
+        ranked = sorted(
+            forms.values(),
+            key=lambda entry: (-sum(1 for inp in entry['form']['inputs'] if inp['required']),
+                               -len(entry['form']['inputs']))
+        )
+        items = []
+        for i, entry in enumerate(ranked, 1):
+            form = entry['form']
+            seen_on = f" (on {len(entry['pages'])} pages)" if len(entry['pages']) > 1 else ""
+            lines = [f"  Form {i}: {form['method'].upper()} to {form['action'] or 'same page'}{seen_on}"]
+            lines.extend(f"    - {group}" for group in self._group_inputs(form['inputs']))
+            items.append("\n".join(lines))
+        return items
+
+    def _group_inputs(self, inputs):
+        """Collapse inputs of one type into a single line; hidden inputs are only counted"""
+        groups = {}
+        for inp in inputs:
+            groups.setdefault(inp['type'] or 'text', []).append(inp)
+
+        limit = self.config['max_field_names']
+        lines = []
+        for input_type, members in groups.items():
+            noun = 'field' if len(members) == 1 else 'fields'
+            if input_type == 'hidden':
+                lines.append(f"{len(members)} hidden {noun}")
+                continue
+            names = []
+            counts = {}
+            for inp in members:
+                label = f"{inp['name'] or 'unnamed'}{' (required)' if inp['required'] else ''}"
+                if label not in counts:
+                    names.append(label)
+                counts[label] = counts.get(label, 0) + 1
+            listed = [f"{name} x{counts[name]}" if counts[name] > 1 else name for name in names[:limit]]
+            if len(names) > limit:
+                listed.append(f"+{len(names) - limit} more")
+            lines.append(f"{input_type} {noun}: {', '.join(listed)}")
+        return lines
+
+    def _button_items(self, context_info):
+        """Distinct buttons across all pages, visible and most repeated first"""
+        buttons = {}
+        for _, page in self._pages(context_info):
+            for btn in page['buttons']:
+                key = (' '.join(btn['text'].split()), btn['type'])
+                entry = buttons.setdefault(key, {'count': 0, 'visible': False})
+                entry['count'] += 1
+                entry['visible'] = entry['visible'] or btn.get('visible', True)
+
+        ranked = sorted(buttons.items(), key=lambda item: (not item[1]['visible'], -item[1]['count']))
+        return [
+            f"  - {text or 'unlabeled'} ({button_type})" + (f" x{entry['count']}" if entry['count'] > 1 else "")
+            for (text, button_type), entry in ranked
+        ]
+
+    def _link_items(self, context_info):
+        """Distinct in-app links of the entry page, in page order"""
+        items = []
+        seen = set()
+        for link in context_info['links']:
+            if link['href'] in seen:
+                continue
+            seen.add(link['href'])
+            items.append(f"  - {' '.join(link['text'].split())} -> {link['href']}")
+        return items
+
+    @staticmethod
+    def _page_items(context_info):
+        """One summary line per crawled page; their forms are listed under Forms Found"""
+        items = []
+        for page in context_info['pages'][1:]:
+            line = (
+                f"  Page: {page['url']} - {page['title'] or 'Untitled'}"
+                f" ({len(page['forms'])} forms, {len(page['buttons'])} buttons, {len(page['links'])} links)"
+            )
+            if page['technologies']:
+                line += f"\n    - Technologies: {', '.join(page['technologies'])}"
+            items.append(line)
+        return items
+
+
+# Section headings as they appear in a formatted context, e.g. "Forms Found (3):"
+_HEADING_PATTERN = re.compile(r"^(%s) \(\d+\):$" % '|'.join(re.escape(title) for _, title in SECTIONS))
+
+
+def parse_context(text):
+    """
+    Split a formatted context into its overview and section items
+
+    Returns:
+        tuple: (overview text, {section title: [item text, ...]}); "... and N more"
+            lines are dropped since they carry no detail a chunk could use
+    """
+    overview = []
+    sections = {}
+    items = None
+    for line in text.splitlines():
+        heading = _HEADING_PATTERN.match(line)
+        if heading:
+            items = sections.setdefault(heading.group(1), [])
+        elif items is None:
+            overview.append(line)
+        elif line.startswith('  ... and '):
+            continue
+        elif line.startswith('    ') and items:
+            items[-1] += "\n" + line  # detail line of the current item
+        elif line.strip():
+            items.append(line)
+    return "\n".join(overview).strip(), sections
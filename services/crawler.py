@@ -0,0 +1,172 @@
+"""
+Multi-page crawler for the app analyzer
+Follows same-origin links breadth-first with bounded concurrency. Static
+pages are parsed from a plain HTTP response; only pages that need
+JavaScript to render are loaded in a pooled browser.
+"""
+
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+import requests
+from services.driver_pool import DriverPool
+from services.page_snapshot import PageSnapshot
+from services.dom_extractor import DomPage
+from services.http_client import get_http_client
+from config.app_types import APP_TYPE_CONFIG
+
+# Links to files that are never HTML pages
+SKIPPED_EXTENSIONS = (
+    '.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico', '.webp', '.css', '.js', '.map',
+    '.pdf', '.zip', '.gz', '.mp4', '.mp3', '.woff', '.woff2', '.ttf', '.json', '.xml'
+)
+
+
+def normalize_url(url, base_url=None):
+    """
+    Normalize a URL so equivalent links deduplicate to one crawl entry
+
+    Resolves relative links, lowercases scheme and host, drops default ports,
+    fragments and trailing slashes, and sorts query parameters.
+    """
+    if base_url:
+        url = urljoin(base_url, url)
+
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    port = parts.port
+    if port and not ((scheme == 'http' and port == 80) or (scheme == 'https' and port == 443)):
+        host = f"{host}:{port}"
+
+    path = posixpath.normpath(parts.path) if parts.path else '/'
+    if parts.path.endswith('/') and path != '/':
+        path = path.rstrip('/')
+    if path == '.':
+        path = '/'
+
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+class AppCrawler:
+    """Breadth-first crawler producing one analyzer context per page"""
+
+    def __init__(self, analyzer, max_depth=None, max_pages=None, concurrency=None, app_type='local'):
+        config = APP_TYPE_CONFIG[app_type]['crawl']
+        self.analyzer = analyzer
+        self.max_depth = config['max_depth'] if max_depth is None else int(max_depth)
+        self.max_pages = config['max_pages'] if max_pages is None else int(max_pages)
+        self.concurrency = concurrency or config['concurrency']
+        self.browser_workers = config['browser_workers']
+        self.timeout = APP_TYPE_CONFIG[app_type]['timeout']
+        self.http = get_http_client(app_type).session  # keep-alive pool shared with the rest of the app
+        self._driver_pool = None
+        self._pool_lock = threading.Lock()
+
+    def crawl(self, start_url, entry_context, seed_hrefs):
+        """
+        Crawl same-origin pages starting from an already analyzed entry page
+
+        Args:
+            start_url (str): Entry URL of the application
+            entry_context (dict): Page context of the entry page
+            seed_hrefs (list): Raw href values found on the entry page
+
+        Returns:
+            list: Page contexts, entry page first, each with 'url', 'depth' and 'rendered_with'
+        """
+        start = normalize_url(start_url)
+        origin = urlsplit(start)[:2]
+
+        pages = [dict(entry_context, url=start, depth=0, rendered_with='browser')]
+        seen = {start}
+        frontier = self._next_links(seed_hrefs, start, origin, seen)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='crawler') as pool:
+                depth = 1
+                while frontier and depth <= self.max_depth and len(pages) < self.max_pages:
+                    batch = frontier[:self.max_pages - len(pages)]
+                    next_frontier = []
+
+                    for url, fetched in zip(batch, pool.map(self._fetch_page, batch)):
+                        if fetched is None:
+                            continue
+                        page_context, hrefs = fetched
+                        pages.append(dict(page_context, url=url, depth=depth))
+                        next_frontier.extend(self._next_links(hrefs, url, origin, seen))
+
+                    frontier = next_frontier
+                    depth += 1
+        finally:
+            if self._driver_pool is not None:
+                self._driver_pool.close()
+                self._driver_pool = None
+
+        return pages
+
+    def _next_links(self, hrefs, page_url, origin, seen):
+        """Resolve, filter and deduplicate links to follow from one page"""
+        links = []
+        for href in hrefs:
+            if not href or href.startswith(('#', 'mailto:', 'tel:', 'javascript:', 'data:')):
+                continue
+
+            url = normalize_url(href, page_url)
+            parts = urlsplit(url)
+            if parts[:2] != origin or parts.path.lower().endswith(SKIPPED_EXTENSIONS):
+                continue
+
+            if url not in seen:
+                seen.add(url)
+                links.append(url)
+        return links
+
+    def _fetch_page(self, url):
+        """Fetch and analyze one page; returns (page_context, hrefs) or None if it is not HTML"""
+        try:
+            response = self.http.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"Failed to crawl {url}: {e}")
+            return None
+
+        if response.status_code != 200 or 'html' not in response.headers.get('Content-Type', 'text/html'):
+            return None
+
+        page = PageSnapshot(response.content, encoding=response.encoding or 'utf-8')
+        rendered_with = 'http'
+
+        if self._needs_browser(page.extracted):
+            try:
+                page = self._render(url)
+                rendered_with = 'browser'
+            except Exception as e:
+                print(f"Failed to render {url} in browser, using static HTML: {e}")
+
+        page_context = self.analyzer.extract_page_context(page, page.extracted['title'], response.headers)
+        page_context['rendered_with'] = rendered_with
+        hrefs = [link['href'] for link in page.extracted['links']]
+        return page_context, hrefs
+
+    def _needs_browser(self, extracted):
+        """Heuristic: little server-rendered content but scripts or an empty SPA mount point"""
+        if not extracted['has_body'] or extracted['empty_roots']:
+            return True
+
+        has_scripts = extracted['script_count'] > 0
+        has_content = extracted['interactive_count'] > 0
+        return has_scripts and extracted['body_text_length'] < 200 and not has_content
+
+    def _render(self, url):
+        """Load a page in a pooled browser and describe it in one script call"""
+        with self._pool_lock:
+            if self._driver_pool is None:
+                self._driver_pool = DriverPool(size=self.browser_workers, warm_up=0)
+
+        with self._driver_pool.lease() as driver:
+            self.analyzer.readiness.prepare(driver)
+            driver.get(url)
+            self.analyzer.readiness.wait_until_ready(driver)
+            return DomPage.capture(driver, self.analyzer.fingerprints)
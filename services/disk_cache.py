@@ -0,0 +1,128 @@
+"""
+Small on-disk JSON cache with TTL and LRU eviction
+Each entry is one JSON file named after its key; the file modification time
+doubles as the last-access time used for LRU eviction.
+"""
+
+import os
+import json
+import time
+import tempfile
+import threading
+
+
+class DiskCache:
+    """Persistent key/value cache for JSON-serializable values"""
+
+    def __init__(self, directory, ttl=None, max_entries=None, max_bytes=None):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get(self, key):
+        """Return the cached value, or None if missing or expired"""
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if self.ttl is not None and time.time() - entry.get('created_at', 0) > self.ttl:
+            self.delete(key)
+            return None
+
+        try:
+            os.utime(path, None)  # mark as recently used
+        except OSError:
+            pass
+        return entry.get('value')
+
+    def set(self, key, value):
+        """Store a value and evict old entries if the cache is over its limits"""
+        entry = {'created_at': time.time(), 'value': value}
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._evict()
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        for path, _, _ in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self):
+        entries = self._entries()
+        return {
+            'entries': len(entries),
+            'bytes': sum(size for _, _, size in entries)
+        }
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _entries(self):
+        """List (path, last_access, size) for every entry"""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones until within limits"""
+        if self.max_entries is None and self.max_bytes is None and self.ttl is None:
+            return
+
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda entry: entry[1])
+            now = time.time()
+            if self.ttl is not None:
+                # mtime is at least as recent as created_at, so this only removes entries that are surely expired
+                expired = [entry for entry in entries if now - entry[1] > self.ttl]
+                for path, _, _ in expired:
+                    self._remove(path)
+                entries = [entry for entry in entries if now - entry[1] <= self.ttl]
+
+            total_bytes = sum(size for _, _, size in entries)
+            while entries and (
+                (self.max_entries is not None and len(entries) > self.max_entries) or
+                (self.max_bytes is not None and total_bytes > self.max_bytes)
+            ):
+                path, _, size = entries.pop(0)
+                self._remove(path)
+                total_bytes -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
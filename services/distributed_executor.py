@@ -0,0 +1,199 @@
+"""
+Sharded test execution across local processes and remote worker hosts
+The coordinator splits the selected test cases into shards, runs each shard
+in a separate process (with its own driver pool) or on a remote shard worker,
+and merges the streamed results into one execute_top_tests-shaped summary.
+"""
+
+import json
+import queue
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import requests
+from services.test_executor import TestExecutor
+from services.shard_worker import run_shard
+from config.execution import DISTRIBUTED_CONFIG
+
+
+def split_into_shards(tests, shard_count):
+    """
+    Deal test cases round-robin so every shard gets a similar priority mix
+
+    Returns:
+        list: One list of (index, test_case) pairs per shard
+    """
+    shards = [[] for _ in range(shard_count)]
+    for index, test_case in enumerate(tests):
+        shards[index % shard_count].append((index, test_case))
+    return [shard for shard in shards if shard]
+
+
+def _run_local_shard(shard, base_url, workers, result_queue):
+    """Process entry point: execute a shard and push each result onto the shared queue"""
+    for index, result in run_shard(shard, base_url, workers):
+        result_queue.put((index, result))
+
+
+class ShardCoordinator:
+    """Distributes a test run over local processes and remote shard workers"""
+
+    def __init__(self, worker_urls=None, local_processes=None, workers_per_shard=None, config=None):
+        self.config = dict(DISTRIBUTED_CONFIG)
+        if config:
+            self.config.update(config)
+        self.worker_urls = self.config['worker_urls'] if worker_urls is None else list(worker_urls)
+        self.local_processes = self.config['local_processes'] if local_processes is None else int(local_processes)
+        # Without remote workers at least one local process has to run the shards
+        self.local_processes = max(0 if self.worker_urls else 1, self.local_processes)
+        self.workers_per_shard = workers_per_shard or self.config['workers_per_shard']
+
+    def execute_top_tests(self, test_cases, base_url, limit=10, progress_callback=None):
+        """Select the top tests by priority and execute them across all shards"""
+        tests_to_execute = TestExecutor.select_top_tests(test_cases, limit)
+        return self.execute_tests(tests_to_execute, base_url, progress_callback=progress_callback)
+
+    def execute_tests(self, tests_to_execute, base_url, progress_callback=None):
+        """
+        Execute test cases across shards
+
+        Args:
+            tests_to_execute (list): Test cases in the order results should be reported
+            base_url (str): The base URL of the application
+            progress_callback (callable, optional): Called as (completed, total, result) after each test
+
+        Returns:
+            dict: Execution results with summary and individual test results
+        """
+        start_time = datetime.now()
+        total = len(tests_to_execute)
+        results = [None] * total
+
+        targets = [('remote', url) for url in self.worker_urls] + [('local', None)] * self.local_processes
+        shards = split_into_shards(tests_to_execute, min(len(targets), total)) if targets else []
+
+        if not shards:
+            return TestExecutor.build_execution_results(results, start_time, datetime.now())
+
+        local_count = sum(1 for (kind, _), _ in zip(targets, shards) if kind == 'local')
+        context = multiprocessing.get_context('spawn')
+        manager = context.Manager()
+        result_queue = manager.Queue()
+        process_pool = ProcessPoolExecutor(max_workers=local_count, mp_context=context) if local_count else None
+        thread_pool = ThreadPoolExecutor(max_workers=len(shards) + 1, thread_name_prefix='shard')
+
+        try:
+            pending = {}
+            for (kind, url), shard in zip(targets, shards):
+                if kind == 'remote':
+                    future = thread_pool.submit(self._run_remote_shard, url, shard, base_url, result_queue)
+                else:
+                    future = process_pool.submit(_run_local_shard, shard, base_url, self.workers_per_shard, result_queue)
+                pending[future] = shard
+
+            completed = 0
+            draining = False
+            while completed < total:
+                try:
+                    index, result = result_queue.get(timeout=0 if draining else 0.5)
+                except queue.Empty:
+                    if draining:
+                        break
+                    # Once every shard is done, pick up results queued just before it finished, then stop
+                    draining = not self._handle_finished_shards(pending, results, base_url, thread_pool, result_queue)
+                    continue
+
+                if results[index] is None:
+                    results[index] = result
+                    completed += 1
+                    if progress_callback:
+                        progress_callback(completed, total, result)
+        finally:
+            thread_pool.shutdown(wait=False, cancel_futures=True)
+            if process_pool:
+                process_pool.shutdown(wait=True, cancel_futures=True)
+            manager.shutdown()
+
+        # Anything still missing was lost with a shard that could not be recovered
+        for index, test_case in enumerate(tests_to_execute):
+            if results[index] is None:
+                results[index] = self._failed_result(test_case, 'Shard did not return a result')
+
+        return TestExecutor.build_execution_results(results, start_time, datetime.now())
+
+    def _handle_finished_shards(self, pending, results, base_url, thread_pool, result_queue):
+        """
+        Re-run the unfinished part of any failed shard in-process
+
+        Returns:
+            bool: False once every shard has finished and no more results can arrive
+        """
+        for future in [future for future in pending if future.done()]:
+            shard = pending.pop(future)
+            error = future.exception()
+            if error is None:
+                continue
+
+            remaining = [(index, test_case) for index, test_case in shard if results[index] is None]
+            if remaining:
+                print(f"Shard failed ({error}); re-running {len(remaining)} tests locally")
+                retry = thread_pool.submit(self._run_fallback_shard, remaining, base_url, result_queue, error)
+                pending[retry] = []
+        return bool(pending)
+
+    def _run_remote_shard(self, worker_url, shard, base_url, result_queue):
+        """Send a shard to a remote worker and forward its streamed results"""
+        headers = {}
+        if self.config['worker_token']:
+            headers['X-Shard-Token'] = self.config['worker_token']
+
+        payload = {
+            'base_url': base_url,
+            'workers': self.workers_per_shard,
+            'tests': [{'index': index, 'test_case': test_case} for index, test_case in shard]
+        }
+        with requests.post(
+            f"{worker_url.rstrip('/')}/shards",
+            json=payload,
+            headers=headers,
+            stream=True,
+            timeout=(5, self.config['request_timeout'])
+        ) as response:
+            response.raise_for_status()
+            missing = {index for index, _ in shard}
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                item = json.loads(line)
+                if 'error' in item:
+                    raise RuntimeError(f"Shard worker {worker_url} failed: {item['error']}")
+                # Heartbeat lines only keep the read timeout from expiring during long tests
+                if 'index' in item:
+                    result_queue.put((item['index'], item['result']))
+                    missing.discard(item['index'])
+
+        # A stream that ended early is a failed shard, so its remaining tests are re-run locally
+        if missing:
+            raise RuntimeError(f"Shard worker {worker_url} returned {len(shard) - len(missing)} of {len(shard)} results")
+
+    def _run_fallback_shard(self, shard, base_url, result_queue, original_error):
+        try:
+            for index, result in run_shard(shard, base_url, self.workers_per_shard):
+                result_queue.put((index, result))
+        except Exception as e:
+            for index, test_case in shard:
+                result_queue.put((index, self._failed_result(test_case, f"{original_error}; local retry failed: {e}")))
+
+    @staticmethod
+    def _failed_result(test_case, error):
+        return {
+            'test_id': test_case.get('id', 0),
+            'test_name': test_case.get('name', 'Unknown Test'),
+            'category': test_case.get('category', 'Functional'),
+            'priority': test_case.get('priority', 'Medium'),
+            'status': 'failed',
+            'execution_time': '0s',
+            'details': f"Test execution failed: {error}",
+            'error': error,
+            'timestamp': datetime.now().isoformat()
+        }
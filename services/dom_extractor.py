@@ -0,0 +1,241 @@
+"""
+In-browser DOM extraction
+One execute_script call walks the live DOM and returns a compact JSON
+description of the page (forms, inputs, buttons, links with visibility,
+bounding boxes and ARIA roles, landmarks, meta tags, script sources) in the
+same shape as services.html_extractor. Fingerprint globals and markup
+signatures are evaluated in the same call, the markup signatures as one
+combined regex scanned once over the page HTML, so neither the analyzer nor the
+executor has to serialize the DOM or query elements one round-trip at a time.
+"""
+
+# arguments[0]: dotted global paths to probe, arguments[1]: [scan, position] markup regex
+# sources with one lookahead group per signature (see FingerprintEngine.browser_probe)
+DOM_EXTRACTION_JS = """
+var globalPaths = arguments[0] || [];
+var markupSources = arguments[1] || ['', ''];
+var SPA_ROOT_IDS = ['root', 'app', '__next', '__nuxt', 'main-app'];
+var LANDMARK_ROLES = {banner: 'header', navigation: 'nav', main: 'main', complementary: 'aside', contentinfo: 'footer'};
+var IMPLICIT_ROLES = {button: 'button', a: 'link', select: 'combobox', textarea: 'textbox', form: 'form',
+                      nav: 'navigation', main: 'main', header: 'banner', footer: 'contentinfo', aside: 'complementary'};
+var INPUT_ROLES = {button: 'button', submit: 'button', reset: 'button', checkbox: 'checkbox', radio: 'radio',
+                   range: 'slider', search: 'searchbox', hidden: ''};
+
+function attr(el, name) { var value = el.getAttribute(name); return value === null ? '' : value; }
+function classes(el) { var value = el.getAttribute('class'); return value ? value.split(/\\s+/).filter(Boolean) : []; }
+function text(el) {
+    var parts = [];
+    var walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+    while (walker.nextNode()) {
+        var value = walker.currentNode.nodeValue.trim();
+        if (value) { parts.push(value); }
+    }
+    return parts.join('');
+}
+function visible(el) {
+    if (!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)) { return false; }
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+}
+function rect(el) {
+    var r = el.getBoundingClientRect();
+    return {x: Math.round(r.x), y: Math.round(r.y), width: Math.round(r.width), height: Math.round(r.height)};
+}
+function role(el) {
+    var explicit = el.getAttribute('role');
+    if (explicit) { return explicit; }
+    var tag = el.tagName.toLowerCase();
+    if (tag === 'input') {
+        var type = (el.getAttribute('type') || 'text').toLowerCase();
+        return type in INPUT_ROLES ? INPUT_ROLES[type] : 'textbox';
+    }
+    if (tag === 'a') { return el.hasAttribute('href') ? 'link' : ''; }
+    return IMPLICIT_ROLES[tag] || '';
+}
+function selector(el) {
+    if (el.id) { return '#' + CSS.escape(el.id); }
+    var parts = [];
+    while (el && el.nodeType === 1 && el !== document.documentElement) {
+        var tag = el.tagName.toLowerCase();
+        var index = 1;
+        for (var sibling = el.previousElementSibling; sibling; sibling = sibling.previousElementSibling) {
+            if (sibling.tagName === el.tagName) { index += 1; }
+        }
+        parts.unshift(tag + ':nth-of-type(' + index + ')');
+        if (el.parentElement && el.parentElement.id) {
+            parts.unshift('#' + CSS.escape(el.parentElement.id));
+            break;
+        }
+        el = el.parentElement;
+    }
+    return parts.join(' > ');
+}
+function describe(el) {
+    return {id: attr(el, 'id'), 'class': classes(el), role: role(el), visible: visible(el),
+            enabled: !el.disabled, rect: rect(el), selector: selector(el)};
+}
+function extend(target, source) { for (var key in source) { target[key] = source[key]; } return target; }
+
+var result = {
+    title: document.title || '', description: '', meta: {}, forms: [], buttons: [], links: [],
+    script_srcs: [], landmarks: [], script_count: document.scripts.length, interactive_count: 0,
+    body_text_length: 0, has_body: !!document.body, empty_roots: [], ui_element_count: 0,
+    html_length: 0, globals_found: [], markup_matches: []
+};
+
+document.querySelectorAll('meta[name]').forEach(function (meta) {
+    var name = meta.getAttribute('name');
+    if (!(name in result.meta)) { result.meta[name] = attr(meta, 'content'); }
+});
+result.description = result.meta.description || '';
+
+document.querySelectorAll('form').forEach(function (form) {
+    var inputs = [];
+    form.querySelectorAll('input, textarea, select').forEach(function (input) {
+        inputs.push(extend({
+            type: input.getAttribute('type') || input.tagName.toLowerCase(),
+            name: attr(input, 'name'), placeholder: attr(input, 'placeholder'), required: input.hasAttribute('required')
+        }, describe(input)));
+    });
+    result.forms.push({action: attr(form, 'action'), method: form.getAttribute('method') || 'GET', inputs: inputs});
+});
+
+document.querySelectorAll('button, input[type="submit"], input[type="button"]').forEach(function (button) {
+    var isInput = button.tagName.toLowerCase() === 'input';
+    result.buttons.push(extend({
+        text: isInput ? attr(button, 'value') : text(button),
+        type: isInput ? attr(button, 'type') : (button.getAttribute('type') || 'button')
+    }, describe(button)));
+});
+
+document.querySelectorAll('a[href]').forEach(function (link) {
+    result.links.push(extend({text: text(link), href: link.getAttribute('href'), url: link.href}, describe(link)));
+});
+
+document.querySelectorAll('script[src]').forEach(function (script) { result.script_srcs.push(script.getAttribute('src')); });
+
+var landmarks = {};
+document.querySelectorAll('header, nav, main, aside, footer').forEach(function (el) { landmarks[el.tagName.toLowerCase()] = true; });
+document.querySelectorAll('[role]').forEach(function (el) {
+    var landmark = LANDMARK_ROLES[el.getAttribute('role')];
+    if (landmark) { landmarks[landmark] = true; }
+});
+document.querySelectorAll('div[class]').forEach(function (el) {
+    var value = el.getAttribute('class').toLowerCase();
+    if (value.indexOf('main') !== -1) { landmarks['main-class'] = true; }
+    if (value.indexOf('sidebar') !== -1) { landmarks['sidebar-class'] = true; }
+});
+result.landmarks = Object.keys(landmarks).sort();
+
+if (document.body) {
+    result.interactive_count = document.body.querySelectorAll('form, a, button, input').length;
+    result.body_text_length = (document.body.innerText || '').replace(/\\s+/g, '').length;
+}
+SPA_ROOT_IDS.forEach(function (id) {
+    var root = document.getElementById(id);
+    if (root && !root.firstElementChild && !(root.textContent || '').trim()) { result.empty_roots.push(id); }
+});
+result.ui_element_count = document.querySelectorAll('h1, h2, h3, p, div, button, input').length;
+
+var html = document.documentElement.outerHTML;
+result.html_length = html.length;
+if (markupSources[0]) {
+    // One pass over the HTML finds every position where some signature starts
+    var scan = new RegExp(markupSources[0], 'gim');
+    var atPosition = new RegExp(markupSources[1], 'imy');
+    var matched = {};
+    var match;
+    while ((match = scan.exec(html)) !== null) {
+        // Several signatures can start at one position; the optional lookaheads report them all
+        atPosition.lastIndex = match.index;
+        var all = atPosition.exec(html);
+        for (var g = 1; g < all.length; g++) {
+            if (all[g] !== undefined && !matched[g]) { matched[g] = true; result.markup_matches.push(g - 1); }
+        }
+        scan.lastIndex = match.index + 1;
+    }
+}
+
+for (var p = 0; p < globalPaths.length; p++) {
+    try {
+        var value = window;
+        var keys = globalPaths[p].split('.');
+        for (var k = 0; k < keys.length && value !== undefined && value !== null; k++) { value = value[keys[k]]; }
+        if (value !== undefined && value !== null && value !== false && value !== 0) { result.globals_found.push(globalPaths[p]); }
+    } catch (e) {}
+}
+
+return result;
+"""
+
+# arguments[0]: CSS selectors of the fields, arguments[1]: value to type
+FILL_INPUTS_JS = """
+var value = arguments[1];
+var filled = 0;
+// The native setter keeps framework-controlled inputs (e.g. React) in sync
+var setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+arguments[0].forEach(function (selector) {
+    var input = document.querySelector(selector);
+    if (!input || input.disabled || input.readOnly) { return; }
+    input.focus();
+    setter.call(input, value);
+    input.dispatchEvent(new Event('input', {bubbles: true}));
+    input.dispatchEvent(new Event('change', {bubbles: true}));
+    filled += 1;
+});
+return filled;
+"""
+
+# Fields the executor fills with text input
+TEXT_INPUT_TYPES = ('input', 'text', 'email', 'password', 'search', 'tel', 'url')
+
+
+class DomPage:
+    """Page description captured from a live browser in one round-trip"""
+
+    def __init__(self, extracted):
+        self.extracted = extracted
+
+    @classmethod
+    def capture(cls, driver, fingerprints=None):
+        """
+        Extract the page currently loaded in driver
+
+        Args:
+            driver: Selenium WebDriver on the page to describe
+            fingerprints (FingerprintEngine, optional): Also probe its globals and markup signatures
+
+        Returns:
+            DomPage: The extracted page
+        """
+        global_paths, markup_sources = fingerprints.browser_probe() if fingerprints else ([], ['', ''])
+        return cls(driver.execute_script(DOM_EXTRACTION_JS, global_paths, list(markup_sources)))
+
+    @property
+    def title(self):
+        return self.extracted['title']
+
+    def detect_markup(self, fingerprints):
+        """Technologies whose globals or markup signatures matched inside the browser"""
+        return fingerprints.probe_technologies(self.extracted['globals_found'], self.extracted['markup_matches'])
+
+    def visible_links(self, limit=None):
+        links = [link for link in self.extracted['links'] if link['visible']]
+        return links[:limit] if limit else links
+
+    def clickable_buttons(self, limit=None):
+        """Buttons among the first limit that are both enabled and displayed"""
+        buttons = self.extracted['buttons'][:limit] if limit else self.extracted['buttons']
+        return [button for button in buttons if button['enabled'] and button['visible']]
+
+    def __len__(self):
+        return self.extracted['html_length']
+
+
+def fill_inputs(driver, inputs, value):
+    """Fill text fields of one form in a single round-trip; returns how many were filled"""
+    selectors = [inp['selector'] for inp in inputs
+                 if inp['type'] in TEXT_INPUT_TYPES and inp['visible'] and inp['enabled']]
+    if not selectors:
+        return 0
+    return driver.execute_script(FILL_INPUTS_JS, selectors, value)
@@ -0,0 +1,226 @@
+"""
+Pool of reusable Chrome WebDriver sessions
+Browsers are started once and leased out to tests, so a full execution run
+pays the Chrome startup cost once per worker instead of once per test.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import WebDriverException
+from config.execution import DRIVER_POOL_CONFIG
+
+
+def default_chrome_options(window_size=None):
+    """Build the headless Chrome options shared by the analyzer and the executor"""
+    width, height = window_size or DRIVER_POOL_CONFIG['window_size']
+    options = Options()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument(f'--window-size={width},{height}')
+    return options
+
+
+class PooledDriver:
+    """A WebDriver together with the bookkeeping needed to decide when to recycle it"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.created_at = time.time()
+        self.uses = 0
+
+    def is_expired(self, max_uses, max_lifetime):
+        if max_uses and self.uses >= max_uses:
+            return True
+        if max_lifetime and time.time() - self.created_at >= max_lifetime:
+            return True
+        return False
+
+    def is_healthy(self):
+        """Check that the browser process is still answering commands"""
+        try:
+            self.driver.execute_script("return 1")
+            return True
+        except WebDriverException:
+            return False
+        except Exception:
+            return False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class DriverPool:
+    """Thread-safe pool of headless Chrome sessions"""
+
+    def __init__(self, size=None, warm_up=None, chrome_options=None, config=None):
+        self.config = dict(DRIVER_POOL_CONFIG)
+        if config:
+            self.config.update(config)
+        if size is not None:
+            self.config['size'] = size
+        if warm_up is not None:
+            self.config['warm_up'] = warm_up
+
+        self.size = max(1, int(self.config['size']))
+        self.chrome_options = chrome_options or default_chrome_options(self.config['window_size'])
+
+        self._idle = []  # most recently released last, so warm browsers are reused first
+        self._lock = threading.Lock()
+        # Signalled whenever a browser is returned or a slot is freed
+        self._available = threading.Condition(self._lock)
+        self._created = 0
+        self._closed = False
+
+        self.warm_up(min(self.size, int(self.config.get('warm_up') or 0)))
+
+    def warm_up(self, count):
+        """Start up to `count` browsers ahead of the first lease"""
+        for _ in range(count):
+            if not self._reserve_slot():
+                break
+            try:
+                self._put_idle(self._create_driver())
+            except Exception as e:
+                self._release_slot()
+                print(f"Failed to warm up browser: {e}")
+                break
+
+    @contextmanager
+    def lease(self):
+        """
+        Borrow a clean browser session for the duration of a `with` block
+
+        Yields:
+            WebDriver: A browser with no cookies or storage from previous leases
+        """
+        pooled = self._acquire()
+        try:
+            yield pooled.driver
+        finally:
+            # Test failures (missing elements, timeouts) leave the browser usable; _release checks its health
+            self._release(pooled)
+
+    def close(self):
+        """Quit every idle browser and refuse further leases"""
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._available.notify_all()
+        for pooled in idle:
+            pooled.quit()
+            self._release_slot()
+
+    def stats(self):
+        return {
+            'size': self.size,
+            'created': self._created,
+            'idle': len(self._idle)
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _acquire(self):
+        deadline = time.time() + self.config['lease_timeout']
+        while True:
+            pooled = self._take_or_reserve(deadline)
+            if pooled is None:
+                try:
+                    pooled = self._create_driver()
+                except Exception:
+                    self._release_slot()
+                    raise
+
+            if pooled.is_expired(self.config['max_uses'], self.config['max_lifetime']) or not pooled.is_healthy():
+                self._discard(pooled)
+                continue
+
+            pooled.uses += 1
+            return pooled
+
+    def _take_or_reserve(self, deadline):
+        """Wait for an idle browser or a free slot; returns the browser, or None once a slot is reserved"""
+        with self._available:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.size:
+                    self._created += 1
+                    return None
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise TimeoutError("Timed out waiting for a free browser session")
+                self._available.wait(remaining)
+
+    def _release(self, pooled):
+        if self._closed or not pooled.is_healthy():
+            self._discard(pooled)
+            return
+
+        try:
+            self._reset_session(pooled.driver)
+        except Exception:
+            self._discard(pooled)
+            return
+
+        self._put_idle(pooled)
+
+    def _put_idle(self, pooled):
+        with self._available:
+            self._idle.append(pooled)
+            self._available.notify()
+
+    def _reset_session(self, driver):
+        """Clear cookies, web storage and per-lease timeouts so the next lease starts clean"""
+        try:
+            driver.execute_script(
+                "try { window.localStorage.clear(); } catch (e) {}"
+                "try { window.sessionStorage.clear(); } catch (e) {}"
+            )
+        except WebDriverException:
+            pass
+        try:
+            # Clears cookies for every domain, not just the current page
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        except Exception:
+            driver.delete_all_cookies()
+        driver.get('about:blank')
+        width, height = self.config['window_size']
+        driver.set_window_size(width, height)
+        # Metrics and readiness helpers shorten the script timeout for their own calls
+        driver.set_script_timeout(self.config['script_timeout'])
+
+    def _create_driver(self):
+        driver = webdriver.Chrome(options=self.chrome_options)
+        driver.set_page_load_timeout(self.config['page_load_timeout'])
+        driver.set_script_timeout(self.config['script_timeout'])
+        return PooledDriver(driver)
+
+    def _discard(self, pooled):
+        pooled.quit()
+        self._release_slot()
+
+    def _reserve_slot(self):
+        with self._lock:
+            if self._created >= self.size:
+                return False
+            self._created += 1
+            return True
+
+    def _release_slot(self):
+        with self._available:
+            self._created = max(0, self._created - 1)
+            self._available.notify()
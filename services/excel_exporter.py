@@ -1,14 +1,63 @@
 """
 Excel export utilities for test cases and execution results
-This module provides functionality to export test data to Excel format
+This module provides functionality to export test data to Excel format.
+Workbooks are streamed with openpyxl's write-only mode, so memory stays flat
+however many rows are exported; cells share a handful of named styles.
 """
 
-import json
 from datetime import datetime
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
 
+# Bump whenever the workbook layout changes so cached exports are rebuilt
+FORMAT_VERSION = 2
+
+TEST_CASE_HEADERS = [
+    "ID", "Name", "Description", "Priority", "Category",
+    "Steps", "Expected Result", "Test Data", "Estimated Time"
+]
+
+EXECUTION_HEADERS = [
+    "Test ID", "Test Name", "Status", "Execution Time",
+    "Error Message", "Screenshot", "Execution Details"
+]
+
+STATUS_COLUMN = 2  # zero-based index of "Status" in EXECUTION_HEADERS
+
+STATUS_FILLS = {
+    'passed': "C6EFCE",
+    'failed': "FFC7CE",
+    'skipped': "FFEB9C"
+}
+
+
+class _ColumnWidths:
+    """Tracks the widest line of each column while rows are formatted"""
+    
+    def __init__(self, headers, minimum=15, maximum=50):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.widths = [len(header) for header in headers]
+    
+    def update(self, row):
+        for index, value in enumerate(row):
+            if value is None:
+                continue
+            text = str(value)
+            # A line can never be longer than the whole value, so short values are skipped cheaply
+            if len(text) <= self.widths[index] or self.widths[index] >= self.maximum:
+                continue
+            self.widths[index] = max(self.widths[index], max(len(line) for line in text.split('\n')))
+    
+    def apply(self, worksheet):
+        for index, width in enumerate(self.widths, 1):
+            adjusted_width = min(max(width + 2, self.minimum), self.maximum)
+            worksheet.column_dimensions[get_column_letter(index)].width = adjusted_width
+
+
 class ExcelExporter:
     """Utility class for exporting test data to Excel format"""
     
@@ -43,66 +92,28 @@ class ExcelExporter:
         
         filepath = f"downloads/{session_id}/{filename}"
         
-        # Create workbook and worksheet
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Test Cases"
-        
-        # Define headers
-        headers = [
-            "ID", "Name", "Description", "Priority", "Category", 
-            "Steps", "Expected Result", "Test Data", "Estimated Time"
-        ]
+        wb = self._create_workbook()
+        ws = wb.create_sheet(title="Test Cases")
         
-        # Add headers
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_num, value=header)
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-            cell.alignment = self.center_alignment
-            cell.border = self.border
-        
-        # Add test case data
-        for row_num, test_case in enumerate(test_cases_data, 2):
-            # Convert steps list to numbered string
-            steps_text = ""
-            if isinstance(test_case.get('steps'), list):
-                steps_text = "\n".join([f"{i+1}. {step}" for i, step in enumerate(test_case['steps'])])
-            else:
-                steps_text = str(test_case.get('steps', ''))
-            
-            # Convert test_data dict to formatted string
-            test_data_text = ""
-            if isinstance(test_case.get('test_data'), dict) and test_case['test_data']:
-                test_data_text = "\n".join([f"{k}: {v}" for k, v in test_case['test_data'].items()])
-            else:
-                test_data_text = str(test_case.get('test_data', ''))
-            
-            # Populate row data
-            row_data = [
-                test_case.get('id', row_num - 1),
-                test_case.get('name', ''),
-                test_case.get('description', ''),
-                test_case.get('priority', ''),
-                test_case.get('category', ''),
-                steps_text,
-                test_case.get('expected_result', ''),
-                test_data_text,
-                test_case.get('estimated_time', '')
-            ]
-            
-            for col_num, value in enumerate(row_data, 1):
-                cell = ws.cell(row=row_num, column=col_num, value=value)
-                cell.border = self.border
-                cell.alignment = self.wrap_alignment
+        # Column widths and summary counts must be known before the first row is streamed
+        widths = _ColumnWidths(TEST_CASE_HEADERS)
+        categories = {}
+        priorities = {}
+        for index, test_case in enumerate(test_cases_data, 1):
+            widths.update(self._test_case_row(index, test_case))
+            category = test_case.get('category', 'Unknown')
+            priority = test_case.get('priority', 'Unknown')
+            categories[category] = categories.get(category, 0) + 1
+            priorities[priority] = priorities.get(priority, 0) + 1
+        widths.apply(ws)
         
-        # Auto-adjust column widths
-        self._auto_adjust_columns(ws)
+        ws.append(self._styled_row(ws, TEST_CASE_HEADERS, 'header'))
+        for index, test_case in enumerate(test_cases_data, 1):
+            ws.append(self._styled_row(ws, self._test_case_row(index, test_case), 'body'))
         
         # Add summary information
-        self._add_summary_sheet(wb, test_cases_data, session_id)
+        self._add_summary_sheet(wb, len(test_cases_data), categories, priorities, session_id)
         
-        # Save workbook
         wb.save(filepath)
         return filepath
     
@@ -125,153 +136,155 @@ class ExcelExporter:
         
         filepath = f"downloads/{session_id}/{filename}"
         
-        # Create workbook
-        wb = Workbook()
-        
-        # Create execution results sheet
-        ws_results = wb.active
-        ws_results.title = "Execution Results"
-        
-        # Headers for execution results
-        headers = [
-            "Test ID", "Test Name", "Status", "Execution Time", 
-            "Error Message", "Screenshot", "Execution Details"
-        ]
-        
-        # Add headers
-        for col_num, header in enumerate(headers, 1):
-            cell = ws_results.cell(row=1, column=col_num, value=header)
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-            cell.alignment = self.center_alignment
-            cell.border = self.border
+        wb = self._create_workbook()
+        ws_results = wb.create_sheet(title="Execution Results")
         
-        # Get execution results
         results = execution_data.get('results', [])
         
-        # Add execution data
-        for row_num, result in enumerate(results, 2):
-            # Format execution details
-            details = ""
-            if result.get('details'):
-                details = "\n".join([f"{k}: {v}" for k, v in result['details'].items()])
-            
-            row_data = [
-                result.get('test_id', ''),
-                result.get('test_name', ''),
-                result.get('status', ''),
-                result.get('execution_time', ''),
-                result.get('error_message', ''),
-                result.get('screenshot', ''),
-                details
-            ]
-            
-            for col_num, value in enumerate(row_data, 1):
-                cell = ws_results.cell(row=row_num, column=col_num, value=value)
-                cell.border = self.border
-                cell.alignment = self.wrap_alignment
-                
-                # Color code status cells
-                if col_num == 3:  # Status column
-                    if str(value).lower() == 'passed':
-                        cell.fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-                    elif str(value).lower() == 'failed':
-                        cell.fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-                    elif str(value).lower() == 'skipped':
-                        cell.fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
+        widths = _ColumnWidths(EXECUTION_HEADERS)
+        status_counts = {}
+        for result in results:
+            widths.update(self._execution_row(result))
+            status = result.get('status', 'Unknown')
+            status_counts[status] = status_counts.get(status, 0) + 1
+        widths.apply(ws_results)
         
-        # Auto-adjust column widths
-        self._auto_adjust_columns(ws_results)
+        ws_results.append(self._styled_row(ws_results, EXECUTION_HEADERS, 'header'))
+        for result in results:
+            row_data = self._execution_row(result)
+            row = self._styled_row(ws_results, row_data, 'body')
+            # Color code status cells
+            status = str(row_data[STATUS_COLUMN]).lower()
+            if status in STATUS_FILLS:
+                row[STATUS_COLUMN].style = status
+            ws_results.append(row)
         
         # Add execution summary sheet
-        self._add_execution_summary_sheet(wb, execution_data, session_id)
+        self._add_execution_summary_sheet(wb, execution_data, len(results), status_counts, session_id)
         
-        # Save workbook
         wb.save(filepath)
         return filepath
     
-    def _auto_adjust_columns(self, worksheet):
-        """Auto-adjust column widths based on content"""
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            
-            # Set minimum width and maximum width limits
-            adjusted_width = min(max(max_length + 2, 15), 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+    def _create_workbook(self):
+        """Write-only workbook with the shared named styles registered once"""
+        wb = Workbook(write_only=True)
+        
+        header = NamedStyle(name='header', font=self.header_font, fill=self.header_fill,
+                            alignment=self.center_alignment, border=self.border)
+        body = NamedStyle(name='body', alignment=self.wrap_alignment, border=self.border)
+        for style in (header, body):
+            wb.add_named_style(style)
+        for status, color in STATUS_FILLS.items():
+            wb.add_named_style(NamedStyle(
+                name=status,
+                fill=PatternFill(start_color=color, end_color=color, fill_type="solid"),
+                alignment=self.wrap_alignment,
+                border=self.border
+            ))
+        wb.add_named_style(NamedStyle(name='title', font=Font(size=16, bold=True)))
+        wb.add_named_style(NamedStyle(name='section', font=Font(bold=True)))
+        return wb
     
-    def _add_summary_sheet(self, workbook, test_cases_data, session_id):
+    @staticmethod
+    def _cell(worksheet, value, style=None):
+        if isinstance(value, str):
+            value = ILLEGAL_CHARACTERS_RE.sub('', value)
+        cell = WriteOnlyCell(worksheet, value=value)
+        if style:
+            cell.style = style
+        return cell
+    
+    def _styled_row(self, worksheet, values, style):
+        return [self._cell(worksheet, value, style) for value in values]
+    
+    @staticmethod
+    def _test_case_row(index, test_case):
+        """Flatten one test case into the Test Cases columns"""
+        # Convert steps list to numbered string
+        if isinstance(test_case.get('steps'), list):
+            steps_text = "\n".join([f"{i+1}. {step}" for i, step in enumerate(test_case['steps'])])
+        else:
+            steps_text = str(test_case.get('steps', ''))
+        
+        # Convert test_data dict to formatted string
+        if isinstance(test_case.get('test_data'), dict) and test_case['test_data']:
+            test_data_text = "\n".join([f"{k}: {v}" for k, v in test_case['test_data'].items()])
+        else:
+            test_data_text = str(test_case.get('test_data', ''))
+        
+        return [
+            test_case.get('id', index),
+            test_case.get('name', ''),
+            test_case.get('description', ''),
+            test_case.get('priority', ''),
+            test_case.get('category', ''),
+            steps_text,
+            test_case.get('expected_result', ''),
+            test_data_text,
+            test_case.get('estimated_time', '')
+        ]
+    
+    @staticmethod
+    def _execution_row(result):
+        """Flatten one execution result into the Execution Results columns"""
+        # Executors record details as a message; structured details are listed one per line
+        details = result.get('details') or ''
+        if isinstance(details, dict):
+            details = "\n".join([f"{k}: {v}" for k, v in details.items()])
+        
+        return [
+            result.get('test_id', ''),
+            result.get('test_name', ''),
+            result.get('status', ''),
+            result.get('execution_time', ''),
+            result.get('error') or result.get('error_message') or '',
+            result.get('screenshot') or '',
+            str(details)
+        ]
+    
+    def _add_summary_sheet(self, workbook, total, categories, priorities, session_id):
         """Add a summary sheet with test case statistics"""
         ws_summary = workbook.create_sheet(title="Summary")
         
-        # Summary headers
-        ws_summary.cell(row=1, column=1, value="Test Cases Summary").font = Font(size=16, bold=True)
-        ws_summary.cell(row=2, column=1, value=f"Session ID: {session_id}")
-        ws_summary.cell(row=3, column=1, value=f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        ws_summary.cell(row=4, column=1, value=f"Total Test Cases: {len(test_cases_data)}")
-        
-        # Category breakdown
-        categories = {}
-        priorities = {}
-        
-        for test_case in test_cases_data:
-            category = test_case.get('category', 'Unknown')
-            priority = test_case.get('priority', 'Unknown')
-            
-            categories[category] = categories.get(category, 0) + 1
-            priorities[priority] = priorities.get(priority, 0) + 1
+        ws_summary.append([self._cell(ws_summary, "Test Cases Summary", 'title')])
+        ws_summary.append([f"Session ID: {session_id}"])
+        ws_summary.append([f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"])
+        ws_summary.append([f"Total Test Cases: {total}"])
         
         # Categories section
-        row = 6
-        ws_summary.cell(row=row, column=1, value="Categories:").font = Font(bold=True)
+        ws_summary.append([])
+        ws_summary.append([self._cell(ws_summary, "Categories:", 'section')])
         for category, count in categories.items():
-            row += 1
-            ws_summary.cell(row=row, column=1, value=f"  {category}: {count}")
+            ws_summary.append([f"  {category}: {count}"])
         
         # Priorities section
-        row += 2
-        ws_summary.cell(row=row, column=1, value="Priorities:").font = Font(bold=True)
+        ws_summary.append([])
+        ws_summary.append([self._cell(ws_summary, "Priorities:", 'section')])
         for priority, count in priorities.items():
-            row += 1
-            ws_summary.cell(row=row, column=1, value=f"  {priority}: {count}")
+            ws_summary.append([f"  {priority}: {count}"])
     
-    def _add_execution_summary_sheet(self, workbook, execution_data, session_id):
+    def _add_execution_summary_sheet(self, workbook, execution_data, total_tests, status_counts, session_id):
         """Add a summary sheet with execution statistics"""
         ws_summary = workbook.create_sheet(title="Execution Summary")
         
-        # Summary headers
-        ws_summary.cell(row=1, column=1, value="Execution Summary").font = Font(size=16, bold=True)
-        ws_summary.cell(row=2, column=1, value=f"Session ID: {session_id}")
-        ws_summary.cell(row=3, column=1, value=f"Executed: {execution_data.get('timestamp', 'Unknown')}")
-        
-        # Execution statistics
-        results = execution_data.get('results', [])
-        total_tests = len(results)
-        
-        status_counts = {}
-        for result in results:
-            status = result.get('status', 'Unknown')
-            status_counts[status] = status_counts.get(status, 0) + 1
+        summary = execution_data.get('summary', {})
+        executed = execution_data.get('timestamp') or summary.get('timestamp', 'Unknown')
         
-        ws_summary.cell(row=5, column=1, value=f"Total Tests Executed: {total_tests}")
+        ws_summary.append([self._cell(ws_summary, "Execution Summary", 'title')])
+        ws_summary.append([f"Session ID: {session_id}"])
+        ws_summary.append([f"Executed: {executed}"])
+        ws_summary.append([])
+        ws_summary.append([f"Total Tests Executed: {total_tests}"])
         
         # Status breakdown
-        row = 7
-        ws_summary.cell(row=row, column=1, value="Execution Results:").font = Font(bold=True)
+        ws_summary.append([])
+        ws_summary.append([self._cell(ws_summary, "Execution Results:", 'section')])
         for status, count in status_counts.items():
-            row += 1
-            ws_summary.cell(row=row, column=1, value=f"  {status}: {count}")
+            ws_summary.append([f"  {status}: {count}"])
         
-        # Success rate
-        passed = status_counts.get('Passed', 0)
+        # Success rate; executors record statuses in lower case
+        passed = sum(count for status, count in status_counts.items() if str(status).lower() == 'passed')
         if total_tests > 0:
             success_rate = (passed / total_tests) * 100
-            row += 2
-            ws_summary.cell(row=row, column=1, value=f"Success Rate: {success_rate:.1f}%").font = Font(bold=True)
\ No newline at end of file
+            ws_summary.append([])
+            ws_summary.append([self._cell(ws_summary, f"Success Rate: {success_rate:.1f}%", 'section')])
@@ -0,0 +1,115 @@
+"""
+Cache of Excel exports built from a session's JSON files
+Each workbook is named after a hash of the JSON it was built from, so repeated
+downloads reuse it until test_cases.json or execution_history.json changes.
+A rebuild keeps the previous workbook, which a request that read the older
+source may still be sending, and removes anything older.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from services.excel_exporter import ExcelExporter, FORMAT_VERSION
+from config.cache import EXPORT_CACHE_CONFIG
+
+# ExcelExporter writes into downloads/<session_id>/, next to the session JSON
+DOWNLOADS_DIR = 'downloads'
+
+# Builds are serialized per artifact through a fixed set of lock stripes
+LOCK_STRIPES = 64
+
+# Export kind -> (source JSON file, workbook name prefix)
+EXPORT_KINDS = {
+    'tests': ('test_cases.json', 'test_cases'),
+    'execution': ('execution_history.json', 'execution_results')
+}
+
+
+class ExportCache:
+    """Builds each session export once per version of its source JSON"""
+
+    def __init__(self, config=None):
+        self.config = dict(EXPORT_CACHE_CONFIG)
+        if config:
+            self.config.update(config)
+        self.enabled = self.config['enabled']
+        self.exporter = ExcelExporter()
+        self._locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+    @staticmethod
+    def make_etag(data):
+        """Hash the source JSON bytes together with the workbook layout version"""
+        digest = hashlib.sha256()
+        digest.update(f"{FORMAT_VERSION}\0".encode('utf-8'))
+        digest.update(data)
+        return digest.hexdigest()
+
+    def get(self, session_id, kind):
+        """
+        Return the workbook for a session, building it only when its source JSON changed
+
+        Args:
+            session_id (str): Session identifier
+            kind (str): 'tests' or 'execution'
+
+        Returns:
+            tuple: (path, etag) of the workbook; etag identifies the source version
+
+        Raises:
+            FileNotFoundError: If the session has no source JSON for this kind
+        """
+        source, prefix = EXPORT_KINDS[kind]
+        session_dir = os.path.join(DOWNLOADS_DIR, session_id)
+        with open(os.path.join(session_dir, source), 'rb') as f:
+            data = f.read()
+
+        etag = self.make_etag(data)
+        path = os.path.join(session_dir, f"{prefix}_{etag[:16]}.xlsx")
+        with self._lock_for(path):
+            if not self.enabled or not os.path.exists(path):
+                # Build from the bytes that were hashed so the name always matches the contents
+                self._build(kind, json.loads(data), session_id, path)
+                self._evict(session_dir, prefix, path)
+        return path, etag
+
+    def _build(self, kind, payload, session_id, path):
+        """Write the workbook to a temporary file and move it into place"""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.export-', suffix='.xlsx')
+        os.close(fd)
+        try:
+            if kind == 'tests':
+                self.exporter.export_test_cases(payload, session_id, filename=os.path.basename(tmp_path))
+            else:
+                self.exporter.export_execution_results(payload, session_id, filename=os.path.basename(tmp_path))
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def _evict(session_dir, prefix, current):
+        """
+        Remove workbooks built from earlier versions of the source, including timestamped ones
+
+        The most recent earlier workbook is kept until the next rebuild, since a
+        request that hashed the previous source may be about to send it.
+        """
+        older = []
+        for path in glob.glob(os.path.join(session_dir, f"{prefix}_*.xlsx")):
+            if path != current:
+                try:
+                    older.append((os.path.getmtime(path), path))
+                except OSError:
+                    pass
+        for _, path in sorted(older, reverse=True)[1:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _lock_for(self, path):
+        return self._locks[hash(path) % LOCK_STRIPES]
@@ -0,0 +1,236 @@
+"""
+Technology fingerprinting engine
+Signatures live in config/fingerprints.json. For every source (markup, script
+URLs, or one header or meta field) the literal text each signature requires is
+compiled into one prefix-trie regex. A single pass over the source finds which
+literals occur, and only the signatures behind them are then checked, once per
+document, so adding signatures that do not occur on a page costs almost
+nothing. For pages captured in the browser,
+globals and markup signatures are evaluated inside the page by the single DOM
+extraction call (services.dom_extractor).
+"""
+
+import json
+import os
+import re
+import threading
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants  # Python 3.11+
+except ImportError:
+    import sre_parse
+    import sre_constants
+
+FINGERPRINTS_PATH = os.getenv(
+    'FINGERPRINTS_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config', 'fingerprints.json')
+)
+
+
+# Python-only regex syntax the browser's RegExp engine would reject or read differently
+_JS_INCOMPATIBLE = re.compile(r"\(\?P|\(\?#|\(\?[aiLmsux-]+[:)]|\\[AZ]")
+
+
+def _browser_sources(patterns):
+    """
+    Combine markup patterns into JavaScript regex sources
+
+    Each pattern becomes a lookahead with one capture group, so group i + 1
+    reports pattern i. The scan source is an alternation that finds candidate
+    positions; the position source makes every lookahead optional, so at one
+    position it reports all patterns that match there.
+
+    Returns:
+        tuple: (scan source, position source)
+
+    Raises:
+        ValueError: If a pattern uses syntax that does not carry over to JavaScript
+    """
+    for pattern in patterns:
+        if _JS_INCOMPATIBLE.search(pattern) or re.compile(pattern).groups:
+            raise ValueError(f"Markup signature is not JavaScript-compatible (use (?:...) groups only): {pattern}")
+    scan = '|'.join(f"(?=({pattern}))" for pattern in patterns)
+    position = ''.join(f"(?:(?=({pattern}))|)" for pattern in patterns)
+    return scan, position
+
+
+# Shortest literal worth prefiltering on; signatures without one are always checked
+MIN_LITERAL_LENGTH = 3
+
+
+def required_literal(pattern):
+    """
+    Longest literal text every match of a pattern must contain, lowercased, or None
+
+    Only runs of literal characters in the top-level sequence count; groups,
+    classes and repeats end a run, zero-width assertions such as \\b do not.
+    """
+    runs = [[]]
+    for op, argument in sre_parse.parse(pattern, re.IGNORECASE):
+        if op is sre_constants.LITERAL:
+            runs[-1].append(chr(argument).lower())
+        elif op is not sre_constants.AT:
+            runs.append([])
+    best = ''
+    for run in runs:
+        # Prefer the later of equally long runs: leading text such as class=" is usually the common part
+        if len(run) >= len(best):
+            best = ''.join(run)
+    return best if len(best) >= MIN_LITERAL_LENGTH else None
+
+
+def _trie_pattern(literals):
+    """Regex source matching any of the literals, nested by shared prefixes so matching cost
+    depends on literal length rather than on how many literals there are"""
+    trie = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Optional continuation, so the longest literal at a position is matched
+        return f"(?:{body})?" if '' in node else body
+
+    return build(trie)
+
+
+class _Automaton:
+    """Literal prefilter plus the full signature patterns it points to"""
+
+    def __init__(self, signatures, as_bytes=False):
+        flags = re.IGNORECASE | re.MULTILINE
+        self.as_bytes = as_bytes
+        self.by_literal = {}  # required literal -> indices of its signatures
+        self.unfiltered = []  # signatures without a usable literal
+        self.signatures = []
+        for technology, pattern in signatures:
+            index = len(self.signatures)
+            self.signatures.append((technology, re.compile(pattern.encode('utf-8') if as_bytes else pattern, flags)))
+            literal = required_literal(pattern)
+            if literal is None:
+                self.unfiltered.append(index)
+            else:
+                self.by_literal.setdefault(literal.encode('utf-8') if as_bytes else literal, []).append(index)
+
+        self.literal_lengths = sorted({len(literal) for literal in self.by_literal})
+        self.prefilter = None
+        if self.by_literal:
+            source = _trie_pattern([literal.decode('utf-8') if as_bytes else literal for literal in self.by_literal])
+            self.prefilter = re.compile(source.encode('utf-8') if as_bytes else source, re.IGNORECASE)
+
+    def scan(self, text):
+        """Return the technologies whose signatures match anywhere in text"""
+        found = set()
+        if not self.signatures or not text:
+            return found
+
+        # One pass finds which literals occur; a match restarts one character later so overlaps count
+        candidates = set(self.unfiltered)
+        if self.prefilter is not None:
+            seen = set()
+            position = 0
+            match = self.prefilter.search(text, position)
+            while match is not None and len(seen) < len(self.by_literal):
+                matched = bytes(match.group()).lower() if self.as_bytes else match.group().lower()
+                # Literals that are prefixes of the longest match occur here as well
+                for length in self.literal_lengths:
+                    if length > len(matched):
+                        break
+                    literal = matched[:length]
+                    if literal in self.by_literal and literal not in seen:
+                        seen.add(literal)
+                        candidates.update(self.by_literal[literal])
+                match = self.prefilter.search(text, match.start() + 1)
+
+        # Each candidate signature is checked once for the whole document
+        for index in sorted(candidates):
+            technology, pattern = self.signatures[index]
+            if technology not in found and pattern.search(text):
+                found.add(technology)
+        return found
+
+
+class FingerprintEngine:
+    """Detects technologies from page markup, headers, script URLs, meta tags and globals"""
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, path=None):
+        with open(path or FINGERPRINTS_PATH, encoding='utf-8') as handle:
+            self.signatures = json.load(handle)
+
+        html, script_src, headers, meta = [], [], {}, {}
+        self.global_paths = {}
+        for technology, sources in self.signatures.items():
+            html.extend((technology, pattern) for pattern in sources.get('html', []))
+            script_src.extend((technology, pattern) for pattern in sources.get('script_src', []))
+            for name, pattern in sources.get('headers', {}).items():
+                headers.setdefault(name.lower(), []).append((technology, pattern))
+            for name, pattern in sources.get('meta', {}).items():
+                meta.setdefault(name.lower(), []).append((technology, pattern))
+            for path in sources.get('globals', []):
+                self.global_paths.setdefault(path, []).append(technology)
+
+        # Markup patterns are also run by the browser's RegExp engine, so keep them JS-compatible
+        self.markup_signatures = html
+        self.html = _Automaton(html, as_bytes=True)
+        self.markup_sources = _browser_sources([pattern for _, pattern in html])
+        self.script_src = _Automaton(script_src)
+        # Header and meta values are scanned field by field; a leading ^ anchors to the value start
+        self.headers = {name: _Automaton(patterns) for name, patterns in headers.items()}
+        self.meta = {name: _Automaton(patterns) for name, patterns in meta.items()}
+
+    @classmethod
+    def default(cls):
+        """Process-wide engine compiled from the default signature file"""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def detect(self, page, headers=None):
+        """
+        Detect the technologies used by one page
+
+        Args:
+            page (PageSnapshot or DomPage): Captured page
+            headers (Mapping, optional): HTTP response headers of the page
+
+        Returns:
+            list: Detected technology names in signature file order
+        """
+        extracted = page.extracted
+        found = page.detect_markup(self)
+        found |= self.script_src.scan('\n'.join(extracted['script_srcs']))
+        found |= self._scan_fields(self.meta, extracted['meta'])
+        if headers:
+            found |= self._scan_fields(self.headers, headers)
+        return [technology for technology in self.signatures if technology in found]
+
+    def browser_probe(self):
+        """Global paths and the combined markup regex sources for in-browser evaluation"""
+        return list(self.global_paths), self.markup_sources
+
+    def probe_technologies(self, globals_found, markup_matches):
+        """Map in-browser probe results (global paths, markup pattern indices) back to technologies"""
+        found = {technology for path in globals_found for technology in self.global_paths.get(path, [])}
+        found.update(self.markup_signatures[index][0] for index in markup_matches
+                     if 0 <= index < len(self.markup_signatures))
+        return found
+
+    @staticmethod
+    def _scan_fields(automata, fields):
+        """Scan each field value with the signatures for that field name"""
+        found = set()
+        for name, value in fields.items():
+            automaton = automata.get(name.lower())
+            if automaton is not None:
+                found |= automaton.scan(str(value))
+        return found
@@ -0,0 +1,283 @@
+"""
+Single-pass HTML extraction engine
+Collects forms, buttons, links, meta tags, script sources and page landmarks
+in one traversal of the document. The traversal is driven by a pluggable
+SAX-style backend: lxml's C parser when it is installed, otherwise the
+standard library's streaming html.parser tokenizer.
+"""
+
+import os
+from html.parser import HTMLParser
+
+try:
+    from lxml import etree
+except ImportError:  # lxml is optional
+    etree = None
+
+DEFAULT_BACKEND = os.getenv('HTML_PARSER_BACKEND', 'auto')
+
+# Empty mount points used by client-side rendered apps
+SPA_ROOT_IDS = ('root', 'app', '__next', '__nuxt', 'main-app')
+
+LANDMARK_TAGS = ('header', 'nav', 'main', 'aside', 'footer')
+FORM_FIELD_TAGS = ('input', 'textarea', 'select')
+TEXT_CAPTURE_TAGS = ('button', 'a', 'title')
+SKIPPED_TEXT_TAGS = ('script', 'style', 'template', 'noscript')
+INTERACTIVE_TAGS = ('form', 'a', 'button', 'input')
+VOID_TAGS = ('area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr')
+
+
+class ExtractionCollector:
+    """Receives start/end/data events and builds the page description"""
+
+    def __init__(self):
+        self.title = ''
+        self.meta = {}
+        self.forms = []
+        self.buttons = []
+        self.links = []
+        self.script_srcs = []
+        self.landmarks = set()
+        self.script_count = 0
+        self.interactive_count = 0
+        self.body_text_length = 0
+        self.has_body = False
+        self.empty_roots = []
+
+        self._open_forms = []
+        self._captures = []       # open button/a/title elements collecting text
+        self._roots = []          # open SPA mount points: [id, tag, open_count, has_content]
+        self._skip_depth = 0
+
+    def start(self, tag, attrs):
+        tag = tag.lower()
+        for root in self._roots:
+            root[3] = True
+            if root[1] == tag:
+                root[2] += 1
+
+        if tag == 'body':
+            self.has_body = True
+        elif tag in INTERACTIVE_TAGS and self.has_body:
+            self.interactive_count += 1
+        elif tag in SKIPPED_TEXT_TAGS:
+            self._skip_depth += 1
+            if tag == 'script':
+                self.script_count += 1
+                if attrs.get('src'):
+                    self.script_srcs.append(attrs['src'])
+
+        if tag in LANDMARK_TAGS:
+            self.landmarks.add(tag)
+        elif tag == 'div':
+            classes = (attrs.get('class') or '').lower()
+            if 'main' in classes:
+                self.landmarks.add('main-class')
+            if 'sidebar' in classes:
+                self.landmarks.add('sidebar-class')
+
+        if attrs.get('id') in SPA_ROOT_IDS and tag not in VOID_TAGS:
+            self._roots.append([attrs['id'], tag, 1, False])
+
+        if tag == 'meta':
+            name = attrs.get('name')
+            if name and name not in self.meta:
+                self.meta[name] = attrs.get('content', '')
+        elif tag == 'form':
+            form_info = {
+                'action': attrs.get('action', ''),
+                'method': attrs.get('method', 'GET'),
+                'inputs': []
+            }
+            self.forms.append(form_info)
+            self._open_forms.append(form_info)
+        elif tag in FORM_FIELD_TAGS:
+            if self._open_forms:
+                self._open_forms[-1]['inputs'].append({
+                    'type': attrs.get('type', tag),
+                    'name': attrs.get('name', ''),
+                    'placeholder': attrs.get('placeholder', ''),
+                    'required': 'required' in attrs
+                })
+            if tag == 'input' and attrs.get('type') in ['submit', 'button']:
+                self.buttons.append({
+                    'text': attrs.get('value', ''),
+                    'type': attrs.get('type', ''),
+                    'id': attrs.get('id', ''),
+                    'class': self._classes(attrs)
+                })
+        elif tag == 'button':
+            button = {
+                'text': '',
+                'type': attrs.get('type', 'button'),
+                'id': attrs.get('id', ''),
+                'class': self._classes(attrs)
+            }
+            self.buttons.append(button)
+            self._captures.append((tag, button, []))
+        elif tag == 'a' and 'href' in attrs:
+            link = {
+                'text': '',
+                'href': attrs.get('href') or '',
+                'id': attrs.get('id', ''),
+                'class': self._classes(attrs)
+            }
+            self.links.append(link)
+            self._captures.append((tag, link, []))
+        elif tag == 'title' and not self.title:
+            self._captures.append((tag, None, []))
+
+    def end(self, tag):
+        tag = tag.lower()
+        if tag in SKIPPED_TEXT_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag == 'form' and self._open_forms:
+            self._open_forms.pop()
+        elif tag in TEXT_CAPTURE_TAGS:
+            for position in range(len(self._captures) - 1, -1, -1):
+                if self._captures[position][0] == tag:
+                    self._close_capture(self._captures.pop(position))
+                    break
+
+        for root in [root for root in self._roots if root[1] == tag]:
+            root[2] -= 1
+            if root[2] == 0:
+                self._roots.remove(root)
+                if not root[3]:
+                    self.empty_roots.append(root[0])
+
+    def data(self, text):
+        if self._skip_depth:
+            return
+        stripped = text.strip()
+        if not stripped:
+            return
+        for capture in self._captures:
+            capture[2].append(stripped)
+        for root in self._roots:
+            root[3] = True
+        if self.has_body:
+            self.body_text_length += len(stripped)
+
+    def close(self):
+        while self._captures:
+            self._close_capture(self._captures.pop())
+        return self.result()
+
+    def result(self):
+        return {
+            'title': self.title,
+            'description': self.meta.get('description', ''),
+            'meta': self.meta,
+            'forms': self.forms,
+            'buttons': self.buttons,
+            'links': self.links,
+            'script_srcs': self.script_srcs,
+            'landmarks': sorted(self.landmarks),
+            'script_count': self.script_count,
+            'interactive_count': self.interactive_count,
+            'body_text_length': self.body_text_length,
+            'has_body': self.has_body,
+            'empty_roots': self.empty_roots
+        }
+
+    def _close_capture(self, capture):
+        tag, element, parts = capture
+        text = ''.join(parts)
+        if tag == 'title':
+            self.title = self.title or text
+        else:
+            element['text'] = text
+
+    @staticmethod
+    def _classes(attrs):
+        return (attrs.get('class') or '').split()
+
+
+class _StreamingParser(HTMLParser):
+    """Adapts the standard library tokenizer to the collector interface"""
+
+    def __init__(self, collector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag, {name: value if value is not None else '' for name, value in attrs})
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        self.collector.end(tag)
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+
+def _extract_streaming(data, encoding):
+    collector = ExtractionCollector()
+    parser = _StreamingParser(collector)
+    if not isinstance(data, str):
+        data = str(data, encoding, errors='replace')
+    parser.feed(data)
+    parser.close()
+    return collector.close()
+
+
+def _extract_lxml(data, encoding):
+    collector = ExtractionCollector()
+
+    class Target:
+        def start(self, tag, attrib):
+            collector.start(tag, dict(attrib))
+
+        def end(self, tag):
+            collector.end(tag)
+
+        def data(self, text):
+            collector.data(text)
+
+        def close(self):
+            return collector.close()
+
+    if isinstance(data, str):
+        parser = etree.HTMLParser(target=Target())
+    else:
+        parser = etree.HTMLParser(target=Target(), encoding=encoding)
+        data = bytes(data)
+    return etree.fromstring(data, parser)
+
+
+BACKENDS = {
+    'stream': _extract_streaming,
+    'lxml': _extract_lxml
+}
+
+
+def available_backends():
+    return [name for name in BACKENDS if name != 'lxml' or etree is not None]
+
+
+def extract_page(data, backend=None, encoding='utf-8'):
+    """
+    Extract page information in a single pass
+
+    Args:
+        data (bytes or str): Page HTML
+        backend (str, optional): 'lxml', 'stream' or 'auto' (lxml when installed)
+        encoding (str): Encoding of byte input
+
+    Returns:
+        dict: title, description, meta, forms, buttons, links, script_srcs,
+            landmarks, script_count, interactive_count, body_text_length,
+            has_body and empty_roots
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend == 'auto':
+        backend = 'lxml' if etree is not None else 'stream'
+    if backend == 'lxml' and etree is None:
+        raise ValueError("lxml backend requested but lxml is not installed")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {backend}")
+    return BACKENDS[backend](data, encoding)
@@ -0,0 +1,239 @@
+"""
+Shared HTTP client
+One keep-alive connection pool per app type, with per-host connection limits
+and retry/backoff driven by APP_TYPE_CONFIG. Timed requests split a response
+into DNS, connect, TLS, time to first byte and transfer, so performance checks
+can judge the application rather than connection setup on our side; they are
+never retried, so backoff sleeps stay out of the timings.
+"""
+
+import socket
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.retry import Retry
+from config.app_types import APP_TYPE_CONFIG
+from config.execution import HTTP_CLIENT_CONFIG
+
+try:
+    import httpx
+except ImportError:  # HTTP/2 support is optional
+    httpx = None
+
+# Setup timings of connections opened by the current thread during one timed request
+_connection_timings = threading.local()
+
+
+class _TimedConnectionMixin:
+    """Records DNS and TCP connect time whenever urllib3 opens a new connection"""
+
+    def _new_conn(self):
+        started = time.perf_counter()
+        dns_host = self._dns_host
+        try:
+            # Resolve here so name lookup and connect are timed separately
+            addresses = list(dict.fromkeys(
+                info[4][0] for info in socket.getaddrinfo(dns_host, self.port, type=socket.SOCK_STREAM)
+            ))
+        except socket.gaierror:
+            addresses = [dns_host]  # urllib3 raises its own NameResolutionError below
+        resolved = time.perf_counter()
+        try:
+            # Try every resolved address in order, as create_connection would (e.g. ::1, then 127.0.0.1)
+            for position, address in enumerate(addresses):
+                self._dns_host = address
+                try:
+                    conn = super()._new_conn()
+                    break
+                except (NewConnectionError, ConnectTimeoutError):
+                    if position == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = dns_host
+
+        timings = {'dns': resolved - started, 'connect': time.perf_counter() - resolved, 'tls': 0.0}
+        recorded = getattr(_connection_timings, 'opened', None)
+        if recorded is not None:
+            recorded.append(timings)
+        return conn
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self):
+        started = time.perf_counter()
+        super().connect()
+        recorded = getattr(_connection_timings, 'opened', None)
+        if recorded:
+            timings = recorded[-1]
+            timings['tls'] = max(0.0, time.perf_counter() - started - timings['dns'] - timings['connect'])
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools open timed connections"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool
+        }
+
+
+class HTTPClient:
+    """Pooled HTTP session plus timed requests for one app type"""
+
+    def __init__(self, app_type='local', config=None):
+        self.config = dict(HTTP_CLIENT_CONFIG)
+        if config:
+            self.config.update(config)
+        app_config = APP_TYPE_CONFIG[app_type]
+        self.timeout = app_config['timeout']
+        self.retry_attempts = app_config['retry_attempts']
+        self.session = self._create_session(self._retry())
+        # Timed requests are not retried, so retry backoff never counts as time to first byte
+        self.timed_session = self._create_session(0)
+        self._http2_client = None
+        self._http2_lock = threading.Lock()
+
+    def _retry(self):
+        return Retry(
+            total=self.retry_attempts,
+            backoff_factor=self.config['backoff_factor'],
+            status_forcelist=self.config['retry_statuses'],
+            allowed_methods=frozenset(['HEAD', 'GET', 'OPTIONS']),
+            raise_on_status=False
+        )
+
+    def _create_session(self, retry):
+        adapter = _TimedAdapter(
+            pool_connections=self.config['pool_connections'],
+            pool_maxsize=self.config['pool_maxsize'],
+            pool_block=self.config['pool_block'],
+            max_retries=retry
+        )
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def timed_get(self, url, timeout=None):
+        """
+        GET a URL and time each phase of the request
+
+        Args:
+            url (str): URL to fetch
+            timeout (float, optional): Seconds before giving up; defaults to the app type timeout
+
+        Returns:
+            tuple: (response, timings) where timings holds dns, connect, tls, ttfb,
+                transfer and total seconds, reused_connection and protocol
+        """
+        if self.config['http2'] and httpx is not None:
+            return self._timed_get_http2(url, timeout)
+
+        _connection_timings.opened = []
+        try:
+            started = time.perf_counter()
+            response = self.timed_session.get(url, timeout=timeout or self.timeout, stream=True)
+            headers_received = time.perf_counter()
+            response.content  # read the body to time the transfer
+            finished = time.perf_counter()
+            opened = _connection_timings.opened
+        finally:
+            _connection_timings.opened = None
+
+        setup = {phase: sum(timings[phase] for timings in opened) for phase in ('dns', 'connect', 'tls')}
+        version = getattr(response.raw, 'version', 11)
+        return response, self._timings(
+            setup,
+            ttfb=headers_received - started - sum(setup.values()),
+            transfer=finished - headers_received,
+            total=finished - started,
+            reused_connection=not opened,
+            protocol='HTTP/2' if version == 20 else f"HTTP/{version // 10}.{version % 10}"
+        )
+
+    def _timed_get_http2(self, url, timeout):
+        """Timed GET over httpx; name resolution is reported as part of connect"""
+        with self._http2_lock:
+            if self._http2_client is None:
+                limits = httpx.Limits(
+                    max_connections=self.config['pool_maxsize'],
+                    max_keepalive_connections=self.config['pool_maxsize']
+                )
+                self._http2_client = httpx.Client(
+                    timeout=self.timeout,
+                    transport=httpx.HTTPTransport(http2=True, limits=limits)
+                )
+
+        events = {}
+
+        def trace(name, info):
+            events[name] = time.perf_counter()
+
+        started = time.perf_counter()
+        with self._http2_client.stream('GET', url, timeout=timeout or self.timeout,
+                                       extensions={'trace': trace}) as response:
+            headers_received = time.perf_counter()
+            response.read()
+            finished = time.perf_counter()
+
+        def span(phase):
+            start, end = events.get(f'{phase}.started'), events.get(f'{phase}.complete')
+            return end - start if start is not None and end is not None else 0.0
+
+        setup = {'dns': 0.0, 'connect': span('connection.connect_tcp'), 'tls': span('connection.start_tls')}
+        return response, self._timings(
+            setup,
+            ttfb=headers_received - started - sum(setup.values()),
+            transfer=finished - headers_received,
+            total=finished - started,
+            reused_connection='connection.connect_tcp.started' not in events,
+            protocol=response.http_version
+        )
+
+    @staticmethod
+    def _timings(setup, ttfb, transfer, total, reused_connection, protocol):
+        timings = {phase: round(seconds, 4) for phase, seconds in setup.items()}
+        timings.update({
+            'ttfb': round(max(0.0, ttfb), 4),
+            'transfer': round(transfer, 4),
+            'total': round(total, 4),
+            'reused_connection': reused_connection,
+            'protocol': protocol
+        })
+        return timings
+
+    def close(self):
+        self.session.close()
+        self.timed_session.close()
+        if self._http2_client is not None:
+            self._http2_client.close()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_http_client(app_type='local'):
+    """Process-wide client for an app type, so every caller shares one connection pool"""
+    with _clients_lock:
+        if app_type not in _clients:
+            _clients[app_type] = HTTPClient(app_type)
+        return _clients[app_type]
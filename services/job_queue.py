@@ -0,0 +1,235 @@
+"""
+Background job queue for long-running analyze/generate/execute work
+Jobs are persisted in SQLite and run on per-type local worker pools, which
+stand in for an external broker. The web tier only enqueues and polls.
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config.jobs import JOB_QUEUE_CONFIG
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation has been requested"""
+    pass
+
+
+class JobStore:
+    """SQLite-backed persistence for job state"""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    type TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress REAL NOT NULL DEFAULT 0,
+                    message TEXT,
+                    payload TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)")
+
+    def create(self, job_type, payload):
+        job_id = str(uuid.uuid4())
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, type, status, payload, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, job_type, QUEUED, json.dumps(payload), now, now)
+            )
+        return job_id
+
+    def update(self, job_id, **fields):
+        if 'result' in fields:
+            fields['result'] = json.dumps(fields['result'])
+        fields['updated_at'] = time.time()
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id, include_payload=False):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row, include_payload) if row else None
+
+    def list_by_status(self, statuses):
+        placeholders = ', '.join('?' for _ in statuses)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM jobs WHERE status IN ({placeholders}) ORDER BY created_at", tuple(statuses)
+            ).fetchall()
+        return [self._to_dict(row, include_payload=True) for row in rows]
+
+    def purge(self, older_than):
+        placeholders = ', '.join('?' for _ in FINISHED_STATUSES)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"DELETE FROM jobs WHERE status IN ({placeholders}) AND updated_at < ?",
+                (*FINISHED_STATUSES, older_than)
+            )
+
+    @staticmethod
+    def _to_dict(row, include_payload=False):
+        job = {
+            'job_id': row['id'],
+            'type': row['type'],
+            'status': row['status'],
+            'progress': row['progress'],
+            'message': row['message'],
+            'result': json.loads(row['result']) if row['result'] else None,
+            'error': row['error'],
+            'created_at': row['created_at'],
+            'updated_at': row['updated_at']
+        }
+        if include_payload:
+            job['payload'] = json.loads(row['payload']) if row['payload'] else None
+        return job
+
+
+class JobContext:
+    """Handle passed to a running job for progress reporting and cancellation checks"""
+
+    def __init__(self, job_id, store, cancel_event):
+        self.job_id = job_id
+        self._store = store
+        self._cancel_event = cancel_event
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        """Raise JobCancelled if the job should stop"""
+        if self.cancelled:
+            raise JobCancelled(f"Job {self.job_id} was cancelled")
+
+    def report(self, progress, message=None):
+        """Record progress as a fraction between 0 and 1"""
+        self.check_cancelled()
+        self._store.update(self.job_id, progress=max(0.0, min(1.0, float(progress))), message=message)
+
+
+class JobQueue:
+    """Runs registered job handlers on bounded per-type worker pools"""
+
+    def __init__(self, config=None):
+        self.config = dict(JOB_QUEUE_CONFIG)
+        if config:
+            self.config.update(config)
+        self.store = JobStore(self.config['database'])
+        self._handlers = {}
+        self._executors = {}
+        self._futures = {}
+        self._cancel_events = {}
+        self._lock = threading.Lock()
+        self._started = False
+
+    def register(self, job_type, handler):
+        """
+        Register a job handler
+
+        Args:
+            job_type (str): Job type name, e.g. 'execute-tests'
+            handler (callable): handler(payload, context) returning a JSON-serializable result
+        """
+        self._handlers[job_type] = handler
+
+    def start(self):
+        """Purge old jobs and resume work left behind by a previous process (runs once)"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        self.store.purge(time.time() - self.config['retention'])
+        for job in self.store.list_by_status([RUNNING]):
+            self.store.update(job['job_id'], status=FAILED, error='Interrupted by server restart')
+        for job in self.store.list_by_status([QUEUED]):
+            if job['type'] in self._handlers:
+                self._dispatch(job['job_id'], job['type'], job['payload'])
+
+    def submit(self, job_type, payload):
+        """Persist a new job and hand it to the worker pool for its type; returns the job ID"""
+        if job_type not in self._handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+        job_id = self.store.create(job_type, payload)
+        self._dispatch(job_id, job_type, payload)
+        return job_id
+
+    def get(self, job_id):
+        return self.store.get(job_id)
+
+    def cancel(self, job_id):
+        """Request cancellation; queued jobs stop immediately, running jobs at their next check"""
+        job = self.store.get(job_id)
+        if job is None or job['status'] in FINISHED_STATUSES:
+            return job
+
+        with self._lock:
+            cancel_event = self._cancel_events.get(job_id)
+            future = self._futures.get(job_id)
+        if cancel_event:
+            cancel_event.set()
+        if future is not None and future.cancel():
+            self._finish(job_id)
+            self.store.update(job_id, status=CANCELLED, message='Cancelled before start')
+        return self.store.get(job_id)
+
+    def shutdown(self, wait=False):
+        for executor in self._executors.values():
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _dispatch(self, job_id, job_type, payload):
+        cancel_event = threading.Event()
+        with self._lock:
+            executor = self._executors.get(job_type)
+            if executor is None:
+                workers = self.config['concurrency'].get(job_type, self.config['default_concurrency'])
+                executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'job-{job_type}')
+                self._executors[job_type] = executor
+            self._cancel_events[job_id] = cancel_event
+            self._futures[job_id] = executor.submit(self._run, job_id, job_type, payload, cancel_event)
+
+    def _run(self, job_id, job_type, payload, cancel_event):
+        context = JobContext(job_id, self.store, cancel_event)
+        try:
+            context.check_cancelled()
+            self.store.update(job_id, status=RUNNING, message='Started')
+            result = self._handlers[job_type](payload, context)
+            context.check_cancelled()
+            self.store.update(job_id, status=SUCCEEDED, progress=1.0, message='Completed', result=result)
+        except JobCancelled:
+            self.store.update(job_id, status=CANCELLED, message='Cancelled')
+        except Exception as e:
+            self.store.update(job_id, status=FAILED, error=str(e), message='Failed')
+        finally:
+            self._finish(job_id)
+
+    def _finish(self, job_id):
+        with self._lock:
+            self._futures.pop(job_id, None)
+            self._cancel_events.pop(job_id, None)
@@ -0,0 +1,87 @@
+"""
+Incremental parser for a streamed JSON array of objects
+Model responses arrive in arbitrary text chunks; the parser emits each
+top-level object as soon as its closing brace has been received.
+"""
+
+import json
+
+
+class IncrementalJSONArrayParser:
+    """Feed text chunks in, get completed array elements out"""
+
+    def __init__(self):
+        self._in_array = False
+        self._finished = False
+        self._depth = 0            # nesting depth inside the current element
+        self._in_string = False
+        self._escaped = False
+        self._current = []         # characters of the element being read
+
+    @property
+    def finished(self):
+        """True once the closing bracket of the top-level array has been seen"""
+        return self._finished
+
+    def feed(self, chunk):
+        """
+        Consume a chunk of text
+
+        Args:
+            chunk (str): Next piece of the model response
+
+        Returns:
+            list: Objects whose JSON text was completed by this chunk
+        """
+        completed = []
+        if self._finished or not chunk:
+            return completed
+
+        for char in chunk:
+            if not self._in_array:
+                # Skip any prose or markdown fence before the array starts
+                if char == '[':
+                    self._in_array = True
+                continue
+
+            if self._depth == 0:
+                if char == '{':
+                    self._depth = 1
+                    self._current = [char]
+                elif char == ']':
+                    self._finished = True
+                    break
+                # Commas and whitespace between elements are ignored
+                continue
+
+            self._current.append(char)
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    element = self._decode(''.join(self._current))
+                    self._current = []
+                    if isinstance(element, dict):
+                        completed.append(element)
+
+        return completed
+
+    @staticmethod
+    def _decode(text):
+        try:
+            return json.loads(text)
+        except ValueError:
+            return None
@@ -0,0 +1,397 @@
+"""
+Asyncio load generator for Performance tests
+Virtual users replay a request mix built from the links and forms found on
+the entry page over raw keep-alive HTTP/1.1 connections. Latencies are
+recorded in an HDR-style histogram, so percentiles need constant memory no
+matter how many requests are sent.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import ssl
+import time
+from collections import Counter
+from urllib.parse import urlsplit, urljoin, urlencode
+from services.html_extractor import extract_page
+from config.app_types import APP_TYPE_CONFIG
+from config.execution import LOAD_TEST_CONFIG
+
+USER_AGENT = 'LocalAppTestGenerator-LoadTest/1.0'
+
+# Whole phrases that make a Performance test a load test; "Page Load Time" and
+# similar single-page timing checks stay on the single-request path
+LOAD_TEST_NAME = re.compile(
+    r"(?<!page )\bload[- ]?test|\bunder (?:heavy )?load\b|\bstress\b|\bconcurren(?:t|cy)\b"
+    r"|\bthroughput\b|\bscalab|\bvirtual users\b|\bspike test|\bsoak test"
+)
+
+# Form fields that are never submitted with sample data
+SKIPPED_FIELD_TYPES = ('submit', 'button', 'reset', 'file', 'image')
+
+SAMPLE_VALUES = {
+    'email': 'loadtest@example.com',
+    'number': '1',
+    'tel': '5550100',
+    'url': 'https://example.com',
+    'checkbox': 'on',
+    'date': '2024-01-01'
+}
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram in the style of HdrHistogram
+
+    Values are stored in microseconds. Each power-of-two range is split into
+    2**sub_bucket_bits linear sub-buckets, which bounds the relative error of
+    any reported percentile to about 2**(1 - sub_bucket_bits).
+    """
+
+    def __init__(self, sub_bucket_bits=7):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.counts = []
+        self.total = 0
+        self.min_micros = None
+        self.max_micros = 0
+        self.sum_micros = 0
+
+    def record(self, seconds):
+        micros = max(0, int(seconds * 1_000_000))
+        shift = max(0, micros.bit_length() - self.sub_bucket_bits)
+        index = shift * self.sub_bucket_count + (micros >> shift)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += 1
+
+        self.total += 1
+        self.sum_micros += micros
+        self.max_micros = max(self.max_micros, micros)
+        self.min_micros = micros if self.min_micros is None else min(self.min_micros, micros)
+
+    def percentile(self, percent):
+        """Latency in seconds at or below which percent of the samples fall"""
+        if not self.total:
+            return 0.0
+        target = max(1, math.ceil(self.total * percent / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= target:
+                shift, sub_bucket = divmod(index, self.sub_bucket_count)
+                upper = ((sub_bucket + 1) << shift) - 1
+                return min(upper, self.max_micros) / 1_000_000
+        return self.max_micros / 1_000_000
+
+    def summary(self):
+        return {
+            'p50': round(self.percentile(50), 4),
+            'p95': round(self.percentile(95), 4),
+            'p99': round(self.percentile(99), 4),
+            'min': round((self.min_micros or 0) / 1_000_000, 4),
+            'max': round(self.max_micros / 1_000_000, 4),
+            'mean': round(self.sum_micros / self.total / 1_000_000, 4) if self.total else 0.0
+        }
+
+
+class _LoadStats:
+    """Counters shared by all virtual users of one run (single event loop, no locking needed)"""
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.status_codes = Counter()
+        self.error_types = Counter()
+        self.requests = 0
+        self.errors = 0
+
+    def record(self, latency, status):
+        self.requests += 1
+        self.histogram.record(latency)
+        self.status_codes[str(status)] += 1
+        if status >= 400:
+            self.errors += 1
+
+    def record_error(self, latency, error):
+        self.requests += 1
+        self.errors += 1
+        self.histogram.record(latency)
+        self.error_types[type(error).__name__] += 1
+
+
+class LoadGenerator:
+    """Runs a timed, ramped load test against one application"""
+
+    def __init__(self, base_url, concurrency=None, duration=None, ramp_up=None, app_type='local', config=None):
+        self.config = dict(LOAD_TEST_CONFIG)
+        if config:
+            self.config.update(config)
+        self.base_url = base_url
+        self.concurrency = int(concurrency or self.config['concurrency'])
+        self.duration = float(duration or self.config['duration'])
+        self.ramp_up = self.config['ramp_up'] if ramp_up is None else float(ramp_up)
+        self.thresholds = APP_TYPE_CONFIG[app_type]['performance_thresholds']
+
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or 'http'
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.scheme == 'https' else 80)
+        default_port = (self.scheme == 'https' and self.port == 443) or (self.scheme == 'http' and self.port == 80)
+        host = f"[{self.host}]" if ':' in self.host else self.host
+        self.host_header = host if default_port else f"{host}:{self.port}"
+        self._ssl_context = None
+        if self.scheme == 'https':
+            self._ssl_context = ssl.create_default_context()
+            if not self.config['verify_tls']:
+                self._ssl_context.check_hostname = False
+                self._ssl_context.verify_mode = ssl.CERT_NONE
+
+    def build_request_mix(self, html=None):
+        """
+        Build the request mix from the entry page's links and forms
+
+        Args:
+            html (bytes or str, optional): Entry page HTML; without it only the entry page is requested
+
+        Returns:
+            list: (method, target, body, content_type) tuples
+        """
+        mix = [('GET', self._target(self.base_url), None, None)]
+        if not html:
+            return mix
+
+        extracted = extract_page(html)
+        seen = {mix[0][1]}
+
+        for link in extracted['links']:
+            target = self._same_origin_target(link['href'])
+            if target and target not in seen:
+                seen.add(target)
+                mix.append(('GET', target, None, None))
+
+        for form in extracted['forms']:
+            target = self._same_origin_target(form['action'] or self.base_url)
+            if not target:
+                continue
+            fields = {inp['name']: SAMPLE_VALUES.get(inp['type'], 'loadtest')
+                      for inp in form['inputs'] if inp['name'] and inp['type'] not in SKIPPED_FIELD_TYPES}
+            if form['method'].upper() == 'POST':
+                if self.config['submit_post_forms']:
+                    mix.append(('POST', target, urlencode(fields).encode('utf-8'), 'application/x-www-form-urlencoded'))
+            else:
+                separator = '&' if '?' in target else '?'
+                mix.append(('GET', f"{target}{separator}{urlencode(fields)}" if fields else target, None, None))
+
+        return mix[:self.config['max_paths']]
+
+    def run(self, mix=None):
+        """
+        Run the load test to completion
+
+        Args:
+            mix (list, optional): Request mix from build_request_mix; defaults to the entry page only
+
+        Returns:
+            dict: Requests, errors, error_rate, throughput, latency percentiles and status code counts
+        """
+        return asyncio.run(self._run(mix or self.build_request_mix()))
+
+    def evaluate(self, report):
+        """
+        Judge a report against the app type's performance thresholds
+
+        Returns:
+            tuple: (passed, list of failure reasons)
+        """
+        reasons = []
+        if report['requests'] == 0:
+            reasons.append("no requests completed")
+        if report['latency']['p95'] >= self.thresholds['response_time']:
+            reasons.append(f"p95 latency {report['latency']['p95']:.3f}s exceeds {self.thresholds['response_time']}s")
+        if report['error_rate'] > self.thresholds['error_rate']:
+            reasons.append(f"error rate {report['error_rate']:.2%} exceeds {self.thresholds['error_rate']:.2%}")
+        return not reasons, reasons
+
+    async def _run(self, mix):
+        stats = _LoadStats()
+        started = time.perf_counter()
+        deadline = time.monotonic() + self.duration
+        step = self.ramp_up / self.concurrency if self.concurrency else 0
+        await asyncio.gather(*(
+            self._virtual_user(user * step, deadline, mix, stats, random.Random(user))
+            for user in range(self.concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+        return {
+            'requests': stats.requests,
+            'errors': stats.errors,
+            'error_rate': round(stats.errors / stats.requests, 4) if stats.requests else 0.0,
+            'throughput': round(stats.requests / elapsed, 2) if elapsed else 0.0,
+            'duration': round(elapsed, 2),
+            'concurrency': self.concurrency,
+            'ramp_up': self.ramp_up,
+            'paths': len(mix),
+            'latency': stats.histogram.summary(),
+            'status_codes': dict(stats.status_codes),
+            'error_types': dict(stats.error_types)
+        }
+
+    async def _virtual_user(self, start_delay, deadline, mix, stats, rng):
+        await asyncio.sleep(start_delay)
+        connection = None
+        try:
+            while time.monotonic() < deadline:
+                spec = rng.choice(mix)
+                started = time.perf_counter()
+                try:
+                    if connection is None:
+                        connection = await asyncio.wait_for(
+                            asyncio.open_connection(self.host, self.port, ssl=self._ssl_context),
+                            self.config['request_timeout']
+                        )
+                    status, keep_alive = await asyncio.wait_for(
+                        self._request(*connection, spec), self.config['request_timeout']
+                    )
+                    stats.record(time.perf_counter() - started, status)
+                    if not keep_alive:
+                        self._close(connection)
+                        connection = None
+                except (OSError, ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                    stats.record_error(time.perf_counter() - started, e)
+                    if connection is not None:
+                        self._close(connection)
+                        connection = None
+
+                if self.config['think_time']:
+                    await asyncio.sleep(self.config['think_time'])
+        finally:
+            if connection is not None:
+                self._close(connection)
+
+    async def _request(self, reader, writer, spec):
+        """Send one HTTP/1.1 request and consume the response; returns (status, keep_alive)"""
+        method, target, body, content_type = spec
+        lines = [
+            f"{method} {target} HTTP/1.1",
+            f"Host: {self.host_header}",
+            f"User-Agent: {USER_AGENT}",
+            "Accept: */*",
+            "Connection: keep-alive"
+        ]
+        if body is not None:
+            lines.append(f"Content-Type: {content_type}")
+            lines.append(f"Content-Length: {len(body)}")
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + (body or b''))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed before a response was received")
+        version, status = status_line.decode('latin-1').split(None, 2)[:2]
+        status = int(status)
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        connection_header = headers.get('connection', '').lower()
+        keep_alive = connection_header != 'close' and (version != 'HTTP/1.0' or connection_header == 'keep-alive')
+
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            pass
+        elif 'chunked' in headers.get('transfer-encoding', '').lower():
+            await self._discard_chunked(reader)
+        elif 'content-length' in headers:
+            await self._discard(reader, int(headers['content-length']))
+        else:
+            # Body delimited by connection close
+            while await reader.read(65536):
+                pass
+            keep_alive = False
+
+        return status, keep_alive
+
+    @staticmethod
+    async def _discard(reader, length):
+        while length > 0:
+            chunk = await reader.read(min(length, 65536))
+            if not chunk:
+                raise asyncio.IncompleteReadError(b'', length)
+            length -= len(chunk)
+
+    async def _discard_chunked(self, reader):
+        while True:
+            size_line = await reader.readline()
+            if not size_line:
+                raise asyncio.IncompleteReadError(b'', None)
+            size = int(size_line.split(b';', 1)[0].strip() or b'0', 16)
+            if size == 0:
+                # Skip optional trailers up to the terminating blank line
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return
+            await self._discard(reader, size)
+            await reader.readline()  # CRLF after each chunk
+
+    @staticmethod
+    def _close(connection):
+        connection[1].close()
+
+    def _target(self, url):
+        parts = urlsplit(url)
+        return (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+
+    def _same_origin_target(self, href):
+        """Request target for a same-origin http(s) URL, or None"""
+        url = urljoin(self.base_url, href)
+        parts = urlsplit(url)
+        if parts.scheme != self.scheme or parts.hostname != self.host or (parts.port or self.port) != self.port:
+            return None
+        return self._target(url)
+
+
+def is_load_test(test_case):
+    """
+    Whether a Performance test should be driven as a load test
+
+    test_data['load_test'] overrides the mode and the name check either way;
+    otherwise LOAD_TEST_CONFIG['mode'] decides, and in 'auto' mode the test
+    name has to ask for load, stress, concurrency or throughput by phrase.
+    """
+    flag = (test_case.get('test_data') or {}).get('load_test')
+    if flag is not None:
+        return bool(flag)
+    mode = LOAD_TEST_CONFIG['mode']
+    if mode in ('always', 'off'):
+        return mode == 'always'
+    return bool(LOAD_TEST_NAME.search(test_case.get('name', '').lower()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a load test against an application")
+    parser.add_argument('url')
+    parser.add_argument('--concurrency', type=int)
+    parser.add_argument('--duration', type=float)
+    parser.add_argument('--ramp-up', type=float)
+    args = parser.parse_args()
+
+    from services.http_client import get_http_client
+    generator = LoadGenerator(args.url, args.concurrency, args.duration, args.ramp_up)
+    mix = generator.build_request_mix(get_http_client().session.get(args.url, timeout=10).content)
+    report = generator.run(mix)
+    passed, reasons = generator.evaluate(report)
+    report['passed'] = passed
+    report['reasons'] = reasons
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,240 @@
+"""
+Map-reduce test generation
+Splits an analysis into chunks (forms, buttons and navigation, crawled pages,
+plus one for app-wide checks), asks the provider for tests on each chunk
+concurrently under a shared rate limit, then merges the answers and drops
+duplicates. When the analyzer's report is available each chunk is compacted
+with its own token budget, so parts of the app the single-prompt context had
+to leave out still get tests. Larger apps get more tests while wall time stays
+close to a single provider call.
+"""
+
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from config.prompts import MAP_REDUCE_CONFIG
+from services.context_compactor import SECTIONS, ContextCompactor, parse_context
+
+GENERATION_MODES = ('single', 'map-reduce', 'auto')
+
+GENERAL_FOCUS = "the application as a whole: security, performance, accessibility and error handling"
+
+# Focus wording per section heading
+SECTION_FOCUS = {
+    'Forms Found': 'forms',
+    'Buttons Found': 'buttons',
+    'Navigation Links': 'navigation links',
+    'Additional Pages Crawled': 'additional pages'
+}
+
+
+def split_context(context, max_chunks):
+    """
+    Split a formatted context into at most max_chunks self-contained chunk contexts
+
+    The first chunk covers app-wide checks; every other chunk repeats the
+    overview and lists one slice of the forms, interface and pages. Only the
+    items present in the context are split; see split_context_info.
+    """
+    overview, sections = parse_context(context)
+    return [_chunk_context(overview, focus, entries) for focus, entries in _plan_chunks(sections, max_chunks)]
+
+
+def split_context_info(context_info, max_chunks, compactor=None):
+    """
+    Split an AppAnalyzer report into at most max_chunks chunk contexts
+
+    Every item of the report is assigned to a chunk before any budgeting, and
+    each chunk is then compacted with the full token budget.
+    """
+    compactor = compactor or ContextCompactor()
+    overview, items = compactor.collect(context_info)
+    sections = {title: items[key] for key, title in SECTIONS}
+    chunks = []
+    for focus, entries in _plan_chunks(sections, max_chunks):
+        chunk_items = {key: [item for section, item in entries if section == title] for key, title in SECTIONS}
+        chunks.append(compactor.render(f"{overview}\n\n{_focus_line(focus)}", chunk_items))
+    return chunks
+
+
+def _plan_chunks(sections, max_chunks):
+    """(focus, [(section title, item), ...]) per chunk, the app-wide chunk first"""
+    # Each unit is one part of the app a chunk can focus on: a form, the interface, a page
+    units = [[('Forms Found', item)] for item in sections.get('Forms Found', [])]
+    interface = [(title, item) for title in ('Buttons Found', 'Navigation Links') for item in sections.get(title, [])]
+    if interface:
+        units.append(interface)
+    units.extend([('Additional Pages Crawled', item)] for item in sections.get('Additional Pages Crawled', []))
+
+    # Keep neighbouring units together when there are more units than chunks
+    slots = max(1, max_chunks - 1)
+    if len(units) > slots:
+        units = [
+            [entry for unit in units[i * len(units) // slots:(i + 1) * len(units) // slots] for entry in unit]
+            for i in range(slots)
+        ]
+
+    plan = [(GENERAL_FOCUS, [])]
+    for unit in units:
+        titles = [title for _, title in SECTIONS if any(entry[0] == title for entry in unit)]
+        focus = ' and '.join(SECTION_FOCUS[title] for title in titles)
+        plan.append((f"the {focus} listed below", unit))
+    return plan
+
+
+def _focus_line(focus):
+    return (f"Focus: generate test cases for {focus}. The report above is background; "
+            "other parts of the application are covered by separate requests.")
+
+
+def _chunk_context(overview, focus, entries):
+    parts = [overview, _focus_line(focus)]
+    for _, title in SECTIONS:
+        items = [item for section, item in entries if section == title]
+        if items:
+            parts.append(f"{title} ({len(items)}):\n" + "\n".join(items))
+    return "\n\n".join(parts)
+
+
+class RateLimiter:
+    """Token bucket shared by every thread that calls a provider"""
+
+    def __init__(self, per_minute, burst=1):
+        self.rate = per_minute / 60.0 if per_minute else None
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a call may start"""
+        if self.rate is None:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve a token now; a negative balance is the wait until it is earned
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+def _dedupe_key(text):
+    return re.sub(r'[^a-z0-9]+', ' ', str(text).lower()).strip()
+
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def shared_rate_limiter(per_minute, burst=1):
+    """Process-wide limiter for a rate, so concurrent requests share one provider budget"""
+    with _rate_limiters_lock:
+        key = (per_minute, burst)
+        if key not in _rate_limiters:
+            _rate_limiters[key] = RateLimiter(per_minute, burst)
+        return _rate_limiters[key]
+
+
+class TestCaseMerger:
+    """Accumulates test cases from several chunks, skipping duplicates and renumbering IDs"""
+
+    def __init__(self):
+        self.test_cases = []
+        self._seen = set()
+
+    def add(self, test_cases):
+        """Merge a batch and return the test cases that were new"""
+        added = []
+        for test_case in test_cases:
+            steps = test_case.get('steps', [])
+            keys = [
+                ('name', _dedupe_key(test_case.get('name', ''))),
+                ('checks', _dedupe_key(' '.join(map(str, steps)) + ' ' + str(test_case.get('expected_result', ''))))
+            ]
+            # An empty name or empty checks says nothing about being a duplicate
+            keys = [key for key in keys if key[1]]
+            if any(key in self._seen for key in keys):
+                continue
+            self._seen.update(keys)
+            merged = dict(test_case, id=len(self.test_cases) + 1)
+            self.test_cases.append(merged)
+            added.append(merged)
+        return added
+
+
+class MapReduceGenerator:
+    """Plans chunked generation and runs the chunk calls concurrently"""
+
+    def __init__(self, config=None):
+        self.config = dict(MAP_REDUCE_CONFIG)
+        if config:
+            self.config.update(config)
+        self.rate_limiter = shared_rate_limiter(self.config['requests_per_minute'], burst=self.config['concurrency'])
+
+    @property
+    def test_count(self):
+        return self.config['tests_per_chunk']
+
+    def plan(self, context, mode=None, context_info=None):
+        """
+        Decide how to generate for a context
+
+        Args:
+            context (str): Formatted analysis context
+            mode (str, optional): 'single', 'map-reduce' or 'auto'; defaults to the configured mode
+            context_info (dict, optional): The analyzer report behind context; chunks are
+                split from it, so items the compacted context dropped are not lost
+
+        Returns:
+            list: Chunk contexts for map-reduce, or None to use a single call
+
+        Raises:
+            ValueError: If mode is not one of GENERATION_MODES
+        """
+        mode = mode or self.config['mode']
+        if mode not in GENERATION_MODES:
+            raise ValueError(f"Unknown generation mode: {mode} (expected one of {', '.join(GENERATION_MODES)})")
+        if mode == 'single':
+            return None
+        if context_info:
+            chunks = split_context_info(context_info, self.config['max_chunks'])
+        else:
+            chunks = split_context(context, self.config['max_chunks'])
+        if len(chunks) < 2 or (mode == 'auto' and len(chunks) < self.config['min_chunks']):
+            return None
+        return chunks
+
+    def run(self, generate_chunk, chunks):
+        """
+        Call generate_chunk(chunk_context, test_count) for every chunk concurrently
+
+        generate_chunk is expected to call rate_limiter.acquire() before each
+        provider request, so cached chunks are not held back by the limit.
+
+        Yields:
+            tuple: (chunk index, result) in completion order
+
+        Raises:
+            Exception: The first chunk error, if every chunk failed
+        """
+        errors = []
+        workers = max(1, min(self.config['concurrency'], len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(generate_chunk, chunk, self.test_count): index
+                for index, chunk in enumerate(chunks)
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # One failed chunk only costs its part of the suite
+                    errors.append(e)
+                    continue
+                yield futures[future], result
+        if errors and len(errors) == len(chunks):
+            raise errors[0]
@@ -0,0 +1,41 @@
+"""
+Single DOM snapshot shared by every analysis step
+The page HTML is kept as bytes; the single-pass extractor and the
+technology detector both work from the same buffer instead of re-reading
+or lowercasing it.
+"""
+
+from services.html_extractor import extract_page
+
+
+class PageSnapshot:
+    """Immutable page HTML captured once, with lazily extracted page information"""
+
+    def __init__(self, data, encoding='utf-8'):
+        self.data = bytes(data)
+        self.encoding = encoding
+        self._extracted = None
+
+    @classmethod
+    def from_text(cls, text):
+        return cls(text.encode('utf-8'))
+
+    @property
+    def view(self):
+        """Zero-copy view of the raw HTML"""
+        return memoryview(self.data)
+
+    @property
+    def extracted(self):
+        """Forms, buttons, links, meta and landmarks, extracted on first use and shared afterwards"""
+        if self._extracted is None:
+            self._extracted = extract_page(self.data, encoding=self.encoding)
+        return self._extracted
+
+    def detect_markup(self, fingerprints):
+        """Technologies whose markup signatures match the raw HTML"""
+        return fingerprints.html.scan(self.view)
+
+    def __len__(self):
+        return len(self.data)
+
@@ -0,0 +1,76 @@
+"""
+Process-wide AI provider registry
+Each provider is created once per process and keeps its SDK clients (and their
+connection pools) for the life of the process. Provider classes are imported by
+path on first use, and the availability list served by /providers is cached.
+"""
+
+import importlib
+import threading
+import time
+from config.providers import PROVIDER_CONFIG
+
+
+class ProviderRegistry:
+    """Lazily created provider singletons plus a cached availability list"""
+
+    def __init__(self, config=None):
+        self.config = dict(PROVIDER_CONFIG)
+        if config:
+            self.config.update(config)
+        self._providers = {}
+        self._info = None
+        self._info_time = 0.0
+        self._lock = threading.RLock()
+
+    def get(self, name):
+        """Return the provider registered under name, creating it on first use"""
+        with self._lock:
+            if name not in self._providers:
+                if name not in self.config['classes']:
+                    raise ValueError(f"Unknown provider: {name}")
+                module_name, class_name = self.config['classes'][name].rsplit('.', 1)
+                provider_class = getattr(importlib.import_module(module_name), class_name)
+                self._providers[name] = provider_class()
+            return self._providers[name]
+
+    def providers(self):
+        """All registered providers in configuration order"""
+        return {name: self.get(name) for name in self.config['classes']}
+
+    def provider_info(self):
+        """
+        Provider descriptions with 'key' and 'available', cached for availability_ttl seconds
+
+        Returns:
+            list: One info dict per registered provider
+        """
+        with self._lock:
+            if self._info is None or time.monotonic() - self._info_time > self.config['availability_ttl']:
+                info = []
+                for name, provider in self.providers().items():
+                    entry = provider.get_provider_info()
+                    entry['key'] = name
+                    entry['available'] = provider.is_available()
+                    info.append(entry)
+                self._info = info
+                self._info_time = time.monotonic()
+            return [dict(entry) for entry in self._info]
+
+    def invalidate(self):
+        """Forget the cached availability list"""
+        with self._lock:
+            self._info = None
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Process-wide registry shared by every AIProviderManager"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ProviderRegistry()
+        return _registry
@@ -0,0 +1,163 @@
+"""
+Event-driven page readiness detection
+Replaces fixed time.sleep calls with waits on document.readyState, network
+idle (no in-flight fetch/XHR) and DOM mutation quiescence.
+"""
+
+import time
+import weakref
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from config.execution import READINESS_CONFIG
+
+# Tracks in-flight fetch/XHR requests and the time of the last DOM mutation.
+# Installed before page scripts run when CDP is available, otherwise injected
+# after load (in which case resource timing entries cover earlier requests).
+INSTRUMENTATION_JS = """
+(function () {
+    if (window.__pageReadiness) { return; }
+    var state = window.__pageReadiness = {
+        inflight: 0,
+        lastNetwork: document.readyState === 'complete' ? 0 : performance.now(),
+        lastMutation: performance.now()
+    };
+    function started() { state.inflight += 1; state.lastNetwork = performance.now(); }
+    function finished() { state.inflight = Math.max(0, state.inflight - 1); state.lastNetwork = performance.now(); }
+
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            started();
+            return originalFetch.apply(this, arguments).then(
+                function (response) { finished(); return response; },
+                function (error) { finished(); throw error; }
+            );
+        };
+    }
+
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        started();
+        this.addEventListener('loadend', finished);
+        return originalSend.apply(this, arguments);
+    };
+
+    new MutationObserver(function () { state.lastMutation = performance.now(); })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+})();
+"""
+
+NETWORK_IDLE_JS = """
+var state = window.__pageReadiness;
+var idleMs = arguments[0];
+var now = performance.now();
+var lastActivity = state ? state.lastNetwork : 0;
+var resources = performance.getEntriesByType('resource');
+for (var i = 0; i < resources.length; i++) {
+    lastActivity = Math.max(lastActivity, resources[i].responseEnd);
+}
+return (!state || state.inflight === 0) && now - lastActivity >= idleMs;
+"""
+
+DOM_QUIET_JS = """
+var state = window.__pageReadiness;
+return !state || performance.now() - state.lastMutation >= arguments[0];
+"""
+
+NEXT_FRAME_JS = """
+var done = arguments[arguments.length - 1];
+requestAnimationFrame(function () { requestAnimationFrame(function () { done(true); }); });
+"""
+
+
+class PageReadiness:
+    """Waits for a page to settle and records how long each wait took"""
+
+    def __init__(self, config=None):
+        self.config = dict(READINESS_CONFIG)
+        if config:
+            self.config.update(config)
+        self._instrumented = weakref.WeakSet()
+
+    def prepare(self, driver):
+        """Register the instrumentation script for every future navigation of this driver"""
+        if driver in self._instrumented:
+            return
+        try:
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': INSTRUMENTATION_JS})
+            self._instrumented.add(driver)
+        except Exception:
+            # Non-Chromium drivers fall back to injecting after load
+            pass
+
+    def wait_until_ready(self, driver):
+        """
+        Wait for document.readyState, network idle and DOM quiescence in turn
+
+        Args:
+            driver: Selenium WebDriver that has just navigated
+
+        Returns:
+            dict: Seconds spent in each stage plus the total and any stages that timed out
+        """
+        timings = {}
+        timed_out = []
+        started = time.time()
+
+        if not self._wait('document_ready', driver, self._document_ready, self.config['document_ready_timeout'], timings):
+            timed_out.append('document_ready')
+
+        self._inject(driver)
+
+        idle_ms = self.config['network_idle_ms']
+        if not self._wait('network_idle', driver, lambda d: d.execute_script(NETWORK_IDLE_JS, idle_ms),
+                          self.config['network_idle_timeout'], timings):
+            timed_out.append('network_idle')
+
+        quiet_ms = self.config['dom_quiet_ms']
+        if not self._wait('dom_quiet', driver, lambda d: d.execute_script(DOM_QUIET_JS, quiet_ms),
+                          self.config['dom_quiet_timeout'], timings):
+            timed_out.append('dom_quiet')
+
+        timings['total'] = round(time.time() - started, 3)
+        if timed_out:
+            timings['timed_out'] = timed_out
+        return timings
+
+    def wait_for_layout(self, driver):
+        """Wait for the next rendered frame and DOM quiescence, e.g. after a window resize"""
+        timings = {}
+        started = time.time()
+        try:
+            driver.set_script_timeout(self.config['dom_quiet_timeout'])
+            driver.execute_async_script(NEXT_FRAME_JS)
+        except (TimeoutException, WebDriverException):
+            pass
+        timings['next_frame'] = round(time.time() - started, 3)
+
+        self._inject(driver)
+        quiet_ms = self.config['dom_quiet_ms']
+        self._wait('dom_quiet', driver, lambda d: d.execute_script(DOM_QUIET_JS, quiet_ms),
+                   self.config['dom_quiet_timeout'], timings)
+        timings['total'] = round(time.time() - started, 3)
+        return timings
+
+    def _wait(self, stage, driver, condition, timeout, timings):
+        started = time.time()
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=self.config['poll_interval']).until(condition)
+            return True
+        except TimeoutException:
+            return False
+        finally:
+            timings[stage] = round(time.time() - started, 3)
+
+    def _inject(self, driver):
+        try:
+            driver.execute_script(INSTRUMENTATION_JS)
+        except WebDriverException:
+            pass
+
+    @staticmethod
+    def _document_ready(driver):
+        return driver.execute_script("return document.readyState") == 'complete'
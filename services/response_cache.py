@@ -0,0 +1,43 @@
+"""
+Persistent cache for AI provider responses
+Entries hold the already parsed and validated test cases, keyed by a hash of
+the exact prompt and the model that answered it.
+"""
+
+import hashlib
+from services.disk_cache import DiskCache
+from config.cache import LLM_CACHE_CONFIG
+
+
+class ResponseCache:
+    """Size-bounded on-disk cache of generated test cases"""
+
+    def __init__(self, config=None):
+        self.config = dict(LLM_CACHE_CONFIG)
+        if config:
+            self.config.update(config)
+        self.enabled = self.config['enabled']
+        self._store = DiskCache(
+            self.config['directory'],
+            ttl=self.config['ttl'],
+            max_bytes=self.config['max_bytes']
+        )
+
+    @staticmethod
+    def make_key(provider_name, model, prompt):
+        """Hash the provider, model name and full prompt text into a cache key"""
+        digest = hashlib.sha256()
+        for part in (provider_name, model, prompt):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        entry = self._store.get(key)
+        return entry['test_cases'] if entry else None
+
+    def set(self, key, test_cases):
+        if self.enabled:
+            self._store.set(key, {'test_cases': test_cases})
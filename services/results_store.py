@@ -0,0 +1,381 @@
+"""
+Persistent execution results store
+Every run is recorded in SQLite (runs, tests and numeric metrics tables) in
+one batched transaction, so trends, flaky tests and duration percentiles can
+be queried across thousands of runs without reading execution_history.json
+files. Existing history files are imported once.
+"""
+
+import os
+import glob
+import json
+import hashlib
+import math
+import sqlite3
+import threading
+from datetime import datetime
+from config.results import RESULTS_STORE_CONFIG
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT,
+    url TEXT,
+    mode TEXT,
+    started_at REAL NOT NULL,
+    total INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    execution_time REAL,
+    source TEXT UNIQUE
+);
+CREATE TABLE IF NOT EXISTS tests (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    test_id TEXT,
+    test_name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    category TEXT,
+    priority TEXT,
+    status TEXT NOT NULL,
+    duration REAL,
+    error TEXT,
+    url TEXT,
+    timestamp REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    test_row_id INTEGER NOT NULL REFERENCES tests (id) ON DELETE CASCADE,
+    run_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_url_started ON runs (url, started_at);
+CREATE INDEX IF NOT EXISTS idx_runs_started ON runs (started_at);
+CREATE INDEX IF NOT EXISTS idx_tests_name_timestamp ON tests (name_key, timestamp);
+CREATE INDEX IF NOT EXISTS idx_tests_url_timestamp ON tests (url, timestamp);
+CREATE INDEX IF NOT EXISTS idx_tests_status ON tests (status);
+CREATE INDEX IF NOT EXISTS idx_tests_timestamp ON tests (timestamp);
+CREATE INDEX IF NOT EXISTS idx_tests_run ON tests (run_id);
+CREATE INDEX IF NOT EXISTS idx_metrics_name ON metrics (name, run_id);
+CREATE INDEX IF NOT EXISTS idx_metrics_test ON metrics (test_row_id);
+"""
+
+
+def normalize_name(name):
+    return ' '.join(str(name).lower().split())
+
+
+def _parse_seconds(value):
+    """Parse an execution_time such as '4.27s' or '0:00:29.7' into seconds, or None"""
+    try:
+        text = str(value).strip().rstrip('s')
+        seconds = 0.0
+        for part in text.split(':'):
+            seconds = seconds * 60 + float(part)
+        return seconds
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_timestamp(value, default):
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return default
+
+
+def history_source(data):
+    """Content key of a serialized execution history, so a run is never stored twice"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return f"sha256:{hashlib.sha256(data).hexdigest()}"
+
+
+def _flatten_metrics(prefix, value, metrics):
+    """Collect numeric leaves of nested result metrics as dotted names"""
+    if isinstance(value, bool):
+        return
+    if isinstance(value, (int, float)):
+        if math.isfinite(value):
+            metrics.append((prefix, float(value)))
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            _flatten_metrics(f"{prefix}.{key}", item, metrics)
+
+
+def result_metrics(result):
+    """Numeric metrics worth keeping from one test result"""
+    metrics = []
+    _flatten_metrics('http', result.get('http_timings'), metrics)
+    load_test = result.get('load_test') or {}
+    for key in ('throughput', 'error_rate', 'requests'):
+        _flatten_metrics(f"load.{key}", load_test.get(key), metrics)
+    _flatten_metrics('load.latency', load_test.get('latency'), metrics)
+    # Only the first page load of a test; later navigations would repeat the same names
+    for page in (result.get('browser_metrics') or [])[:1]:
+        for section in ('navigation', 'paint', 'web_vitals'):
+            _flatten_metrics(f"browser.{section}", page.get(section), metrics)
+        _flatten_metrics('browser.resources.count', (page.get('resources') or {}).get('count'), metrics)
+    return metrics
+
+
+def _percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted list"""
+    rank = max(1, math.ceil(len(sorted_values) * percent / 100))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class ResultsStore:
+    """SQLite-backed history of test runs with trend and flakiness queries"""
+
+    def __init__(self, path=None, config=None):
+        self.config = dict(RESULTS_STORE_CONFIG)
+        if config:
+            self.config.update(config)
+        self.path = path or self.config['database']
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._imported = False
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(SCHEMA)
+
+    def record_run(self, execution_results, session_id=None, url=None, mode=None, source=None):
+        """
+        Store one run and all of its test results in a single transaction
+
+        Args:
+            execution_results (dict): Output of TestExecutor.execute_tests
+            session_id (str, optional): Session the run belongs to
+            url (str, optional): Application URL the tests ran against
+            mode (str, optional): 'local' or 'distributed'
+            source (str, optional): history_source of the saved JSON; runs already stored are skipped
+
+        Returns:
+            int: The run ID, or None if this run was already stored
+        """
+        summary = execution_results.get('summary', {})
+        results = [result for result in execution_results.get('results', []) if result]
+        started_at = _parse_timestamp(summary.get('timestamp'), datetime.now().timestamp())
+
+        test_rows = []
+        metric_rows = []
+        for result in results:
+            test_rows.append((
+                str(result.get('test_id', '')),
+                result.get('test_name', 'Unknown Test'),
+                normalize_name(result.get('test_name', '')),
+                str(result.get('category', '')).lower(),
+                result.get('priority'),
+                result.get('status', 'failed'),
+                _parse_seconds(result.get('execution_time')),
+                result.get('error'),
+                url,
+                _parse_timestamp(result.get('timestamp'), started_at)
+            ))
+            metric_rows.append(result_metrics(result))
+
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO runs (session_id, url, mode, started_at, total, passed, failed, execution_time, source)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (session_id, url, mode, started_at, summary.get('total_tests', len(results)),
+                 summary.get('passed', 0), summary.get('failed', 0),
+                 _parse_seconds(summary.get('execution_time')), source)
+            )
+            if cursor.rowcount == 0:
+                return None
+            run_id = cursor.lastrowid
+
+            self._conn.executemany(
+                "INSERT INTO tests (run_id, test_id, test_name, name_key, category, priority, status, duration, error, url, timestamp)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, *row) for row in test_rows]
+            )
+            test_ids = [row[0] for row in self._conn.execute("SELECT id FROM tests WHERE run_id = ? ORDER BY id", (run_id,))]
+            self._conn.executemany(
+                "INSERT INTO metrics (test_row_id, run_id, name, value) VALUES (?, ?, ?, ?)",
+                [(test_row_id, run_id, name, value)
+                 for test_row_id, metrics in zip(test_ids, metric_rows) for name, value in metrics]
+            )
+        return run_id
+
+    def import_history(self, history_dir=None):
+        """
+        Import every execution_history.json not imported before; returns the number of new runs
+
+        Sessions never saved the URL they ran against, so imported runs are
+        unscoped: they are stored with no url and only appear in queries
+        without a url filter.
+        """
+        imported = 0
+        pattern = os.path.join(history_dir or self.config['history_dir'], '*', 'execution_history.json')
+        for path in glob.glob(pattern):
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                history = json.loads(data)
+            except (OSError, ValueError):
+                continue
+            source = history_source(data)
+            session_id = os.path.basename(os.path.dirname(path))
+            if self.record_run(history, session_id=session_id, mode='imported', source=source):
+                imported += 1
+        return imported
+
+    def ensure_imported(self):
+        """Import legacy history files once per process"""
+        if not self._imported:
+            self._imported = True
+            self.import_history()
+
+    def list_runs(self, url=None, limit=50):
+        query = "SELECT * FROM runs"
+        params = []
+        if url:
+            query += " WHERE url = ?"
+            params.append(url)
+        query += " ORDER BY started_at DESC LIMIT ?"
+        params.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def pass_rate_trend(self, url=None, test_name=None, days=None):
+        """
+        Daily pass rate
+
+        Returns:
+            list: {'day', 'runs', 'tests', 'passed', 'pass_rate'} oldest first
+        """
+        days = self.config['trend_days'] if days is None else days
+        where, params = self._filters(url=url, test_name=test_name, days=days)
+        query = f"""
+            SELECT strftime('%Y-%m-%d', timestamp, 'unixepoch', 'localtime') AS day,
+                   COUNT(DISTINCT run_id) AS runs,
+                   COUNT(*) AS tests,
+                   SUM(status = 'passed') AS passed
+            FROM tests {where}
+            GROUP BY day ORDER BY day
+        """
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [dict(row, pass_rate=round(row['passed'] / row['tests'], 4) if row['tests'] else 0.0) for row in rows]
+
+    def flaky_tests(self, url=None, window=None, min_runs=None):
+        """
+        Tests whose recent results alternate between passing and failing
+
+        Only passed and failed results count; errors and skips say nothing
+        about flakiness. Flakiness is the share of consecutive results (newest
+        `window` per test) where the status changed. A test is one name at one
+        URL, so same-named tests of different apps are never mixed.
+
+        Returns:
+            list: {'test_name', 'url', 'runs', 'passed', 'failed', 'pass_rate', 'flips', 'flakiness'} most flaky first
+        """
+        window = window or self.config['flaky_window']
+        min_runs = min_runs or self.config['flaky_min_runs']
+        where, params = self._filters(url=url)
+        where = f"{where} AND" if where else "WHERE"
+        query = f"""
+            WITH recent AS (
+                SELECT url, name_key, test_name, status, timestamp,
+                       ROW_NUMBER() OVER (PARTITION BY url, name_key ORDER BY timestamp DESC) AS position
+                FROM tests {where} status IN ('passed', 'failed')
+            ),
+            ordered AS (
+                SELECT url, name_key, test_name, status,
+                       LAG(status) OVER (PARTITION BY url, name_key ORDER BY timestamp) AS previous
+                FROM recent WHERE position <= ?
+            )
+            SELECT url, name_key, MAX(test_name) AS test_name, COUNT(*) AS runs,
+                   SUM(status = 'passed') AS passed,
+                   SUM(status = 'failed') AS failed,
+                   SUM(previous IS NOT NULL AND previous != status) AS flips
+            FROM ordered
+            GROUP BY url, name_key
+            HAVING runs >= ? AND passed > 0 AND failed > 0
+        """
+        with self._lock:
+            rows = self._conn.execute(query, (*params, int(window), int(min_runs))).fetchall()
+
+        flaky = []
+        for row in rows:
+            flaky.append({
+                'test_name': row['test_name'],
+                'url': row['url'],
+                'runs': row['runs'],
+                'passed': row['passed'],
+                'failed': row['failed'],
+                'pass_rate': round(row['passed'] / row['runs'], 4),
+                'flips': row['flips'],
+                'flakiness': round(row['flips'] / (row['runs'] - 1), 4)
+            })
+        return sorted(flaky, key=lambda item: (item['flakiness'], item['runs']), reverse=True)
+
+    def duration_percentiles(self, url=None, test_name=None, category=None, days=None, percentiles=None):
+        """
+        Duration percentiles per test name, computed from the indexed durations only
+
+        Returns:
+            list: {'test_name', 'samples', 'p50', ...} sorted by slowest median first
+        """
+        percentiles = percentiles or self.config['percentiles']
+        where, params = self._filters(url=url, test_name=test_name, category=category, days=days)
+        where += (" AND" if where else "WHERE") + " duration IS NOT NULL"
+        query = f"SELECT name_key, test_name, duration FROM tests {where} ORDER BY name_key, duration"
+
+        groups = {}
+        with self._lock:
+            for row in self._conn.execute(query, params):
+                group = groups.setdefault(row['name_key'], {'test_name': row['test_name'], 'durations': []})
+                group['durations'].append(row['duration'])
+
+        stats = []
+        for group in groups.values():
+            durations = group['durations']
+            entry = {'test_name': group['test_name'], 'samples': len(durations)}
+            for percent in percentiles:
+                entry[f"p{percent}"] = round(_percentile(durations, percent), 3)
+            stats.append(entry)
+        return sorted(stats, key=lambda entry: entry[f"p{percentiles[0]}"], reverse=True)
+
+    def duration_samples(self):
+        """Durations grouped the way TestSelector estimates them: by name, by category and overall"""
+        samples = {'by_name': {}, 'by_category': {}, 'all': []}
+        with self._lock:
+            rows = self._conn.execute("SELECT name_key, category, duration FROM tests WHERE duration IS NOT NULL")
+            for row in rows:
+                samples['by_name'].setdefault(row['name_key'], []).append(row['duration'])
+                samples['by_category'].setdefault(row['category'], []).append(row['duration'])
+                samples['all'].append(row['duration'])
+        return samples
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _filters(url=None, test_name=None, category=None, days=None):
+        clauses = []
+        params = []
+        if url:
+            clauses.append("url = ?")
+            params.append(url)
+        if test_name:
+            clauses.append("name_key = ?")
+            params.append(normalize_name(test_name))
+        if category:
+            clauses.append("category = ?")
+            params.append(category.lower())
+        if days:
+            clauses.append("timestamp >= ?")
+            params.append(datetime.now().timestamp() - float(days) * 86400)
+        return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
@@ -0,0 +1,131 @@
+"""
+Shard worker for distributed test execution
+Runs a small HTTP server that executes shards of test cases with its own
+TestExecutor and driver pool, streaming results back as NDJSON lines.
+
+Usage:
+    python -m services.shard_worker --host 0.0.0.0 --port 8765
+"""
+
+import json
+import queue
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from services.test_executor import TestExecutor
+from config.execution import DISTRIBUTED_CONFIG
+
+
+def run_shard(shard, base_url, workers):
+    """
+    Execute one shard of test cases
+
+    Args:
+        shard (list): (index, test_case) pairs; index is the position in the full run
+        base_url (str): The base URL of the application
+        workers (int): Browser workers for this shard
+
+    Yields:
+        tuple: (index, result) as each test finishes
+    """
+    executor = TestExecutor()
+    tests = [test_case for _, test_case in shard]
+    for local_index, result in executor.iter_results(tests, base_url, workers=workers):
+        yield shard[local_index][0], result
+
+
+class ShardRequestHandler(BaseHTTPRequestHandler):
+    """POST /shards runs a shard; GET /health reports readiness"""
+
+    def do_GET(self):
+        if self.path != '/health':
+            self._send_json(404, {'error': 'Not found'})
+            return
+        self._send_json(200, {'status': 'ok', 'workers': DISTRIBUTED_CONFIG['workers_per_shard']})
+
+    def do_POST(self):
+        if self.path != '/shards':
+            self._send_json(404, {'error': 'Not found'})
+            return
+
+        token = DISTRIBUTED_CONFIG['worker_token']
+        if token and self.headers.get('X-Shard-Token') != token:
+            self._send_json(403, {'error': 'Invalid shard token'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length))
+            shard = [(item['index'], item['test_case']) for item in payload['tests']]
+            base_url = payload['base_url']
+            workers = int(payload.get('workers') or DISTRIBUTED_CONFIG['workers_per_shard'])
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {'error': f'Invalid shard request: {e}'})
+            return
+
+        # Stream one JSON line per finished test; the connection closes when the shard is done
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.end_headers()
+        for item in self._stream_with_heartbeats(shard, base_url, workers):
+            self.wfile.write((json.dumps(item) + '\n').encode('utf-8'))
+            self.wfile.flush()
+
+    @staticmethod
+    def _stream_with_heartbeats(shard, base_url, workers):
+        """
+        Yield result lines as tests finish, and a heartbeat line whenever one takes longer than the interval
+
+        If the shard fails part-way, the last line is {'error': message}.
+        """
+        lines = queue.Queue()
+        done = object()
+
+        def produce():
+            try:
+                for index, result in run_shard(shard, base_url, workers):
+                    lines.put({'index': index, 'result': result})
+            except Exception as e:
+                # The 200 is already sent, so the failure has to travel in the stream
+                lines.put({'error': str(e)})
+            finally:
+                lines.put(done)
+
+        threading.Thread(target=produce, daemon=True).start()
+        while True:
+            try:
+                item = lines.get(timeout=DISTRIBUTED_CONFIG['heartbeat_interval'])
+            except queue.Empty:
+                yield {'heartbeat': True}
+                continue
+            if item is done:
+                return
+            yield item
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a test execution shard worker')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), ShardRequestHandler)
+    print(f"Shard worker listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
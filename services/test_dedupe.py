@@ -0,0 +1,280 @@
+"""
+Semantic deduplication of generated test cases
+Each test case gets a hashed TF-IDF signature built from its name, steps and
+expected result (words and word pairs). Signatures are compared by cosine
+similarity with NumPy; tests above the threshold are joined into clusters with
+union-find and each cluster is collapsed to one representative. Signatures of
+earlier sessions are kept in an on-disk index so repeats across sessions can be
+reported.
+"""
+
+import os
+import re
+import tempfile
+import threading
+import zlib
+from collections import Counter
+import numpy as np
+from config.dedupe import DEDUPE_CONFIG
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'if', 'in', 'into', 'is', 'it',
+    'of', 'on', 'or', 'should', 'that', 'the', 'then', 'this', 'to', 'when', 'with'
+])
+
+# Lower rank wins when choosing which test of a cluster to keep
+PRIORITY_RANK = {'High': 0, 'Medium': 1, 'Low': 2}
+
+
+def _terms(text):
+    """Words and adjacent word pairs of a text, stop words removed"""
+    words = [word for word in _WORD_PATTERN.findall(text.lower()) if word not in STOP_WORDS]
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+class TestCaseVectorizer:
+    """Turns test cases into sparse hashed term counts and dense TF-IDF matrices"""
+
+    def __init__(self, n_features, field_weights):
+        self.n_features = n_features
+        self.field_weights = field_weights
+
+    def term_counts(self, test_case):
+        """
+        Weighted term counts of one test case
+
+        Returns:
+            tuple: (indices, values) numpy arrays of the hashed feature buckets that occur
+        """
+        counts = Counter()
+        for field, weight in self.field_weights.items():
+            value = test_case.get(field) or ''
+            if isinstance(value, list):
+                value = ' '.join(map(str, value))
+            for term in _terms(str(value)):
+                counts[zlib.crc32(term.encode('utf-8')) % self.n_features] += weight
+        indices = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        return indices, values
+
+    def idf(self, rows):
+        """Smoothed inverse document frequency per bucket over the given rows"""
+        document_frequency = np.zeros(self.n_features, dtype=np.float32)
+        if rows:
+            document_frequency = np.bincount(
+                np.concatenate([indices for indices, _ in rows]), minlength=self.n_features
+            ).astype(np.float32)
+        return np.log((1.0 + len(rows)) / (1.0 + document_frequency)) + 1.0
+
+    def matrix(self, rows, idf):
+        """L2-normalized TF-IDF matrix, one row per test case"""
+        matrix = np.zeros((len(rows), self.n_features), dtype=np.float32)
+        for row, (indices, values) in enumerate(rows):
+            matrix[row, indices] = np.log1p(values) * idf[indices]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+
+class _UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, item):
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, first, second):
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            self.parent[max(first, second)] = min(first, second)
+
+
+class DedupeIndex:
+    """Test case signatures of earlier sessions, saved as one compressed sparse matrix"""
+
+    def __init__(self, path, max_entries):
+        self.path = path
+        self.max_entries = max_entries
+        self.rows = []
+        self.entries = []  # (session_id, test_id, name) per row
+        self._loaded = False
+
+    def load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with np.load(self.path, allow_pickle=False) as stored:
+                indptr, indices, values = stored['indptr'], stored['indices'], stored['values']
+                meta = zip(stored['sessions'].tolist(), stored['test_ids'].tolist(), stored['names'].tolist())
+                for row, entry in enumerate(meta):
+                    start, end = indptr[row], indptr[row + 1]
+                    self.rows.append((indices[start:end], values[start:end]))
+                    self.entries.append(entry)
+        except (OSError, KeyError, ValueError):
+            self.rows, self.entries = [], []
+
+    def replace_session(self, session_id, rows, entries):
+        """Store a session's signatures, replacing any it had before and dropping the oldest beyond max_entries"""
+        self.load()
+        kept = [(row, entry) for row, entry in zip(self.rows, self.entries) if entry[0] != session_id]
+        kept.extend(zip(rows, entries))
+        kept = kept[-self.max_entries:]
+        self.rows = [row for row, _ in kept]
+        self.entries = [entry for _, entry in kept]
+        self.save()
+
+    def save(self):
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        lengths = [len(indices) for indices, _ in self.rows]
+        arrays = {
+            'indptr': np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]),
+            'indices': np.concatenate([indices for indices, _ in self.rows]) if self.rows else np.zeros(0, np.int32),
+            'values': np.concatenate([values for _, values in self.rows]) if self.rows else np.zeros(0, np.float32),
+            'sessions': np.array([entry[0] for entry in self.entries], dtype=str),
+            'test_ids': np.array([entry[1] for entry in self.entries], dtype=str),
+            'names': np.array([entry[2] for entry in self.entries], dtype=str)
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.npz')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, **arrays)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+class SemanticDeduplicator:
+    """Collapses near-duplicate test cases within a session and reports repeats of earlier sessions"""
+
+    def __init__(self, config=None):
+        self.config = dict(DEDUPE_CONFIG)
+        if config:
+            self.config.update(config)
+        self.enabled = self.config['enabled']
+        self.threshold = self.config['threshold']
+        self.vectorizer = TestCaseVectorizer(self.config['n_features'], self.config['field_weights'])
+        self.index = DedupeIndex(self.config['index_path'], self.config['max_index_entries'])
+        self._lock = threading.Lock()
+
+    def deduplicate(self, test_cases):
+        """
+        Collapse clusters of near-duplicate test cases
+
+        The kept test of each cluster is the highest priority one with the most
+        steps; it lists the IDs it replaced under 'duplicates'. Order and IDs of
+        kept tests are unchanged.
+
+        Args:
+            test_cases (list): Test case dictionaries
+
+        Returns:
+            tuple: (unique test cases, clusters) where each cluster is
+                {'kept': id, 'name': name, 'duplicates': [{'id', 'name', 'similarity'}]}
+        """
+        if not self.enabled or len(test_cases) < 2:
+            return list(test_cases), []
+
+        rows = [self.vectorizer.term_counts(test_case) for test_case in test_cases]
+        matrix = self.vectorizer.matrix(rows, self.vectorizer.idf(rows))
+        similarity = matrix @ matrix.T
+
+        union_find = _UnionFind(len(test_cases))
+        for first, second in zip(*np.nonzero(np.triu(similarity >= self.threshold, k=1))):
+            union_find.union(int(first), int(second))
+
+        groups = {}
+        for position in range(len(test_cases)):
+            groups.setdefault(union_find.find(position), []).append(position)
+
+        kept = {}
+        clusters = []
+        for members in groups.values():
+            keeper = min(members, key=lambda position: (
+                PRIORITY_RANK.get(test_cases[position].get('priority'), 1),
+                -len(test_cases[position].get('steps') or []),
+                position
+            ))
+            if len(members) == 1:
+                kept[keeper] = test_cases[keeper]
+                continue
+            duplicates = [
+                {
+                    'id': test_cases[position].get('id'),
+                    'name': test_cases[position].get('name', ''),
+                    'similarity': round(float(similarity[keeper, position]), 3)
+                }
+                for position in members if position != keeper
+            ]
+            kept[keeper] = dict(test_cases[keeper], duplicates=[duplicate['id'] for duplicate in duplicates])
+            clusters.append({
+                'kept': test_cases[keeper].get('id'),
+                'name': test_cases[keeper].get('name', ''),
+                'duplicates': duplicates
+            })
+
+        return [kept[position] for position in sorted(kept)], clusters
+
+    def index_session(self, session_id, test_cases):
+        """
+        Find tests that repeat earlier sessions, then add this session to the index
+
+        Returns:
+            list: {'id', 'name', 'session_id', 'test_id', 'similar_name', 'similarity'} per repeated test
+        """
+        if not self.enabled or not test_cases:
+            return []
+
+        rows = [self.vectorizer.term_counts(test_case) for test_case in test_cases]
+        with self._lock:
+            self.index.load()
+            others = [
+                (row, entry) for row, entry in zip(self.index.rows, self.index.entries) if entry[0] != session_id
+            ]
+            matches = self._match_index(test_cases, rows, others)
+            self.index.replace_session(
+                session_id, rows,
+                [(session_id, str(test_case.get('id', '')), test_case.get('name', '')) for test_case in test_cases]
+            )
+        return matches
+
+    def _match_index(self, test_cases, rows, others):
+        """Best match above the threshold among other sessions for every test, compared block by block"""
+        if not others:
+            return []
+        other_rows = [row for row, _ in others]
+        idf = self.vectorizer.idf(rows + other_rows)
+        matrix = self.vectorizer.matrix(rows, idf)
+
+        best = np.full(len(rows), -1.0, dtype=np.float32)
+        best_index = np.zeros(len(rows), dtype=np.int64)
+        block_size = self.config['block_size']
+        for start in range(0, len(other_rows), block_size):
+            block = self.vectorizer.matrix(other_rows[start:start + block_size], idf)
+            similarity = matrix @ block.T
+            block_best = similarity.argmax(axis=1)
+            block_scores = similarity[np.arange(len(rows)), block_best]
+            improved = block_scores > best
+            best[improved] = block_scores[improved]
+            best_index[improved] = block_best[improved] + start
+
+        matches = []
+        for position in np.nonzero(best >= self.threshold)[0]:
+            session_id, test_id, name = others[best_index[position]][1]
+            matches.append({
+                'id': test_cases[position].get('id'),
+                'name': test_cases[position].get('name', ''),
+                'session_id': session_id,
+                'test_id': test_id,
+                'similar_name': name,
+                'similarity': round(float(best[position]), 3)
+            })
+        return matches
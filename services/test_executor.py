@@ -1,5 +1,7 @@
 import time
-import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -7,17 +9,41 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
+from services.driver_pool import DriverPool, default_chrome_options
+from services.readiness import PageReadiness
+from services.browser_metrics import BrowserMetrics
+from services.dom_extractor import DomPage, fill_inputs
+from services.http_client import get_http_client
+from services.load_generator import LoadGenerator, is_load_test
+from services.test_selector import select_top_tests
+from config.execution import EXECUTION_CONFIG, HTTP_ONLY_CATEGORIES
+from config.app_types import APP_TYPE_CONFIG
 
 class TestExecutor:
-    def __init__(self):
-        self.chrome_options = Options()
-        self.chrome_options.add_argument('--headless')
-        self.chrome_options.add_argument('--no-sandbox')
-        self.chrome_options.add_argument('--disable-dev-shm-usage')
-        self.chrome_options.add_argument('--disable-gpu')
-        self.chrome_options.add_argument('--window-size=1920,1080')
+    def __init__(self, driver_pool=None, pool_size=None):
+        self.chrome_options = default_chrome_options()
+        self.pool_size = pool_size
+        self._owns_pool = driver_pool is None
+        self.driver_pool = driver_pool
+        self._pool_lock = threading.Lock()
+        self._workers = None
+        self.readiness = PageReadiness()
+        self.browser_metrics = BrowserMetrics()
+    
+    def _get_driver_pool(self):
+        """Create the browser pool on first use so HTTP-only runs never start Chrome"""
+        with self._pool_lock:
+            if self.driver_pool is None:
+                self.driver_pool = DriverPool(size=self.pool_size or self._workers, chrome_options=self.chrome_options)
+            return self.driver_pool
+    
+    def close(self):
+        """Shut down the browser pool if this executor created it"""
+        if self._owns_pool and self.driver_pool is not None:
+            self.driver_pool.close()
+            self.driver_pool = None
         
-    def execute_top_tests(self, test_cases, base_url, limit=10):
+    def execute_top_tests(self, test_cases, base_url, limit=10, workers=None, progress_callback=None):
         """
         Execute the top test cases based on priority
         
@@ -25,50 +51,129 @@ class TestExecutor:
             test_cases (list): List of test case dictionaries
             base_url (str): The base URL of the application
             limit (int): Maximum number of tests to execute
+            workers (int, optional): Number of browser workers; 1 runs sequentially
+            progress_callback (callable, optional): Called as (completed, total, result) after each test;
+                raising from it aborts the run
             
         Returns:
             dict: Execution results with summary and individual test results
         """
         
-        # Sort test cases by priority (High > Medium > Low)
-        priority_order = {'High': 3, 'Medium': 2, 'Low': 1}
-        sorted_tests = sorted(
-            test_cases,
-            key=lambda x: priority_order.get(x.get('priority', 'Low'), 1),
-            reverse=True
-        )
+        tests_to_execute = self.select_top_tests(test_cases, limit)
         
-        # Execute top N test cases
-        tests_to_execute = sorted_tests[:limit]
+        return self.execute_tests(tests_to_execute, base_url, workers=workers, progress_callback=progress_callback)
+    
+    @staticmethod
+    def select_top_tests(test_cases, limit=10):
+        """Pick the top `limit` test cases by priority, keeping the original order within a priority"""
+        return select_top_tests(test_cases, limit)
+    
+    def execute_tests(self, tests_to_execute, base_url, workers=None, progress_callback=None):
+        """
+        Execute an already selected list of test cases
+        
+        Args:
+            tests_to_execute (list): Test cases in the order results should be reported
+            base_url (str): The base URL of the application
+            workers (int, optional): Number of browser workers; 1 runs sequentially
+            progress_callback (callable, optional): Called as (completed, total, result) after each test
+            
+        Returns:
+            dict: Execution results with summary and individual test results
+        """
         
         start_time = datetime.now()
-        results = []
-        passed = 0
-        failed = 0
+        results = [None] * len(tests_to_execute)
         
-        for test_case in tests_to_execute:
-            result = self._execute_single_test(test_case, base_url)
-            results.append(result)
-            
-            if result['status'] == 'passed':
-                passed += 1
-            else:
-                failed += 1
+        with closing(self.iter_results(tests_to_execute, base_url, workers)) as completed_results:
+            for completed, (index, result) in enumerate(completed_results, 1):
+                results[index] = result
+                if progress_callback:
+                    progress_callback(completed, len(tests_to_execute), result)
         
         end_time = datetime.now()
-        execution_time = str(end_time - start_time)
+        return self.build_execution_results(results, start_time, end_time)
+    
+    def iter_results(self, tests_to_execute, base_url, workers=None):
+        """
+        Execute test cases and yield (index, result) pairs as each one finishes
+        
+        Args:
+            tests_to_execute (list): Test cases to run
+            base_url (str): The base URL of the application
+            workers (int, optional): Number of browser workers; 1 runs sequentially
+        """
+        
+        if workers is None:
+            workers = EXECUTION_CONFIG['workers']
+        workers = max(1, int(workers))
+        
+        # One browser per worker unless an explicit pool size was given
+        self._workers = workers if workers > 1 else None
+        
+        try:
+            if workers > 1 and len(tests_to_execute) > 1:
+                yield from self._execute_parallel(tests_to_execute, base_url, workers)
+            else:
+                for index, test_case in enumerate(tests_to_execute):
+                    yield index, self._execute_single_test(test_case, base_url)
+        finally:
+            self.close()
+    
+    @staticmethod
+    def build_execution_results(results, start_time, end_time):
+        """Build the summary/results payload stored in execution_history.json"""
+        passed = sum(1 for result in results if result['status'] == 'passed')
+        failed = len(results) - passed
         
         return {
             'summary': {
-                'total_tests': len(tests_to_execute),
+                'total_tests': len(results),
                 'passed': passed,
                 'failed': failed,
-                'execution_time': execution_time,
+                'execution_time': str(end_time - start_time),
                 'timestamp': start_time.isoformat()
             },
             'results': results
         }
     
+    def _execute_parallel(self, tests_to_execute, base_url, workers):
+        """
+        Run tests on two lanes: browser-bound tests share a pool with one
+        browser per worker, HTTP-only tests run on a separate lightweight pool.
+        Yields (index, result) pairs in completion order.
+        """
+        
+        browser_lane = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='browser-lane')
+        http_lane = ThreadPoolExecutor(max_workers=EXECUTION_CONFIG['http_workers'], thread_name_prefix='http-lane')
+        
+        try:
+            futures = {}
+            for index, test_case in enumerate(tests_to_execute):
+                lane = http_lane if self._is_http_only(test_case) else browser_lane
+                futures[lane.submit(self._execute_single_test, test_case, base_url)] = index
+            
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # Drop queued tests if the run was aborted, but let running ones finish
+            browser_lane.shutdown(wait=True, cancel_futures=True)
+            http_lane.shutdown(wait=True, cancel_futures=True)
+    
+    def _is_http_only(self, test_case):
+        """Check whether a test case can run without a browser"""
+        return test_case.get('category', 'Functional').lower() in HTTP_ONLY_CATEGORIES
+    
+    def _record_wait(self, result, label, timings):
+        """Keep how long each readiness wait actually took alongside the test result"""
+        result.setdefault('wait_times', []).append(dict(timings, label=label))
+    
+    def _record_metrics(self, result, label, driver):
+        """Keep the front-end timing of each page load alongside the test result"""
+        metrics = self.browser_metrics.collect(driver)
+        if metrics:
+            result.setdefault('browser_metrics', []).append(dict(metrics, label=label, url=driver.current_url))
+    
     def _execute_single_test(self, test_case, base_url):
         """
         Execute a single test case
@@ -123,25 +228,24 @@ class TestExecutor:
     def _execute_functional_test(self, test_case, base_url, result):
         """Execute functional test cases using Selenium"""
         
-        driver = None
-        try:
-            driver = webdriver.Chrome(options=self.chrome_options)
-            driver.set_page_load_timeout(30)
-            
+        with self._get_driver_pool().lease() as driver:
             # Navigate to the application
+            self.readiness.prepare(driver)
+            self.browser_metrics.prepare(driver)
             driver.get(base_url)
-            time.sleep(2)
+            self._record_wait(result, 'page_load', self.readiness.wait_until_ready(driver))
+            self._record_metrics(result, 'page_load', driver)
             
-            # Basic checks
-            page_title = driver.title
-            page_source = driver.page_source
+            # Describe the page in one script call instead of querying elements one by one
+            page = DomPage.capture(driver)
+            page_title = page.title
             
             # Execute test steps based on test case name and steps
             test_name = test_case.get('name', '').lower()
             
             if 'page load' in test_name or 'loading' in test_name:
                 # Page load test
-                if page_title and len(page_source) > 100:
+                if page_title and len(page) > 100:
                     result['status'] = 'passed'
                     result['details'] = f"Page loaded successfully. Title: '{page_title}'"
                 else:
@@ -149,19 +253,16 @@ class TestExecutor:
                     
             elif 'navigation' in test_name:
                 # Navigation test
-                links = driver.find_elements(By.TAG_NAME, "a")
                 working_links = 0
                 
-                for link in links[:5]:  # Test first 5 links
-                    href = link.get_attribute('href')
-                    if href and not href.startswith(('mailto:', 'tel:', 'javascript:')):
+                for link in page.visible_links(limit=5):  # Test first 5 links
+                    if not link['href'].startswith(('mailto:', 'tel:', 'javascript:')):
                         try:
-                            link.click()
-                            time.sleep(1)
+                            driver.get(link['url'])
+                            self._record_wait(result, 'navigation', self.readiness.wait_until_ready(driver))
+                            self._record_metrics(result, 'navigation', driver)
                             working_links += 1
-                            driver.back()
-                            time.sleep(1)
-                        except:
+                        except WebDriverException:
                             continue
                 
                 if working_links > 0:
@@ -172,23 +273,11 @@ class TestExecutor:
                     
             elif 'form' in test_name:
                 # Form test
-                forms = driver.find_elements(By.TAG_NAME, "form")
+                forms = page.extracted['forms']
                 
                 if forms:
-                    form = forms[0]
-                    inputs = form.find_elements(By.TAG_NAME, "input")
-                    
-                    # Try to fill and submit form
-                    filled_inputs = 0
-                    for inp in inputs:
-                        input_type = inp.get_attribute('type')
-                        if input_type in ['text', 'email', 'password']:
-                            try:
-                                inp.clear()
-                                inp.send_keys("test_data")
-                                filled_inputs += 1
-                            except:
-                                continue
+                    # Fill the first form's text fields in a single round-trip
+                    filled_inputs = fill_inputs(driver, forms[0]['inputs'], "test_data")
                     
                     if filled_inputs > 0:
                         result['status'] = 'passed'
@@ -200,17 +289,7 @@ class TestExecutor:
                     
             elif 'button' in test_name:
                 # Button test
-                buttons = driver.find_elements(By.TAG_NAME, "button")
-                buttons.extend(driver.find_elements(By.CSS_SELECTOR, "input[type='button']"))
-                buttons.extend(driver.find_elements(By.CSS_SELECTOR, "input[type='submit']"))
-                
-                clickable_buttons = 0
-                for button in buttons[:3]:  # Test first 3 buttons
-                    try:
-                        if button.is_enabled() and button.is_displayed():
-                            clickable_buttons += 1
-                    except:
-                        continue
+                clickable_buttons = len(page.clickable_buttons(limit=3))  # Test first 3 buttons
                 
                 if clickable_buttons > 0:
                     result['status'] = 'passed'
@@ -220,24 +299,21 @@ class TestExecutor:
                     
             else:
                 # Generic functional test
-                if page_title and len(page_source) > 100:
+                if page_title and len(page) > 100:
                     result['status'] = 'passed'
                     result['details'] = "Generic functional test passed - page loads and has content"
                 else:
                     result['details'] = "Generic functional test failed - page appears empty"
-        
-        finally:
-            if driver:
-                driver.quit()
     
     def _execute_ui_test(self, test_case, base_url, result):
         """Execute UI/UX related test cases"""
         
-        driver = None
-        try:
-            driver = webdriver.Chrome(options=self.chrome_options)
+        with self._get_driver_pool().lease() as driver:
+            self.readiness.prepare(driver)
+            self.browser_metrics.prepare(driver)
             driver.get(base_url)
-            time.sleep(2)
+            self._record_wait(result, 'page_load', self.readiness.wait_until_ready(driver))
+            self._record_metrics(result, 'page_load', driver)
             
             test_name = test_case.get('name', '').lower()
             
@@ -249,7 +325,7 @@ class TestExecutor:
                 
                 for width, height in sizes:
                     driver.set_window_size(width, height)
-                    time.sleep(1)
+                    self._record_wait(result, f'resize_{width}x{height}', self.readiness.wait_for_layout(driver))
                     
                     # Check if page is still usable
                     body = driver.find_element(By.TAG_NAME, "body")
@@ -265,41 +341,74 @@ class TestExecutor:
                     
             else:
                 # Generic UI test
-                elements = driver.find_elements(By.CSS_SELECTOR, "h1, h2, h3, p, div, button, input")
-                if len(elements) > 5:
+                element_count = driver.execute_script(
+                    "return document.querySelectorAll('h1, h2, h3, p, div, button, input').length"
+                )
+                if element_count > 5:
                     result['status'] = 'passed'
-                    result['details'] = f"UI test passed - page has {len(elements)} UI elements"
+                    result['details'] = f"UI test passed - page has {element_count} UI elements"
                 else:
                     result['details'] = "UI test failed - insufficient UI elements found"
-        
-        finally:
-            if driver:
-                driver.quit()
     
     def _execute_performance_test(self, test_case, base_url, result):
         """Execute performance related test cases"""
         
+        if self._is_load_test(test_case):
+            return self._execute_load_test(test_case, base_url, result)
+        
         try:
-            # Measure page load time
-            start_time = time.time()
-            response = requests.get(base_url, timeout=30)
-            load_time = time.time() - start_time
+            # Time the request phase by phase over a pooled keep-alive connection
+            response, timings = get_http_client().timed_get(base_url)
+            result['http_timings'] = timings
             
-            if response.status_code == 200 and load_time < 5.0:  # 5 second threshold
+            # Judge the app's own response time, not DNS/connect/TLS setup on our side
+            server_time = timings['ttfb'] + timings['transfer']
+            threshold = APP_TYPE_CONFIG['local']['performance_thresholds']['response_time']
+            breakdown = (f"ttfb {timings['ttfb']:.3f}s, transfer {timings['transfer']:.3f}s, "
+                         f"connection setup {timings['dns'] + timings['connect'] + timings['tls']:.3f}s")
+            
+            if response.status_code == 200 and server_time < threshold:
                 result['status'] = 'passed'
-                result['details'] = f"Performance test passed - page loaded in {load_time:.2f}s"
+                result['details'] = f"Performance test passed - page served in {server_time:.2f}s ({breakdown})"
             else:
-                result['details'] = f"Performance test failed - page took {load_time:.2f}s to load or returned error {response.status_code}"
+                result['details'] = f"Performance test failed - page took {server_time:.2f}s to serve ({breakdown}) or returned error {response.status_code}"
                 
         except Exception as e:
             result['details'] = f"Performance test failed: {str(e)}"
     
+    def _is_load_test(self, test_case):
+        """Run performance tests about load, concurrency or throughput as real load tests"""
+        return is_load_test(test_case)
+    
+    def _execute_load_test(self, test_case, base_url, result):
+        """Drive concurrent traffic built from the entry page's links and forms"""
+        
+        try:
+            generator = LoadGenerator(base_url)
+            entry_page = get_http_client().session.get(base_url, timeout=10)
+            report = generator.run(generator.build_request_mix(entry_page.content))
+            passed, reasons = generator.evaluate(report)
+            result['load_test'] = report
+            
+            summary = (f"{report['requests']} requests from {report['concurrency']} users at "
+                       f"{report['throughput']:.1f} req/s, p50/p95/p99 {report['latency']['p50']:.3f}/"
+                       f"{report['latency']['p95']:.3f}/{report['latency']['p99']:.3f}s, "
+                       f"error rate {report['error_rate']:.2%}")
+            if passed:
+                result['status'] = 'passed'
+                result['details'] = f"Load test passed - {summary}"
+            else:
+                result['details'] = f"Load test failed ({'; '.join(reasons)}) - {summary}"
+                
+        except Exception as e:
+            result['details'] = f"Load test failed: {str(e)}"
+    
     def _execute_security_test(self, test_case, base_url, result):
         """Execute basic security test cases"""
         
         try:
             # Basic security headers check
-            response = requests.get(base_url, timeout=10)
+            response = get_http_client().session.get(base_url, timeout=10)
             headers = response.headers
             
             security_headers = ['X-Content-Type-Options', 'X-Frame-Options', 'X-XSS-Protection']
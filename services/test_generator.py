@@ -6,26 +6,55 @@ class TestGenerator:
     def __init__(self):
         self.ai_manager = AIProviderManager()
     
-    def generate_test_cases(self, context, template=None, provider=None):
+    def generate_test_cases(self, context, template=None, provider=None, use_cache=True, mode=None, context_info=None):
         """
         Generate comprehensive test cases based on application context using AI providers
         
         Args:
             context (str): The application context analysis
             template (dict, optional): Future feature - custom test case template
-            provider (str, optional): AI provider to use ('claude', 'gemini')
+            provider (str, optional): AI provider to use ('claude', 'gemini'), or 'race'/'merge' to query all available providers
+            use_cache (bool): Reuse cached test cases for an identical prompt and model
+            mode (str, optional): 'single', 'map-reduce' or 'auto' (chunked generation for larger apps)
+            context_info (dict, optional): Analyzer report behind context; map-reduce chunks are split from it
         
         Returns:
             list: List of test case dictionaries
         """
         
         try:
-            test_cases = self.ai_manager.generate_test_cases(context, provider, template)
+            test_cases = self.ai_manager.generate_test_cases(context, provider, template, use_cache=use_cache, mode=mode,
+                                                             context_info=context_info)
             return test_cases
             
         except Exception as e:
             raise Exception(f"Failed to generate test cases using AI: {str(e)}")
     
+    def stream_test_cases(self, context, template=None, provider=None, use_cache=True, mode=None, context_info=None):
+        """
+        Generate test cases incrementally, yielding each one as soon as the AI produces it
+        
+        Yields:
+            dict: Validated test case
+        """
+        
+        try:
+            yield from self.ai_manager.stream_test_cases(context, provider, template, use_cache=use_cache, mode=mode,
+                                                         context_info=context_info)
+            
+        except Exception as e:
+            raise Exception(f"Failed to generate test cases using AI: {str(e)}")
+    
+    @property
+    def last_cache_status(self):
+        """Cache outcome of the last generation: 'hit', 'miss' or 'bypass'"""
+        return self.ai_manager.last_cache_status
+    
+    @property
+    def last_provider_used(self):
+        """Provider key(s) that produced the last generation, e.g. 'claude' or 'claude+gemini' when merged"""
+        return self.ai_manager.last_provider_used
+    
     def get_available_providers(self):
         """Get list of available AI providers"""
         return self.ai_manager.get_available_providers()
\ No newline at end of file
@@ -0,0 +1,203 @@
+"""
+Budgeted test selection
+Chooses which generated test cases to execute so that the most valuable
+tests fit a wall-clock or cost budget, using per-test durations learned
+from the results store (or previous execution_history.json files).
+"""
+
+import os
+import glob
+import json
+import statistics
+from config.templates import DEFAULT_TEST_TEMPLATE
+from config.execution import SELECTION_CONFIG, HTTP_ONLY_CATEGORIES
+
+
+def parse_duration(value):
+    """Parse an execution_time such as '4.27s' into seconds, or None"""
+    try:
+        return float(str(value).strip().rstrip('s'))
+    except (TypeError, ValueError):
+        return None
+
+
+def select_top_tests(test_cases, limit=10, priority_weights=None):
+    """Pick the top `limit` test cases by priority, keeping the original order within a priority"""
+    weights = priority_weights or DEFAULT_TEST_TEMPLATE['priority_weights']
+    ordered = sorted(
+        enumerate(test_cases),
+        key=lambda item: (-weights.get(item[1].get('priority', 'Low'), 1), item[0])
+    )
+    return [test_case for _, test_case in ordered[:int(limit)]]
+
+
+class TestSelector:
+    """Greedy weighted-coverage-per-second selection under a budget"""
+
+    def __init__(self, history_dir=None, template=None, config=None, store=None):
+        self.config = dict(SELECTION_CONFIG)
+        if config:
+            self.config.update(config)
+        self.history_dir = history_dir or self.config['history_dir']
+        self.priority_weights = (template or DEFAULT_TEST_TEMPLATE)['priority_weights']
+        self.store = store
+        self._durations = None
+
+    def select(self, test_cases, time_budget=None, cost_budget=None, limit=None, workers=1):
+        """
+        Select test cases to execute
+
+        Args:
+            test_cases (list): Candidate test cases
+            time_budget (float, optional): Wall-clock seconds available for the run
+            cost_budget (float, optional): Maximum total cost (seconds weighted per lane)
+            limit (int, optional): Maximum number of tests
+            workers (int): Parallel browser workers; scales the wall-clock budget
+
+        Returns:
+            tuple: (selected test cases in priority order, selection report dict)
+
+        Raises:
+            ValueError: If limit or a budget is not a number
+        """
+        # Request payloads may carry numbers as strings
+        limit = int(limit) if limit is not None else None
+        if time_budget is None and cost_budget is None:
+            return self._select_by_priority(test_cases, limit)
+
+        capacity = float(time_budget) * max(1, int(workers or 1)) if time_budget is not None else None
+        candidates = [
+            {
+                'position': position,
+                'test_case': test_case,
+                'duration': self.estimate_duration(test_case),
+                'weight': self.priority_weights.get(test_case.get('priority', 'Low'), 1),
+                'category': test_case.get('category', 'Functional').lower()
+            }
+            for position, test_case in enumerate(test_cases)
+        ]
+        for candidate in candidates:
+            candidate['cost'] = candidate['duration'] * self._cost_rate(candidate['category'])
+
+        selected = []
+        covered = {}
+        used_time = 0.0
+        used_cost = 0.0
+        decay = self.config['category_decay']
+
+        while candidates and (limit is None or len(selected) < limit):
+            best = None
+            best_score = None
+            for candidate in candidates:
+                if capacity is not None and used_time + candidate['duration'] > capacity:
+                    continue
+                if cost_budget is not None and used_cost + candidate['cost'] > float(cost_budget):
+                    continue
+
+                # Each further test in a covered category is worth less
+                value = candidate['weight'] * decay ** covered.get(candidate['category'], 0)
+                score = (value / max(candidate['duration'], 0.01), candidate['weight'], -candidate['position'])
+                if best_score is None or score > best_score:
+                    best, best_score = candidate, score
+
+            if best is None:
+                break
+
+            candidates.remove(best)
+            selected.append(best)
+            covered[best['category']] = covered.get(best['category'], 0) + 1
+            used_time += best['duration']
+            used_cost += best['cost']
+
+        # Run in priority order, keeping the original order within a priority
+        selected.sort(key=lambda candidate: (-candidate['weight'], candidate['position']))
+
+        report = {
+            'strategy': 'budget',
+            'time_budget': time_budget,
+            'cost_budget': cost_budget,
+            'limit': limit,
+            'candidates': len(test_cases),
+            'selected': len(selected),
+            'estimated_duration': round(used_time, 2),
+            'estimated_wall_time': round(used_time / max(1, int(workers or 1)), 2),
+            'estimated_cost': round(used_cost, 2),
+            'weighted_value': sum(candidate['weight'] for candidate in selected),
+            'categories_covered': sorted(covered)
+        }
+        return [candidate['test_case'] for candidate in selected], report
+
+    def _select_by_priority(self, test_cases, limit):
+        """Plain priority selection used when no budget is given"""
+        if limit is None:
+            limit = self.config['default_limit']
+        selected = select_top_tests(test_cases, limit, self.priority_weights)
+        estimated = sum(self.estimate_duration(test_case) for test_case in selected)
+        report = {
+            'strategy': 'priority',
+            'time_budget': None,
+            'cost_budget': None,
+            'limit': limit,
+            'candidates': len(test_cases),
+            'selected': len(selected),
+            'estimated_duration': round(estimated, 2),
+            'weighted_value': sum(self.priority_weights.get(test_case.get('priority', 'Low'), 1) for test_case in selected),
+            'categories_covered': sorted({test_case.get('category', 'Functional').lower() for test_case in selected})
+        }
+        return selected, report
+
+    def estimate_duration(self, test_case):
+        """Estimate a test's duration from history: same test name, then category, then overall"""
+        durations = self._load_durations()
+        by_name = durations['by_name'].get(self._normalize_name(test_case.get('name', '')))
+        if by_name:
+            return statistics.median(by_name)
+
+        by_category = durations['by_category'].get(test_case.get('category', 'Functional').lower())
+        if by_category:
+            return statistics.median(by_category)
+
+        if durations['all']:
+            return statistics.median(durations['all'])
+        return self.config['default_duration']
+
+    def _load_durations(self):
+        """Collect per-test durations from the results store, or every execution_history.json in the history directory"""
+        if self._durations is not None:
+            return self._durations
+
+        if self.store is not None:
+            durations = self.store.duration_samples()
+            if durations['all']:
+                self._durations = durations
+                return durations
+
+        durations = {'by_name': {}, 'by_category': {}, 'all': []}
+        pattern = os.path.join(self.history_dir, '*', 'execution_history.json')
+        for path in glob.glob(pattern):
+            try:
+                with open(path, 'r') as f:
+                    history = json.load(f)
+            except (OSError, ValueError):
+                continue
+
+            for result in history.get('results', []):
+                seconds = parse_duration(result.get('execution_time'))
+                if seconds is None:
+                    continue
+                name = self._normalize_name(result.get('test_name', ''))
+                category = str(result.get('category', 'Functional')).lower()
+                durations['by_name'].setdefault(name, []).append(seconds)
+                durations['by_category'].setdefault(category, []).append(seconds)
+                durations['all'].append(seconds)
+
+        self._durations = durations
+        return durations
+
+    def _cost_rate(self, category):
+        lane = 'http' if category in HTTP_ONLY_CATEGORIES else 'browser'
+        return self.config['cost_per_second'][lane]
+
+    @staticmethod
+    def _normalize_name(name):
+        return ' '.join(str(name).lower().split())
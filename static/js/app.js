@@ -75,7 +75,7 @@ async function generateTests() {
     showSpinner('generateSpinner');
 
     try {
-        const response = await fetch('/generate-tests', {
+        const response = await fetch('/generate-tests/stream', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -87,22 +87,36 @@ async function generateTests() {
             })
         });
 
-        const data = await response.json();
-        
-        if (data.success) {
-            currentTestCases = data.test_cases;
-            displayTestCases(data.test_cases);
-            showSection('testcases-section');
-            
-            // Show which provider was used
-            const providerUsed = data.provider_used || 'default';
-            const providerInfo = availableProviders.find(p => p.key === providerUsed);
-            if (providerInfo) {
-                console.log(`Test cases generated using ${providerInfo.name} (${providerInfo.provider})`);
-            }
-        } else {
+        if (!response.ok) {
+            const data = await response.json();
             alert('Error: ' + data.error);
+            return;
         }
+
+        // Render each test case as soon as the server streams it
+        const streamedTestCases = [];
+        document.getElementById('testCasesList').innerHTML = '';
+
+        await readServerSentEvents(response, (event, data) => {
+            if (event === 'test_case') {
+                streamedTestCases.push(data);
+                appendTestCase(data, streamedTestCases.length - 1);
+                showSection('testcases-section');
+            } else if (event === 'done') {
+                // Show the saved list: near-duplicates were collapsed server-side after streaming
+                currentTestCases = data.test_cases;
+                displayTestCases(currentTestCases);
+
+                // Show which provider was used
+                const providerUsed = data.provider_used || 'default';
+                const providerInfo = availableProviders.find(p => p.key === providerUsed);
+                if (providerInfo) {
+                    console.log(`Test cases generated using ${providerInfo.name} (${providerInfo.provider})`);
+                }
+            } else if (event === 'error') {
+                alert('Error: ' + data.error);
+            }
+        });
     } catch (error) {
         alert('Error generating tests: ' + error.message);
     } finally {
@@ -110,6 +124,39 @@ async function generateTests() {
     }
 }
 
+async function readServerSentEvents(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) {
+            break;
+        }
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = 'message';
+            let data = '';
+            rawEvent.split('\n').forEach(line => {
+                if (line.startsWith('event: ')) {
+                    event = line.slice(7);
+                } else if (line.startsWith('data: ')) {
+                    data += line.slice(6);
+                }
+            });
+            if (data) {
+                onEvent(event, JSON.parse(data));
+            }
+        }
+    }
+}
+
 async function loadAIProviders() {
     try {
         const response = await fetch('/providers');
@@ -149,6 +196,16 @@ function populateProviderSelect(providers) {
         
         select.appendChild(option);
     });
+    
+    // Querying several providers at once only makes sense when more than one is available
+    if (providers.filter(provider => provider.available).length > 1) {
+        [['race', 'All Providers (Fastest Answer)'], ['merge', 'All Providers (Merged)']].forEach(([value, label]) => {
+            const option = document.createElement('option');
+            option.value = value;
+            option.textContent = label;
+            select.appendChild(option);
+        });
+    }
 }
 
 async function executeTests() {
@@ -161,7 +218,8 @@ async function executeTests() {
     showSpinner('executeSpinner');
 
     try {
-        const response = await fetch('/execute-tests', {
+        // Run as a background job so long executions never hold the request open
+        const response = await fetch('/jobs/execute-tests', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -176,8 +234,13 @@ async function executeTests() {
         const data = await response.json();
         
         if (data.success) {
-            displayExecutionResults(data.execution_results);
-            showSection('results-section');
+            const job = await waitForJob(data.job_id, 'executeProgress');
+            if (job.status === 'succeeded') {
+                displayExecutionResults(job.result.execution_results);
+                showSection('results-section');
+            } else {
+                alert('Error: ' + (job.error || `Execution ${job.status}`));
+            }
         } else {
             alert('Error: ' + data.error);
         }
@@ -188,6 +251,30 @@ async function executeTests() {
     }
 }
 
+async function waitForJob(jobId, progressElementId) {
+    const progressElement = document.getElementById(progressElementId);
+
+    while (true) {
+        const response = await fetch(`/jobs/${jobId}/progress`);
+        const progress = await response.json();
+
+        if (!progress.success) {
+            throw new Error(progress.error);
+        }
+        if (progressElement && progress.message) {
+            progressElement.textContent = `${progress.message} (${Math.round(progress.progress * 100)}%)`;
+        }
+        if (['succeeded', 'failed', 'cancelled'].includes(progress.status)) {
+            break;
+        }
+        await new Promise(resolve => setTimeout(resolve, 1000));
+    }
+
+    const response = await fetch(`/jobs/${jobId}`);
+    const data = await response.json();
+    return data.job;
+}
+
 // JSON Download Functions
 function downloadTestsJSON(event) {
     event.preventDefault();
@@ -227,24 +314,28 @@ function displayTestCases(testCases) {
     const container = document.getElementById('testCasesList');
     container.innerHTML = '';
 
-    testCases.forEach((testCase, index) => {
-        const priorityClass = testCase.priority === 'High' ? 'priority-high' : 
-                            testCase.priority === 'Medium' ? 'priority-medium' : 'priority-low';
-        
-        const testDiv = document.createElement('div');
-        testDiv.className = `test-case ${priorityClass}`;
-        testDiv.innerHTML = `
-            <h5>Test Case ${index + 1}: ${testCase.name}</h5>
-            <p><strong>Description:</strong> ${testCase.description}</p>
-            <p><strong>Priority:</strong> <span class="badge bg-${getPriorityColor(testCase.priority)}">${testCase.priority}</span></p>
-            <p><strong>Steps:</strong></p>
-            <ol>
-                ${testCase.steps.map(step => `<li>${step}</li>`).join('')}
-            </ol>
-            <p><strong>Expected Result:</strong> ${testCase.expected_result}</p>
-        `;
-        container.appendChild(testDiv);
-    });
+    testCases.forEach((testCase, index) => appendTestCase(testCase, index));
+}
+
+function appendTestCase(testCase, index) {
+    const container = document.getElementById('testCasesList');
+    const priorityClass = testCase.priority === 'High' ? 'priority-high' : 
+                        testCase.priority === 'Medium' ? 'priority-medium' : 'priority-low';
+    
+    const testDiv = document.createElement('div');
+    testDiv.className = `test-case ${priorityClass}`;
+    testDiv.innerHTML = `
+        <h5>Test Case ${index + 1}: ${testCase.name}</h5>
+        <p><strong>Description:</strong> ${testCase.description}</p>
+        <p><strong>Priority:</strong> <span class="badge bg-${getPriorityColor(testCase.priority)}">${testCase.priority}</span></p>
+        <p><strong>Steps:</strong></p>
+        <ol>
+            ${testCase.steps.map(step => `<li>${step}</li>`).join('')}
+        </ol>
+        <p><strong>Expected Result:</strong> ${testCase.expected_result}</p>
+        ${testCase.duplicates && testCase.duplicates.length ? `<p class="text-muted"><small>Also covers ${testCase.duplicates.length} near-duplicate test case(s)</small></p>` : ''}
+    `;
+    container.appendChild(testDiv);
 }
 
 function displayExecutionResults(results) {